@@ -0,0 +1,61 @@
+import json
+import os
+
+import pytest
+
+from scripts.scenarios import ScenarioFactory
+
+# Recorded gas per function and scenario
+BASELINE_PATH = os.path.join(os.path.dirname(__file__), 'gas_baseline.json')
+
+# Allowed growth over the baseline before a benchmark fails, 0.05 is 5%
+GAS_THRESHOLD = float(os.environ.get('GAS_THRESHOLD', '0.05'))
+
+# Set GAS_UPDATE_BASELINE=1 to overwrite the baseline with this run
+UPDATE_BASELINE = os.environ.get('GAS_UPDATE_BASELINE') == '1'
+
+class GasBenchmark:
+
+    def __init__(self, baseline):
+        self.baseline = baseline
+        self.results = dict()
+
+    def record(self, name, tx):
+        # Record `tx.gas_used` under `name` and fail on regression
+        self.results[name] = tx.gas_used
+        baseline = self.baseline.get(name)
+        if UPDATE_BASELINE or baseline is None:
+            return tx.gas_used
+        limit = int(baseline * (1 + GAS_THRESHOLD))
+        assert tx.gas_used <= limit, '%s used %d gas, baseline is %d (+%d%% allowed)' % (name, tx.gas_used, baseline, GAS_THRESHOLD * 100)
+        return tx.gas_used
+
+    def save(self):
+        # New scenarios are always added, known ones only on update
+        baseline = dict(self.baseline)
+        for name, gas_used in self.results.items():
+            if UPDATE_BASELINE or name not in baseline:
+                baseline[name] = gas_used
+        if baseline != self.baseline:
+            with open(BASELINE_PATH, 'w') as f:
+                json.dump(baseline, f, indent=2, sort_keys=True)
+                f.write('\n')
+
+@pytest.fixture(scope='session')
+def gas_benchmark():
+    baseline = dict()
+    if os.path.exists(BASELINE_PATH):
+        with open(BASELINE_PATH) as f:
+            baseline = json.load(f)
+    benchmark = GasBenchmark(baseline)
+    yield benchmark
+    benchmark.save()
+
+# Revert to the module's built scenarios after every benchmark
+@pytest.fixture(autouse=True)
+def isolation(fn_isolation):
+    pass
+
+@pytest.fixture(scope='module')
+def scenarios(accounts):
+    yield ScenarioFactory(accounts)
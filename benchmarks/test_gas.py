@@ -0,0 +1,90 @@
+import pytest
+
+from scripts.bulk_tokenize import batch_args, encode_farm
+from scripts.delivery_batch import batch_args as delivery_batch_args
+from scripts.farm_states import DORMANT, MARKETING
+from scripts.ipfs import cid_to_bytes32
+from scripts.season_batch import SeasonBatch
+
+ipfs_hash = cid_to_bytes32('QmUfideC1r5JhMVwgd8vjC7DtVnXw3QGfCSQA7fUVHK789')
+
+token_id = 4863475
+
+@pytest.fixture(scope='module')
+def contracts(scenarios):
+    yield scenarios.deploy()
+
+@pytest.fixture(scope='module')
+def farm_contract(contracts):
+    yield contracts[0]
+
+@pytest.fixture(scope='module')
+def season_contract(contracts):
+    yield contracts[1]
+
+@pytest.fixture(scope='module')
+def harvested_scenario(scenarios, accounts):
+    yield scenarios.build(stage=MARKETING, supply=0, token_ids=(token_id,), owners=(accounts[0],))
+
+def test_season_lifecycle_gas(farm_contract, season_contract, gas_benchmark):
+    gas_benchmark.record('FRMRegistry.tokenizeLand', farm_contract.tokenizeLand('Arunga Vineyard', '294.32ha', 'Lyaduywa, Kenya', ipfs_hash, 'loam soil', token_id))
+    gas_benchmark.record('Season.openSeason', season_contract.openSeason(token_id))
+    gas_benchmark.record('Season.confirmPreparations', season_contract.confirmPreparations(token_id, 'Tomatoe', 'Organic Fertilizer', 'Cow Shed Manure', ipfs_hash))
+    gas_benchmark.record('Season.confirmPlanting', season_contract.confirmPlanting(token_id, 'F1', 'Kenya Seed Company', ipfs_hash, '1200kg', 'Jobe 1960 Organic Fertilizer', 'Kenya Seed Supplier', ipfs_hash))
+    gas_benchmark.record('Season.confirmGrowth', season_contract.confirmGrowth(token_id, 'Army worm', ipfs_hash, 'Infestor x32H', 'Aphids Supplier' , ipfs_hash))
+    gas_benchmark.record('Season.confirmHarvesting', season_contract.confirmHarvesting(token_id, "120 KG"))
+    gas_benchmark.record('Season.closeSeason', season_contract.closeSeason(token_id))
+    gas_benchmark.record('Season.openSeason.second_season', season_contract.openSeason(token_id))
+
+def test_batch_tokenize_gas(farm_contract, gas_benchmark):
+    farms = [encode_farm({'tokenId': i + 1, 'name': 'Arunga Vineyard', 'size': '294.32ha', 'location': 'Lyaduywa, Kenya', 'image': 'QmUfideC1r5JhMVwgd8vjC7DtVnXw3QGfCSQA7fUVHK789', 'soil': 'loam soil'}) for i in range(10)]
+    gas_benchmark.record('FRMRegistry.tokenizeLands.10_farms', farm_contract.tokenizeLands(*batch_args(farms)))
+
+def test_batch_season_steps_gas(scenarios, gas_benchmark):
+    scenario = scenarios.build(farms=10, stage=DORMANT, owners=[scenarios.accounts[0]] * 10)
+    batch = SeasonBatch(scenario.season)
+    for farm in scenario.farms:
+        batch.add('openSeason', farm)
+    gas_benchmark.record('Season.batchSeasonSteps.10_openings', batch.execute(scenarios.accounts[0])[0])
+
+def test_registry_gas(scenarios, accounts, gas_benchmark):
+    scenario = scenarios.build(farms=3, stage=DORMANT, owners=[accounts[0]] * 3)
+    registry = scenario.registry
+    gas_benchmark.record('FRMRegistry.setApprovalForAll', registry.setApprovalForAll(accounts[1], True, {'from': accounts[0]}))
+    gas_benchmark.record('FRMRegistry.transferFrom', registry.transferFrom(accounts[0], accounts[2], scenario.farms[0], {'from': accounts[0]}))
+    gas_benchmark.record('FRMRegistry.burn', registry.burn(scenario.farms[1], {'from': accounts[0]}))
+
+def test_market_farm_transfer_gas(scenarios, accounts, gas_benchmark):
+    scenario = scenarios.build(stage=MARKETING, supply=10, token_ids=(token_id,), owners=(accounts[0],))
+    gas_benchmark.record('FRMRegistry.transferFrom.market_farm', scenario.registry.transferFrom(accounts[0], accounts[1], token_id, {'from': accounts[0]}))
+
+def test_market_reopening_gas(scenarios, accounts, web3, gas_benchmark):
+    scenario = scenarios.build(stage=MARKETING, supply=2, token_ids=(token_id,), owners=(accounts[0],))
+    market_contract = scenario.market
+    _price = web3.toWei(1, 'ether')
+    market_contract.bookHarvest(token_id, 1, 1, {'from': accounts[2], 'value': _price})
+    gas_benchmark.record('Market.bookHarvest.repeat_booking_exhaustion', market_contract.bookHarvest(token_id, 1, 1, {'from': accounts[2], 'value': _price}))
+    gas_benchmark.record('Market.createMarket.second_market', market_contract.createMarket(token_id, 'Tomatoe', ipfs_hash, _price, 10, "KG", {'from': accounts[0]}))
+
+def test_market_lifecycle_gas(harvested_scenario, accounts, web3, gas_benchmark):
+    market_contract = harvested_scenario.market
+    _price = web3.toWei(1, 'ether')
+    _fee = web3.toWei(0.0037, 'ether')
+    gas_benchmark.record('Market.createMarket', market_contract.createMarket(token_id, 'Tomatoe', ipfs_hash, _price, 10, "KG"))
+
+    # Bookings
+    gas_benchmark.record('Market.bookHarvest.first_booking', market_contract.bookHarvest(token_id, 1, 1, {'from': accounts[2], 'value': _price}))
+    gas_benchmark.record('Market.bookHarvest.repeat_booking', market_contract.bookHarvest(token_id, 1, 1, {'from': accounts[2], 'value': _price}))
+    gas_benchmark.record('Market.bookHarvest.second_booker', market_contract.bookHarvest(token_id, 2, 1, {'from': accounts[3], 'value': _price * 2}))
+    gas_benchmark.record('Market.bookHarvest.supply_exhaustion', market_contract.bookHarvest(token_id, 6, 1, {'from': accounts[4], 'value': _price * 6}))
+
+    # Deliveries
+    gas_benchmark.record('Market.confirmReceivership.partial_delivery', market_contract.confirmReceivership(token_id, 1, 1, accounts[5], 'Fresh produce', {'from': accounts[2], 'value': _fee}))
+    gas_benchmark.record('Market.confirmReceivership.final_delivery', market_contract.confirmReceivership(token_id, 1, 1, accounts[5], 'Fresh produce', {'from': accounts[2], 'value': _fee}))
+    gas_benchmark.record('Market.batchConfirmReceivership.4_deliveries', market_contract.batchConfirmReceivership(
+        *delivery_batch_args([(token_id, 1, 1, 'Fresh produce')] * 4, accounts[5]),
+        {'from': accounts[4], 'value': _fee * 4}
+    ))
+
+    # Payouts
+    gas_benchmark.record('Market.withdraw', market_contract.withdraw({'from': accounts[0]}))
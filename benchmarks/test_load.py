@@ -0,0 +1,324 @@
+import copy
+import os
+
+from brownie.test import strategy
+
+from scripts import bulk_tokenize
+from scripts.delivery_batch import confirm_deliveries
+from scripts.farm_states import CROP_GROWTH, DORMANT, HARVESTING, MARKETING, PLANTING, PREPARATION
+from scripts.ipfs import EMPTY_BYTES32, cid_to_bytes32
+from scripts.season_batch import SeasonBatch
+
+ipfs_cid = 'QmUfideC1r5JhMVwgd8vjC7DtVnXw3QGfCSQA7fUVHK789'
+ipfs_hash = cid_to_bytes32(ipfs_cid)
+
+# Steps per example and examples per run. Every example starts over from the
+# preloaded state and grows it by at most LOAD_STEPS operations; hypothesis
+# caps the data of one example, so more examples beat longer ones
+LOAD_STEPS = int(os.environ.get('LOAD_STEPS', '300'))
+LOAD_EXAMPLES = int(os.environ.get('LOAD_EXAMPLES', '6'))
+
+# Preloaded state every example starts from: farms spread over the first
+# PRELOAD_OWNERS accounts, the first PRELOAD_MARKETS of them with an open
+# market booked by every other account, and the bookings of the first half
+# of those markets delivered and reviewed
+PRELOAD_FARMS = int(os.environ.get('PRELOAD_FARMS', '200'))
+PRELOAD_MARKETS = int(os.environ.get('PRELOAD_MARKETS', '40'))
+PRELOAD_OWNERS = 5
+PRELOAD_SUPPLY = 50
+PRELOAD_VOLUME = 2
+
+# Allowed growth of an operation's cheapest gas between its earliest and
+# latest samples, 0.05 is 5%
+GAS_THRESHOLD = float(os.environ.get('GAS_THRESHOLD', '0.05'))
+
+# Samples needed per operation before its growth is judged
+MIN_SAMPLES = 6
+
+class GasGrowth:
+    # Gas samples per operation against the state size it ran on
+    #
+    # Operations are labelled by the storage they first write (new owner,
+    # new booking, ...) so that cold and warm paths are never compared.
+    # The cheapest gas of the latest third of samples is compared with the
+    # cheapest of the earliest third: a loop over state raises both the
+    # floor and the ceiling, while cold writes only raise the ceiling.
+
+    def __init__(self):
+        self.samples = dict()
+
+    def record(self, label, size, tx):
+        self.samples.setdefault(label, list()).append((size, tx.gas_used))
+
+    def growth(self):
+        rows = list()
+        for label, samples in sorted(self.samples.items()):
+            samples = sorted(samples)
+            third = len(samples) // 3
+            if len(samples) < MIN_SAMPLES or samples[0][0] == samples[-1][0]:
+                rows.append((label, len(samples), samples[0][0], samples[-1][0], None, None))
+                continue
+            early = min(gas for _, gas in samples[:third])
+            late = min(gas for _, gas in samples[-third:])
+            rows.append((label, len(samples), samples[0][0], samples[-1][0], early, late))
+        return rows
+
+    def report(self):
+        lines = ['%-56s %8s %14s %10s %10s %8s' % ('operation', 'samples', 'state size', 'early gas', 'late gas', 'growth')]
+        for label, count, low, high, early, late in self.growth():
+            if early is None:
+                lines.append('%-56s %8d %6d..%-6d %10s %10s %8s' % (label, count, low, high, '-', '-', '-'))
+            else:
+                lines.append('%-56s %8d %6d..%-6d %10d %10d %7.2f%%' % (label, count, low, high, early, late, (late - early) * 100 / early))
+        return '\n'.join(lines)
+
+    def degraded(self):
+        return [row[0] for row in self.growth() if row[4] is not None and row[5] > row[4] * (1 + GAS_THRESHOLD)]
+
+class LoadSimulation:
+    # Interleave lifecycle operations over a shared deployment
+
+    st_account = strategy('address')
+    st_index = strategy('uint256', max_value=2 ** 32)
+    st_volume = strategy('uint256', min_value=1, max_value=5)
+    st_supply = strategy('uint256', min_value=5, max_value=50)
+
+    def __init__(cls, scenarios, accounts, web3, gas):
+        cls.contracts = scenarios.deploy()
+        cls.accounts = accounts
+        cls.provider = accounts[-1]
+        cls.price = web3.toWei(0.01, 'ether')
+        cls.fee = web3.toWei(0.0037, 'ether')
+        cls.gas = gas
+        cls.preloaded = preload(cls.contracts, accounts, cls.price, cls.provider)
+
+    def setup(self):
+        self.registry, self.season, self.market = self.contracts
+        for name, value in copy.deepcopy(self.preloaded).items():
+            setattr(self, name, value)
+        # Tokens and owners changed since the invariants last checked them
+        self.changed_farms = set()
+        self.changed_owners = set()
+
+    def teardown(self):
+        # Every tracked farm and owner, preloaded ones included
+        self.check_farms(self.owners)
+        self.check_owners(self.farm_counts)
+
+    # FARMS
+
+    def rule_tokenize(self, owner='st_account'):
+        token_id = self.next_token_id
+        self.next_token_id += 1
+        label = 'tokenizeLand' + ('' if self.farm_counts.get(owner) else '.new_owner')
+        tx = self.registry.tokenizeLand('Arunga Vineyard', '294.32ha', 'Lyaduywa, Kenya', ipfs_hash, 'loam soil', token_id, {'from': owner})
+        self.gas.record(label, len(self.owners), tx)
+        self.owners[token_id] = owner
+        self.farm_counts[owner] = self.farm_counts.get(owner, 0) + 1
+        self.states[token_id] = DORMANT
+        self.seasons[token_id] = 0
+        self.changed_farms.add(token_id)
+        self.changed_owners.add(owner)
+
+    def rule_transfer(self, index='st_index', receiver='st_account'):
+        if not self.owners:
+            return
+        token_id = sorted(self.owners)[index % len(self.owners)]
+        owner = self.owners[token_id]
+        if receiver == owner:
+            return
+        label = 'transferFrom'
+        if not self.farm_counts.get(receiver):
+            label += '.new_owner'
+        if self.farm_counts[owner] == 1:
+            label += '.last_farm'
+        tx = self.registry.transferFrom(owner, receiver, token_id, {'from': owner})
+        self.gas.record(label, len(self.owners), tx)
+        self.owners[token_id] = receiver
+        self.farm_counts[owner] -= 1
+        self.farm_counts[receiver] = self.farm_counts.get(receiver, 0) + 1
+        self.changed_farms.add(token_id)
+        self.changed_owners.update((owner, receiver))
+
+    def rule_season_step(self, index='st_index'):
+        # Farms selling a season's harvest stay open until their market sells out
+        # Farms furthest along go first, to keep harvests flowing into markets
+        farms = [i for i in sorted(self.owners) if self.states[i] != MARKETING or i in self.markets and self.markets[i][1] == 0 and self.markets[i][0] == self.seasons[i]]
+        if not farms:
+            return
+        farms = sorted(farms, key=lambda i: -self.states[i])[:4]
+        token_id = farms[index % len(farms)]
+        owner = {'from': self.owners[token_id]}
+        state = self.states[token_id]
+        if state == DORMANT:
+            label = 'Season.openSeason' + ('' if self.seasons[token_id] else '.new_farm')
+            tx = self.season.openSeason(token_id, owner)
+            self.seasons[token_id] += 1
+        elif state == PREPARATION:
+            label = 'Season.confirmPreparations'
+            tx = self.season.confirmPreparations(token_id, 'Tomatoe', 'Organic Fertilizer', 'Cow Shed Manure', ipfs_hash, owner)
+        elif state == PLANTING:
+            label = 'Season.confirmPlanting'
+            tx = self.season.confirmPlanting(token_id, 'F1', 'Kenya Seed Company', ipfs_hash, '1200kg', 'Jobe 1960 Organic Fertilizer', 'Kenya Seed Supplier', ipfs_hash, owner)
+        elif state == CROP_GROWTH:
+            label = 'Season.confirmGrowth'
+            tx = self.season.confirmGrowth(token_id, 'Army worm', ipfs_hash, 'Infestor x32H', 'Aphids Supplier', ipfs_hash, owner)
+        elif state == HARVESTING:
+            label = 'Season.confirmHarvesting'
+            tx = self.season.confirmHarvesting(token_id, "120 KG", owner)
+        else:
+            label = 'Season.closeSeason'
+            tx = self.season.closeSeason(token_id, owner)
+        self.gas.record(label, len(self.owners), tx)
+        self.states[token_id] = (state + 1) % (MARKETING + 1)
+        self.changed_farms.add(token_id)
+
+    # MARKETS
+
+    def rule_create_market(self, index='st_index', supply='st_supply'):
+        ready = [i for i in sorted(self.owners) if self.states[i] == MARKETING and (i not in self.markets or self.markets[i][0] != self.seasons[i])]
+        if not ready:
+            return
+        token_id = ready[index % len(ready)]
+        label = 'Market.createMarket' + ('.next_market' if token_id in self.markets else '.new_farm')
+        tx = self.market.createMarket(token_id, 'Tomatoe', ipfs_hash, self.price, supply, "KG", {'from': self.owners[token_id]})
+        self.gas.record(label, len(self.markets), tx)
+        self.markets[token_id] = [self.seasons[token_id], supply]
+
+    def rule_book(self, index='st_index', booker='st_account', volume='st_volume'):
+        open_markets = [i for i in sorted(self.markets) if self.markets[i][1] and self.owners[i] != booker]
+        if not open_markets:
+            return
+        token_id = open_markets[index % len(open_markets)]
+        season, remaining = self.markets[token_id]
+        volume = min(volume, remaining)
+        key = (booker, token_id, season)
+        label = 'Market.bookHarvest' + ('.repeat_booking' if key in self.bookings else '.new_booking')
+        if booker not in self.bookers:
+            label += '.new_booker'
+        if volume == remaining:
+            label += '.exhaust'
+        tx = self.market.bookHarvest(token_id, volume, season, {'from': booker, 'value': self.price * volume})
+        self.gas.record(label, self.total_bookings, tx)
+        if key not in self.bookings:
+            self.total_bookings += 1
+        self.bookings[key] = self.bookings.get(key, 0) + volume
+        self.bookers.add(booker)
+        self.markets[token_id][1] -= volume
+
+    def rule_confirm(self, index='st_index', volume='st_volume'):
+        pending = sorted(key for key, left in self.bookings.items() if left)
+        if not pending:
+            return
+        booker, token_id, season = pending[index % len(pending)]
+        key = (booker, token_id, season)
+        volume = min(volume, self.bookings[key])
+        farmer = self.owners[token_id]
+        label = 'Market.confirmReceivership' + ('.final_delivery' if volume == self.bookings[key] else '.partial_delivery')
+        if token_id not in self.delivered_farms:
+            label += '.new_farm'
+        if booker not in self.delivering_bookers:
+            label += '.new_booker'
+        if farmer not in self.farmers_paid:
+            label += '.new_farmer'
+        tx = self.market.confirmReceivership(token_id, volume, season, self.provider, 'Fresh produce', {'from': booker, 'value': self.fee})
+        self.gas.record(label, self.reviews, tx)
+        self.bookings[key] -= volume
+        if not self.bookings[key]:
+            self.reviews += 1
+        self.delivered_farms.add(token_id)
+        self.delivering_bookers.add(booker)
+        self.farmers_paid.add(farmer)
+
+    # INVARIANTS
+    # Each step checks what it changed, teardown checks everything
+
+    def invariant_farm_states(self):
+        self.check_farms(self.changed_farms)
+        self.changed_farms = set()
+
+    def invariant_owner_index(self):
+        # Transfers keep the owner index in step with ownership
+        self.check_owners(self.changed_owners)
+        self.changed_owners = set()
+
+    def check_farms(self, token_ids):
+        for token_id in token_ids:
+            assert self.registry.ownerOf(token_id) == self.owners[token_id]
+            assert self.season.getSeason(token_id) == self.states[token_id]
+
+    def check_owners(self, owners):
+        for owner in owners:
+            assert self.registry.balanceOf(owner) == self.farm_counts[owner]
+            owned = [self.registry.tokenOfOwnerByIndex(owner, i) for i in range(self.farm_counts[owner])]
+            assert sorted(owned) == sorted(i for i, o in self.owners.items() if o == owner)
+
+def preload(contracts, accounts, price, provider):
+    # Build the preloaded state through the batch entry points and return its
+    # tracking, in LoadSimulation's attributes
+    registry, season, market = contracts
+    owners = accounts[:PRELOAD_OWNERS]
+    bookers = [acc for acc in accounts if acc not in owners]
+    state = dict(
+        owners=dict(), farm_counts=dict(), states=dict(), seasons=dict(), markets=dict(), bookings=dict(),
+        bookers=set(), farmers_paid=set(), delivered_farms=set(), delivering_bookers=set(),
+        total_bookings=0, reviews=0, next_token_id=PRELOAD_FARMS + 1
+    )
+
+    # Farms, one owner after another
+    for k, owner in enumerate(owners):
+        token_ids = range(k + 1, PRELOAD_FARMS + 1, PRELOAD_OWNERS)
+        farms = [bulk_tokenize.encode_farm({'tokenId': i, 'name': 'Arunga Vineyard', 'size': '294.32ha', 'location': 'Lyaduywa, Kenya', 'image': ipfs_cid, 'soil': 'loam soil'}) for i in token_ids]
+        for start in range(0, len(farms), bulk_tokenize.MAX_FARMS):
+            registry.tokenizeLands(*bulk_tokenize.batch_args(farms[start:start + bulk_tokenize.MAX_FARMS]), {'from': owner})
+        for i in token_ids:
+            state['owners'][i] = owner
+            state['states'][i] = DORMANT
+            state['seasons'][i] = 0
+        state['farm_counts'][owner] = len(token_ids)
+
+    # A season up to marketing and an open market on the first farms
+    marketed = range(1, min(PRELOAD_MARKETS, PRELOAD_FARMS) + 1)
+    for owner in owners:
+        batch = SeasonBatch(season)
+        for i in marketed:
+            if state['owners'][i] != owner:
+                continue
+            batch.add('openSeason', i)
+            batch.add('confirmPreparations', i, 'Tomatoe', 'Organic Fertilizer', 'Cow Shed Manure', ipfs_hash)
+            batch.add('confirmPlanting', i, 'F1', 'Kenya Seed Company', ipfs_hash, '1200kg', 'Jobe 1960 Organic Fertilizer', 'Kenya Seed Supplier', ipfs_hash)
+            batch.add('confirmGrowth', i, 'Army worm', ipfs_hash, 'Infestor x32H', 'Aphids Supplier', ipfs_hash)
+            batch.add('confirmHarvesting', i, '120 KG')
+        batch.execute(owner)
+    for i in marketed:
+        market.createMarket(i, 'Tomatoe', ipfs_hash, price, PRELOAD_SUPPLY, 'KG', {'from': state['owners'][i]})
+        state['states'][i] = MARKETING
+        state['seasons'][i] = 1
+        state['markets'][i] = [1, PRELOAD_SUPPLY - PRELOAD_VOLUME * len(bookers)]
+
+    # Bookings on every market, delivered and reviewed on the first half
+    for i in marketed:
+        for booker in bookers:
+            market.bookHarvest(i, PRELOAD_VOLUME, 1, {'from': booker, 'value': price * PRELOAD_VOLUME})
+            state['bookings'][(booker, i, 1)] = PRELOAD_VOLUME
+    state['bookers'].update(bookers)
+    state['total_bookings'] = len(state['bookings'])
+    delivered = marketed[:len(marketed) // 2]
+    for booker in bookers:
+        confirm_deliveries(market, [(i, 1, PRELOAD_VOLUME, 'Fresh produce') for i in delivered], provider, booker)
+        for i in delivered:
+            state['bookings'][(booker, i, 1)] = 0
+            state['reviews'] += 1
+    if delivered:
+        state['delivering_bookers'].update(bookers)
+        state['delivered_farms'].update(delivered)
+        state['farmers_paid'].update(state['owners'][i] for i in delivered)
+    return state
+
+def test_gas_stays_constant_as_state_grows(state_machine, scenarios, accounts, web3):
+    gas = GasGrowth()
+    state_machine(LoadSimulation, scenarios, accounts, web3, gas, settings={'stateful_step_count': LOAD_STEPS, 'max_examples': LOAD_EXAMPLES})
+    print('\n' + gas.report())
+
+    # Assertions
+    assert gas.degraded() == []
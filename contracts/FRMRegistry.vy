@@ -4,6 +4,10 @@
 interface ERC721Receiver:
   def onERC721Received(_operator: address, _from: address, _tokenId: uint256, _data: Bytes[1024]) -> bytes32: view
 
+# Interface for the market told about owner changes
+interface Market:
+  def syncOwner(_tokenId: uint256, _owner: address): nonpayable
+
 # Events
 
 event Transfer:
@@ -24,19 +28,27 @@ event ApprovalForAll:
 event Tokenize:
   _totalFarms: uint256
 
+event BatchTokenize:
+  _owner: indexed(address)
+  _count: uint256
+  _totalFarms: uint256
+
 event Transition:
   _tokenId: uint256
-  _season: String[20]
+  _season: uint256
 
 # @dev Farm type
+# @dev imageHash is an IPFS CIDv0 hash stored as its 32-byte sha2-256 digest
+# @dev userIndex and platformIndex locate the token in `ownedNFT` and
+# `indexedTokenizedFarms`, they move when tokens are transferred or burned
 struct Farm:
   tokenId: uint256
   name: String[100]
   size: String[20]
   location: String[225]
-  imageHash: String[255]
+  imageHash: bytes32
   soil: String[20]
-  season: String[20]
+  season: uint256
   owner: address
   userIndex: uint256
   platformIndex: uint256
@@ -47,8 +59,8 @@ tokenizedFarms: HashMap[uint256, Farm]
 # Total tokenized lands
 tokenizedLands: uint256
 
-# @dev Index tokenized farms
-indexedTokenizedFarms: HashMap[uint256, Farm]
+# @dev Index tokenized farms: platformIndex => tokenId
+indexedTokenizedFarms: HashMap[uint256, uint256]
 
 # @dev Mapping for supported interfaces
 supportedInterfaces: HashMap[bytes32, bool]
@@ -59,8 +71,8 @@ idToOwner: HashMap[uint256, address]
 # @dev Mapping NFTs to their approved address
 idToApprovals: HashMap[uint256, address]
 
-# @dev Mapping address to number of owned ID to NFT
-ownedNFT: HashMap[address, HashMap[uint256, Farm]]
+# @dev Mapping address to number of owned ID to NFT: owner => userIndex => tokenId
+ownedNFT: HashMap[address, HashMap[uint256, uint256]]
 
 # @dev Mapping number of owned NFT to address
 ownerNFTCount: HashMap[address, uint256]
@@ -80,12 +92,33 @@ ownerAddressToOperator: HashMap[address, HashMap[address, bool]]
 # @dev Address of minter, who can mint a token
 minter: address
 
+# @dev Market contract holding owner snapshots of farm markets
+marketContract: public(address)
+
+# @dev Season contract, the only caller allowed to move farm states
+seasonContract: public(address)
+
 # @dev ERC165 interface ID of ERC165
 ERC165_INTERFACE_ID: constant(bytes32) = 0x0000000000000000000000000000000000000000000000000000000001ffc9a7
 
 # @dev ERC165 interface ID of ERC721
 ERC721_INTERFACE_ID: constant(bytes32) = 0x0000000000000000000000000000000000000000000000000000000080ac58cd
 
+# @dev ERC165 interface ID of ERC721 Enumerable
+ERC721_ENUMERABLE_INTERFACE_ID: constant(bytes32) = 0x00000000000000000000000000000000000000000000000000000000780e9d63
+
+# @dev Farm lifecycle states
+DORMANT: constant(uint256) = 0
+PREPARATION: constant(uint256) = 1
+PLANTING: constant(uint256) = 2
+CROP_GROWTH: constant(uint256) = 3
+HARVESTING: constant(uint256) = 4
+MARKETING: constant(uint256) = 5
+
+# @dev Bytes of a farm slot in tokenizeLands: name(100), size(20), location(225)
+# and soil(20) at fixed offsets, the Farm string sizes
+FARM_SLOT: constant(uint256) = 365
+
 # FUNCTIONS 
 
 @external
@@ -95,6 +128,7 @@ def __init__():
   # The interface ID of supportedInterfaces
   self.supportedInterfaces[ERC165_INTERFACE_ID] = True
   self.supportedInterfaces[ERC721_INTERFACE_ID] = True
+  self.supportedInterfaces[ERC721_ENUMERABLE_INTERFACE_ID] = True
   self.minter = msg.sender
 
 # @dev Return token name
@@ -185,18 +219,42 @@ def _isApprovedOrOwner(_spender: address, _tokenId: uint256) -> bool:
   spenderIsApprovedForAll: bool = (self.ownerAddressToOperator[owner])[_spender]
   return (spenderIsOwner or spenderIsApproved) or spenderIsApprovedForAll
 
-# @dev Add NFT to `_to`
+# @dev Tell the market about a new token owner, ZERO_ADDRESS on burn
+# @param _tokenId Token ID
+# @param _owner New owner
+@internal
+def _syncMarket(_tokenId: uint256, _owner: address):
+  if self.marketContract != ZERO_ADDRESS:
+    Market(self.marketContract).syncOwner(_tokenId, _owner)
+
+# @dev Index NFT to `_to`
+# @dev Appends the token to the owner index of `_to`, the farm record is left to the caller
 # Throws if `_tokenId` is owned by someone
+# @return Owner index of the token
 @internal
-def _addToken(_to: address, _tokenId: uint256):
+def _indexToken(_to: address, _tokenId: uint256) -> uint256:
   # Check if token is already taken
   assert self.idToOwner[_tokenId] == ZERO_ADDRESS
   # Update owner
   self.idToOwner[_tokenId] = _to
   # Update NFT owner count
   self.ownerNFTCount[_to] += 1
+  # Append to owner index
+  _userIndex: uint256 = self.ownerNFTCount[_to]
+  (self.ownedNFT[_to])[_userIndex] = _tokenId
+  return _userIndex
+
+# @dev Add NFT to `_to`
+# @dev Indexes the token and moves the farm record to `_to`
+# Throws if `_tokenId` is owned by someone
+@internal
+def _addToken(_to: address, _tokenId: uint256):
+  _userIndex: uint256 = self._indexToken(_to, _tokenId)
+  self.tokenizedFarms[_tokenId].owner = _to
+  self.tokenizedFarms[_tokenId].userIndex = _userIndex
 
 # @dev Remove token from a given address
+# @dev Moves the last token of `_from` into the freed owner index slot
 # Throws if `_from` is not the current owner
 @internal
 def _removeToken(_from: address, _tokenId: uint256):
@@ -204,6 +262,14 @@ def _removeToken(_from: address, _tokenId: uint256):
   assert self.idToOwner[_tokenId] == _from
   # Update owner
   self.idToOwner[_tokenId] = ZERO_ADDRESS
+  # Swap and pop owner index
+  _userIndex: uint256 = self.tokenizedFarms[_tokenId].userIndex
+  _lastIndex: uint256 = self.ownerNFTCount[_from]
+  if _userIndex != _lastIndex:
+    _lastToken: uint256 = (self.ownedNFT[_from])[_lastIndex]
+    (self.ownedNFT[_from])[_userIndex] = _lastToken
+    self.tokenizedFarms[_lastToken].userIndex = _userIndex
+  (self.ownedNFT[_from])[_lastIndex] = 0
   # Update NFT owner count
   self.ownerNFTCount[_from] -= 1
 
@@ -229,7 +295,7 @@ def _clearApproval(_owner: address, _tokenId: uint256):
 # Throws if `_from` is not the current owner
 # Throws if `_tokenId` is not a valid NFT
 @internal
-def _transferMechanism(_to: address, _from: address, _tokenId: uint256, _sender: address):
+def _transferMechanism(_from: address, _to: address, _tokenId: uint256, _sender: address):
   # Check _sender(msg.sender) is owner, an authorized operator, or the approves address
   assert self._isApprovedOrOwner(_sender, _tokenId)
   # Throws if `_to` is the ZERO_ADDRESS
@@ -240,6 +306,8 @@ def _transferMechanism(_to: address, _from: address, _tokenId: uint256, _sender:
   self._removeToken(_from, _tokenId)
   # Add NFT
   self._addToken(_to, _tokenId)
+  # Refresh the market owner snapshot
+  self._syncMarket(_tokenId, _to)
   # Log Transfer Mechanism
   log Transfer(_from, _to, _tokenId)
 
@@ -318,16 +386,33 @@ def setApprovalForAll(_operator: address, _approved: bool):
 # @dev Throws if `msg.sender` is not the minter
 # @dev Throws if `_to` is ZERO_ADDRESS
 # @dev Throws if `_tokenId` is owned by someone
-# @return Boolean if mint was a success
+# @dev The caller writes the farm record, owner and index included
+# @return Owner index of the minted token
 @internal
-def mint(_to: address, _tokenId: uint256) -> bool:
+def mint(_to: address, _tokenId: uint256) -> uint256:
   # Throw if `_to` is ZERO_ADDRESS
   assert _to != ZERO_ADDRESS
-  # Add NFT. Throw if `_tokenId` is owned by someone
-  self._addToken(_to, _tokenId)
+  # Index NFT. Throw if `_tokenId` is owned by someone
+  _userIndex: uint256 = self._indexToken(_to, _tokenId)
   # Log Transfer
   log Transfer(ZERO_ADDRESS, _to, _tokenId)
-  return True
+  return _userIndex
+
+# @dev Set the market contract told about owner changes
+# @param _market Market contract address
+# Throw if `msg.sender != minter`
+@external
+def setMarketContract(_market: address):
+  assert msg.sender == self.minter # dev: only minter
+  self.marketContract = _market
+
+# @dev Set the season contract allowed to move farm states
+# @param _season Season contract address
+# Throw if `msg.sender != minter`
+@external
+def setSeasonContract(_season: address):
+  assert msg.sender == self.minter # dev: only minter
+  self.seasonContract = _season
 
 # @dev Burn token
 # @dev Throw unless `msg.sender` is the current owner, an authorized operator,
@@ -344,42 +429,115 @@ def burn(_tokenId: uint256):
   assert owner != ZERO_ADDRESS
   self._clearApproval(owner, _tokenId)
   self._removeToken(owner, _tokenId)
+  self.tokenizedFarms[_tokenId].owner = ZERO_ADDRESS
+  # Swap and pop platform index
+  _platformIndex: uint256 = self.tokenizedFarms[_tokenId].platformIndex
+  if _platformIndex != self.tokenizedLands:
+    _lastToken: uint256 = self.indexedTokenizedFarms[self.tokenizedLands]
+    self.indexedTokenizedFarms[_platformIndex] = _lastToken
+    self.tokenizedFarms[_lastToken].platformIndex = _platformIndex
+  self.indexedTokenizedFarms[self.tokenizedLands] = 0
+  self.tokenizedLands -= 1
+  # Pause the market of a burned farm until its token ID is minted again
+  self._syncMarket(_tokenId, ZERO_ADDRESS)
   # Log Transfer
   log Transfer(owner, ZERO_ADDRESS, _tokenId)
 
-# @dev Tokenized farm lands
-# @param _name Name of the farm
-# @param _size Size of the land
-# @param _longitude Location of the farm(lon)
-# @param _latitude Location of the farm(lat)
-# @param _imageHash IPFS image upload hash of the farm
-# @param _tokenId Token ID to mint
-# @param _soil Farm land soil type
-# @dev Throw if `_tokenId` is already minted
-@external
-def tokenizeLand(_name: String[100], _size: String[20], _location: String[225], _imageHash: String[255], _soil: String[20], _tokenId: uint256):
-  # Check token id is valid
+# @dev Mint `_tokenId` to `_owner` and store its farm
+# @dev Callers log the tokenization
+# @dev The market of a burned token ID, and its open bookings, follows the new owner
+# Throw if `_tokenId` is already minted
+@internal
+def _tokenize(_owner: address, _name: String[100], _size: String[20], _location: String[225], _imageHash: bytes32, _soil: String[20], _tokenId: uint256):
   # Mint token
-  self.mint(msg.sender, _tokenId)
+  _userIndex: uint256 = self.mint(_owner, _tokenId)
+  # A burned token minted again takes over its market: burned token IDs keep
+  # their farm record, `tokenId` included
+  if self.tokenizedFarms[_tokenId].tokenId == _tokenId:
+    self._syncMarket(_tokenId, _owner)
   # Tokenize farm land
   self.tokenizedLands += 1
-  _farm: Farm = Farm({
+  self.tokenizedFarms[_tokenId] = Farm({
     tokenId: _tokenId,
     name: _name,
     size: _size,
     location: _location,
     imageHash: _imageHash,
     soil: _soil,
-    season: 'Dormant',
-    owner: msg.sender,
-    userIndex: self.ownerNFTCount[msg.sender],
+    season: DORMANT,
+    owner: _owner,
+    userIndex: _userIndex,
     platformIndex: self.tokenizedLands
   })
-  self.tokenizedFarms[_tokenId] = _farm
-  self.indexedTokenizedFarms[self.tokenizedLands] = _farm
   # Indexed
-  (self.ownedNFT[msg.sender])[self.ownerNFTCount[msg.sender]] = _farm
-  log Tokenize(self.tokenizedLands) 
+  self.indexedTokenizedFarms[self.tokenizedLands] = _tokenId
+
+# @dev Tokenized farm lands
+# @param _name Name of the farm
+# @param _size Size of the land
+# @param _longitude Location of the farm(lon)
+# @param _latitude Location of the farm(lat)
+# @param _imageHash IPFS image upload hash of the farm(sha2-256 multihash digest)
+# @param _tokenId Token ID to mint
+# @param _soil Farm land soil type
+# @dev Throw if `_tokenId` is already minted
+@external
+def tokenizeLand(_name: String[100], _size: String[20], _location: String[225], _imageHash: bytes32, _soil: String[20], _tokenId: uint256):
+  self._tokenize(msg.sender, _name, _size, _location, _imageHash, _soil, _tokenId)
+  log Tokenize(self.tokenizedLands)
+
+# @dev Return token ID at an index of all tokens(ERC721 Enumerable)
+# @param _index Index of the token(0-based)
+# Throw if `_index >= self.tokenizedLands`
+# @return uint256
+@external
+@view
+def tokenByIndex(_index: uint256) -> uint256:
+  assert _index < self.tokenizedLands # dev: index out of range
+  return self.indexedTokenizedFarms[_index + 1]
+
+# @dev Return token ID at an index of tokens owned by `_owner`(ERC721 Enumerable)
+# @param _owner Owner of the tokens
+# @param _index Index of the token(0-based)
+# Throw if `_index >= self.ownerNFTCount[_owner]`
+# @return uint256
+@external
+@view
+def tokenOfOwnerByIndex(_owner: address, _index: uint256) -> uint256:
+  assert _owner != ZERO_ADDRESS
+  assert _index < self.ownerNFTCount[_owner] # dev: index out of range
+  return (self.ownedNFT[_owner])[_index + 1]
+
+# @dev Tokenize a batch of farm lands in one transaction
+# @dev `msg.sender` owns every farm and one BatchTokenize is logged for the
+# batch. Strings can't be passed as arrays: farm `i` strings are read from the
+# `i`th FARM_SLOT bytes of `_farms`, each the first `_lengths[i]` bytes of
+# its field
+# @param _tokenIds Token IDs to mint
+# @param _imageHashes IPFS image upload hash of every farm
+# @param _farms Name, size, location and soil of every farm, each farm padded to FARM_SLOT bytes
+# @param _lengths Name, size, location and soil lengths of every farm
+# @param _count Number of farms to read from the arrays
+# Throw if `_count` is 0 or `_count > 20`
+# Throw if any token ID is already minted
+@external
+def tokenizeLands(_tokenIds: uint256[20], _imageHashes: bytes32[20], _farms: String[7300], _lengths: uint256[4][20], _count: uint256):
+  assert _count != 0 and _count <= 20 # dev: invalid batch size
+  for i in range(20):
+    if i >= _count:
+      break
+    _farm: String[365] = slice(_farms, FARM_SLOT * i, FARM_SLOT)
+    _name: String[100] = slice(_farm, 0, 100)
+    _size: String[20] = slice(_farm, 100, 20)
+    _location: String[225] = slice(_farm, 120, 225)
+    _soil: String[20] = slice(_farm, 345, 20)
+    # Trim in place: slicing inside the call arguments costs ~40k gas a farm
+    _name = slice(_name, 0, _lengths[i][0])
+    _size = slice(_size, 0, _lengths[i][1])
+    _location = slice(_location, 0, _lengths[i][2])
+    _soil = slice(_soil, 0, _lengths[i][3])
+    self._tokenize(msg.sender, _name, _size, _location, _imageHashes[i], _soil, _tokenIds[i])
+  log BatchTokenize(msg.sender, _count, self.tokenizedLands)
 
 # @dev Query tokenized farm land
 # @dev Throw if `_tokenId` is not valid
@@ -389,7 +547,7 @@ def tokenizeLand(_name: String[100], _size: String[20], _location: String[225],
 @view
 def queryUserTokenizedFarm(_index: uint256) -> Farm:
   assert _index <= self.ownerNFTCount[msg.sender]
-  return (self.ownedNFT[msg.sender])[_index]
+  return self.tokenizedFarms[(self.ownedNFT[msg.sender])[_index]]
 
 # @dev Return tokenized farm
 # @dev Throw if `_index` is > self.tokenizedLands
@@ -398,7 +556,61 @@ def queryUserTokenizedFarm(_index: uint256) -> Farm:
 @view
 def queryTokenizedFarm(_index: uint256) -> Farm:
   assert _index <= self.tokenizedLands
-  return self.indexedTokenizedFarms[_index]
+  return self.tokenizedFarms[self.indexedTokenizedFarms[_index]]
+
+# @dev Return a page of token IDs from the platform index
+# @param _start Platform index to start from(1-based)
+# @param _count Number of token IDs to return, capped at 10
+# @return Token ID page and number of IDs filled in the page
+@external
+@view
+def queryTokenizedFarmIds(_start: uint256, _count: uint256) -> (uint256[10], uint256):
+  assert _start != 0 # dev: index starts at 1
+  _tokenIds: uint256[10] = empty(uint256[10])
+  _filled: uint256 = 0
+  for i in range(10):
+    if i >= _count or _start + i > self.tokenizedLands:
+      break
+    _tokenIds[i] = self.indexedTokenizedFarms[_start + i]
+    _filled += 1
+  return _tokenIds, _filled
+
+# @dev Return a page of token IDs belonging to an owner
+# @param _owner Owner of the farms
+# @param _start Owner index to start from(1-based)
+# @param _count Number of token IDs to return, capped at 10
+# @return Token ID page and number of IDs filled in the page
+@external
+@view
+def queryOwnerTokenizedFarmIds(_owner: address, _start: uint256, _count: uint256) -> (uint256[10], uint256):
+  assert _owner != ZERO_ADDRESS
+  assert _start != 0 # dev: index starts at 1
+  _tokenIds: uint256[10] = empty(uint256[10])
+  _filled: uint256 = 0
+  for i in range(10):
+    if i >= _count or _start + i > self.ownerNFTCount[_owner]:
+      break
+    _tokenIds[i] = (self.ownedNFT[_owner])[_start + i]
+    _filled += 1
+  return _tokenIds, _filled
+
+# @dev Get farms attached to a page of tokens
+# @param _tokenIds Token IDs as returned by a token ID page
+# @param _count Number of token IDs to read from `_tokenIds`
+# Throw if any of the first `_count` tokens is not valid
+# @return Farm page and number of farms filled in the page
+@external
+@view
+def getFarms(_tokenIds: uint256[10], _count: uint256) -> (Farm[10], uint256):
+  _farms: Farm[10] = empty(Farm[10])
+  _filled: uint256 = 0
+  for i in range(10):
+    if i >= _count:
+      break
+    assert self.idToOwner[_tokenIds[i]] != ZERO_ADDRESS # dev: invalid token id
+    _farms[i] = self.tokenizedFarms[_tokenIds[i]]
+    _filled += 1
+  return _farms, _filled
 
 # @dev Get farm attached to the token
 # @param _tokenId Token id
@@ -428,27 +640,38 @@ def exists(_tokenId: uint256) -> bool:
   else:
     return True
 
-# @dev Update farm state
+# @dev Check and update farm state in a single call
+# @dev The transition only happens when `_sender` is the owner, the approved
+# address or an operator of the owner, and the token is in `_expected`
+# state; callers assert on the returned values
+# @dev Only the season contract may call, it records the season data of
+# every transition and passes its own `msg.sender` as `_sender`
 # @param _tokenId Token ID
+# @param _expected State the token must be in
+# @param _state New lifecycle state
+# @param _sender Placeholder for `msg.sender` of the caller
+# Throw if `msg.sender != seasonContract`
+# Throw if `_state > MARKETING`
+# @return Token owner, state before the call and whether `_sender` may act on the token
 @external
-def transitionState(_tokenId: uint256, _state: String[20], _sender: address):
-  assert self.idToOwner[_tokenId] != ZERO_ADDRESS # dev: Invalid address
-  assert self.idToOwner[_tokenId] == _sender # dev: only owner can update state
-  # Update platform tokenized farm
-  self.tokenizedFarms[_tokenId].season = _state
-  # Update user tokenized farm
-  self.indexedTokenizedFarms[self.tokenizedFarms[_tokenId].platformIndex].season = _state
-  # Update user owned NFT
-  (self.ownedNFT[_sender])[self.tokenizedFarms[_tokenId].userIndex].season = _state
-  # Log transition event
-  log Transition(_tokenId, self.tokenizedFarms[_tokenId].season)
+def advanceState(_tokenId: uint256, _expected: uint256, _state: uint256, _sender: address) -> (address, uint256, bool):
+  assert msg.sender == self.seasonContract # dev: only season
+  assert _state <= MARKETING # dev: invalid state
+  _owner: address = self.idToOwner[_tokenId]
+  _current: uint256 = self.tokenizedFarms[_tokenId].season
+  _authorized: bool = _owner != ZERO_ADDRESS and self._isApprovedOrOwner(_sender, _tokenId)
+  if _authorized and _current == _expected:
+    self.tokenizedFarms[_tokenId].season = _state
+    # Log transition event
+    log Transition(_tokenId, _state)
+  return _owner, _current, _authorized
 
 # @dev Get token state
 # @param _tokenId Token ID
-# @return String
+# @return uint256
 @external
 @view
-def getTokenState(_tokenId: uint256) -> String[20]:
+def getTokenState(_tokenId: uint256) -> uint256:
   assert self.idToOwner[_tokenId] != ZERO_ADDRESS
   return self.tokenizedFarms[_tokenId].season
 
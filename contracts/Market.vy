@@ -6,7 +6,7 @@ interface Frmregistry:
   def exists(_tokenId: uint256) -> bool: view
 
 interface Season:
-  def getSeason(_tokenId: uint256) -> String[20]: view
+  def getSeason(_tokenId: uint256) -> uint256: view
   def currentSeason(_tokenId: uint256) -> uint256: view
   def hashedSeason(_tokenId: uint256, _seasonNo: uint256) -> bytes32: view
 
@@ -14,6 +14,7 @@ interface Season:
 
 event BookHarvest:
   _tokenId: indexed(uint256)
+  _seasonNo: uint256
   _newMarketVolume: uint256
   _bookerVolume: uint256
   _booker: indexed(address)
@@ -21,6 +22,8 @@ event BookHarvest:
   _marketBookers: uint256
 
 event CreateMarket:
+  _tokenId: indexed(uint256)
+  _season: uint256
   _totalMarket: uint256
 
 event Confirmation:
@@ -34,16 +37,30 @@ event Confirmation:
   _newBookerVolume: uint256
   _newBookerDeposit: uint256
 
+event BatchConfirmation:
+  _booker: indexed(address)
+  _deliveries: uint256
+  _txVolume: uint256
+  _bookerTxVolume: uint256
+
+event Withdrawal:
+  _account: indexed(address)
+  _amount: uint256
+
 event LeaveReview:
   _tokenId: uint256
   _totalReviews: uint256
 
 # @dev Market
+# @dev productImage is an IPFS CIDv0 hash stored as its 32-byte sha2-256 digest
+# @dev owner and harvestId snapshot the farm owner and season trace hash at
+# createMarket so bookings need no external calls, the registry keeps owner
+# current through `syncOwner`
 struct Market:
   tokenId: uint256
   season: uint256
   crop: String[20]
-  productImage: String[50]
+  productImage: bytes32
   price: uint256
   supplyUnit: String[2]
   openDate: uint256
@@ -51,6 +68,15 @@ struct Market:
   originalSupply: uint256
   remainingSupply: uint256
   bookers: uint256
+  owner: address
+  harvestId: bytes32
+
+# @dev Closed market summary
+# @dev details packs season, open date, close date and bookers, 64 bits each
+struct ClosedMarket:
+  price: uint256
+  originalSupply: uint256
+  details: uint256
 
 # @dev Book
 struct Book:
@@ -64,12 +90,26 @@ struct Book:
   marketId: uint256
   harvestId: bytes32
 
+# @dev Book reference: points a market booking index at bookerBooking
+struct BookRef:
+  booker: address
+  key: uint256
+
 # @dev Review
 struct Review:
   date: uint256
   comment: String[100]
   reviewer: address
 
+# @dev Farm lifecycle state a farm must be in to go to market(mirrors FRMRegistry)
+MARKETING: constant(uint256) = 5
+
+# @dev Mask of a 64-bit field packed in ClosedMarket.details
+MAX_UINT64: constant(uint256) = 2 ** 64 - 1
+
+# @dev Bytes of a review slot in batchConfirmReceivership(Review.comment size)
+REVIEW_SLOT: constant(uint256) = 100
+
 # @dev Market fee
 MARKET_FEE: constant(uint256) = as_wei_value(0.0037, 'ether')
 
@@ -83,10 +123,10 @@ accountTx: HashMap[address, uint256]
 farmTx: HashMap[uint256, uint256]
 
 # @dev Registry contract
-farmContract: Frmregistry
+farmContract: public(Frmregistry)
 
 # @dev Season contract
-seasonContract: Season
+seasonContract: public(Season)
 
 # @dev Total number of markets
 markets: uint256
@@ -115,24 +155,24 @@ marketId: HashMap[uint256, uint256]
 # @dev Total farm previous markets: tokenId => totalPrevMarkets
 totalPrevMarkets: HashMap[uint256, uint256]
 
-# @dev Farm previous markets: tokenId => index => Market
-previousMarkets: HashMap[uint256, HashMap[uint256, Market]]
+# @dev Farm previous markets: tokenId => index => ClosedMarket
+previousMarkets: HashMap[uint256, HashMap[uint256, ClosedMarket]]
 
 # @dev Index all bookings to address
 totalBookerBookings: HashMap[address, uint256] # address => total number of booker bookings
-bookerBooking: HashMap[address, HashMap[uint256, Book]] # address => seasonNo: index => Booking{}
-seasonsBooked: HashMap[address, HashMap[uint256, uint256]] # seasons booked indexed by totalBookerBookings
-bookedSeason: HashMap[address, HashMap[uint256, bool]] # Season booked mapped to True of False
+bookerBooking: HashMap[address, HashMap[uint256, Book]] # address => booking key => Booking{}
+seasonsBooked: HashMap[address, HashMap[uint256, uint256]] # booking keys indexed by totalBookerBookings
 
 # @dev Delivered bookings for platform, market, and booker
 bookerDelivery: HashMap[address, uint256]
 marketDelivery: HashMap[uint256, uint256]
 completedDelivery: uint256
 
-# @dev Market booking: market => index => Book
-marketBooking: HashMap[uint256, HashMap[uint256, Book]]
-# @dev Index market bookings: marketId => user => index
-marketBookingIndex: HashMap[uint256, HashMap[uint256, uint256]]
+# @dev Farmer dues and provider fees owed: account => amount
+dues: HashMap[address, uint256]
+
+# @dev Market booking: market => index => BookRef
+marketBooking: HashMap[uint256, HashMap[uint256, BookRef]]
 # @dev Total farm bookers
 marketBookers: HashMap[uint256, uint256]
 
@@ -197,6 +237,7 @@ def farmPrevMarkets(_tokenId: uint256) -> uint256:
   return self.totalPrevMarkets[_tokenId]
 
 # @dev Get previous market belonging to a farm
+# @dev Crop, product image, supply unit, owner and harvest ID are not archived and come back empty
 # @param _tokenId Tokenized farm ID
 # @param _index Index in mapping variable
 # Throw if `farmContract.exists(_tokenId) == False`
@@ -207,7 +248,22 @@ def farmPrevMarkets(_tokenId: uint256) -> uint256:
 def getFarmPrevMarket(_tokenId: uint256, _index: uint256) -> Market:
   assert self.farmContract.exists(_tokenId) == True
   assert _index <= self.totalPrevMarkets[_tokenId]
-  return (self.previousMarkets[_tokenId])[_index]
+  _closed: ClosedMarket = (self.previousMarkets[_tokenId])[_index]
+  return Market({
+    tokenId: _tokenId,
+    season: bitwise_and(shift(_closed.details, -192), MAX_UINT64),
+    crop: "",
+    productImage: EMPTY_BYTES32,
+    price: _closed.price,
+    supplyUnit: "",
+    openDate: bitwise_and(shift(_closed.details, -128), MAX_UINT64),
+    closeDate: bitwise_and(shift(_closed.details, -64), MAX_UINT64),
+    originalSupply: _closed.originalSupply,
+    remainingSupply: 0,
+    bookers: bitwise_and(_closed.details, MAX_UINT64),
+    owner: ZERO_ADDRESS,
+    harvestId: EMPTY_BYTES32
+  })
 
 # @dev Get current market for a farm
 # @param _tokenId Tokenized farm ID
@@ -239,7 +295,8 @@ def getIndexedEnlistedMarket(_index: uint256) -> uint256:
 def getMarketBooking(_tokenId: uint256, _index: uint256) -> Book:
   assert self.farmContract.exists(_tokenId) == True # dev: invalid tokenized farm id
   assert _index <= self.marketBookers[_tokenId] # dev: index out of range
-  return (self.marketBooking[_tokenId])[_index]
+  _ref: BookRef = (self.marketBooking[_tokenId])[_index]
+  return (self.bookerBooking[_ref.booker])[_ref.key]
 
 # @dev Farm goes to market
 # @param _tokenId Tokenized farm ID
@@ -247,10 +304,10 @@ def getMarketBooking(_tokenId: uint256, _index: uint256) -> Book:
 # @param _supply Supply
 # @param _unit Supply unit(kilogram)
 @external
-def createMarket(_tokenId: uint256, _crop: String[20], _productImage: String[50], _price: uint256, _supply: uint256, _unit: String[2]):
+def createMarket(_tokenId: uint256, _crop: String[20], _productImage: bytes32, _price: uint256, _supply: uint256, _unit: String[2]):
   assert self.farmContract.exists(_tokenId) == True # dev: invalid tokenized farm
   assert self.farmContract.ownerOf(_tokenId) == msg.sender # dev: only owner can create market
-  assert self.seasonContract.getSeason(_tokenId) == 'Marketing'
+  assert self.seasonContract.getSeason(_tokenId) == MARKETING
   assert self.farmMarket[_tokenId].remainingSupply == 0 # dev: exhaust previous market supply
   # Market count
   if self.isMarket[_tokenId] == False:
@@ -258,10 +315,11 @@ def createMarket(_tokenId: uint256, _crop: String[20], _productImage: String[50]
     self.marketId[_tokenId] = self.markets
     self.indexEnlistedMarkets[self.markets] = _tokenId
     self.isMarket[_tokenId] = True
+  _season: uint256 = self.seasonContract.currentSeason(_tokenId)
   # Store market
   self.farmMarket[_tokenId] = Market({
     tokenId: _tokenId,
-    season: self.seasonContract.currentSeason(_tokenId),
+    season: _season,
     crop: _crop,
     productImage: _productImage,
     price: _price,
@@ -270,12 +328,14 @@ def createMarket(_tokenId: uint256, _crop: String[20], _productImage: String[50]
     remainingSupply: _supply,
     openDate: block.timestamp,
     closeDate: 0,
-    bookers: 0
+    bookers: 0,
+    owner: msg.sender,
+    harvestId: self.seasonContract.hashedSeason(_tokenId, _season)
   })
   # Marketed seasons
-  self.marketedSeason[_tokenId][self.seasonContract.currentSeason(_tokenId)] = True
+  self.marketedSeason[_tokenId][_season] = True
   # Log creating markets event
-  log CreateMarket(self.markets)
+  log CreateMarket(_tokenId, _season, self.markets)
 
 # @dev Mint season supply
 # @param _tokenId Tokenized farm ID
@@ -284,6 +344,17 @@ def createMarket(_tokenId: uint256, _crop: String[20], _productImage: String[50]
 # def mintSupply(_tokenId: uint256, _volume: uint256):
   # self.farmMarket[_tokenId].remainingSupply += _volume
 
+# @dev Refresh the owner snapshot of a farm market
+# @dev The registry calls this on every transfer and mint, and on burn with ZERO_ADDRESS
+# @param _tokenId Tokenized farm ID
+# @param _owner New token owner
+# Throw if `msg.sender != farmContract`
+@external
+def syncOwner(_tokenId: uint256, _owner: address):
+  assert msg.sender == self.farmContract.address # dev: only registry
+  if self.isMarket[_tokenId] == True:
+    self.farmMarket[_tokenId].owner = _owner
+
 # @dev Get total booker bookings
 # @param _address Booker address
 @external
@@ -311,6 +382,15 @@ def getBookerBooking(_seasonIndex: uint256, _booker: address) -> Book:
   assert _booker != ZERO_ADDRESS
   return (self.bookerBooking[_booker])[_seasonIndex]
 
+# @dev Booking key for a farm market season
+# @param _tokenId Tokenized farm ID
+# @param _seasonNo Season number
+# @return uint256
+@internal
+@pure
+def bookingKey(_tokenId: uint256, _seasonNo: uint256) -> uint256:
+  return convert(keccak256(concat(convert(_tokenId, bytes32), convert(_seasonNo, bytes32))), uint256)
+
 # @dev Get total market bookings
 # @param _tokenId Tokenized farm market ID
 # @return uint256
@@ -324,18 +404,38 @@ def totalMarketBookers(_tokenId: uint256) -> uint256:
 # @dev Burn season supply
 # @param _tokenId Tokenized farm ID
 # @param _volume Volume to burn
+# Throw if a closing market field overflows its 64-bit lane of `details`
 @internal
 def burnSupply(_tokenId: uint256, _volume: uint256):
   self.farmMarket[_tokenId].remainingSupply -= _volume
   if self.farmMarket[_tokenId].remainingSupply == 0:
     self.farmMarket[_tokenId].closeDate = block.timestamp
+    # Archive a compact summary: three slots whatever the market strings
+    # Read only the packed fields, the crop and unit strings stay in storage
+    _season: uint256 = self.farmMarket[_tokenId].season
+    _openDate: uint256 = self.farmMarket[_tokenId].openDate
+    _bookers: uint256 = self.farmMarket[_tokenId].bookers
+    assert _season < 2**64 # dev: season overflows details
+    assert _openDate < 2**64 # dev: open date overflows details
+    assert block.timestamp < 2**64 # dev: close date overflows details
+    assert _bookers < 2**64 # dev: bookers overflow details
     self.totalPrevMarkets[_tokenId] += 1
-    (self.previousMarkets[_tokenId])[self.totalPrevMarkets[_tokenId]] = self.farmMarket[_tokenId]
+    (self.previousMarkets[_tokenId])[self.totalPrevMarkets[_tokenId]] = ClosedMarket({
+      price: self.farmMarket[_tokenId].price,
+      originalSupply: self.farmMarket[_tokenId].originalSupply,
+      details: bitwise_or(
+        bitwise_or(shift(_season, 192), shift(_openDate, 128)),
+        bitwise_or(shift(block.timestamp, 64), _bookers)
+      )
+    })
 
 # @dev Book season harvest: burn season supply
 # @dev Index booking to farm
 # @dev Index booking to booker
 # @dev Update season supply after booking
+# @dev Owner and harvest ID come from the market snapshot: no external calls
+# Throw if the farm has no market or its token was burned
+# Throw if `_seasonNo` is not the market season
 # Throw if `_volume == 0 or _volume > harvestSupply`
 # Throw if `msg.value != unitPrice * _volume` : insufficient funds
 # Throw if `msg.sender == ownerOf(_tokenId)`: owner cannot book his/her harvest
@@ -346,63 +446,46 @@ def burnSupply(_tokenId: uint256, _volume: uint256):
 @external
 @payable
 def bookHarvest(_tokenId: uint256, _volume: uint256, _seasonNo: uint256):
-  assert self.farmContract.exists(_tokenId) == True # dev: invalid token id
-  assert msg.sender != self.farmContract.ownerOf(_tokenId) # dev: owner cannot book his/her harvest
+  _owner: address = self.farmMarket[_tokenId].owner
+  assert _owner != ZERO_ADDRESS # dev: invalid token id
+  assert msg.sender != _owner # dev: owner cannot book his/her harvest
+  assert _seasonNo == self.farmMarket[_tokenId].season # dev: season not on market
   assert _volume != 0 # dev: volume cannot be 0
   assert _volume <= self.farmMarket[_tokenId].remainingSupply
   assert msg.value != as_wei_value(0, 'ether') # dev: booking funds cannot be 0
   assert msg.value == self.farmMarket[_tokenId].price * _volume # dev: insufficient booking funds
   # Season metadata for mapping and storing bookings
-  _runningSeason: uint256 = _tokenId + _seasonNo
-  _harvestId: bytes32 = self.seasonContract.hashedSeason(_tokenId, _seasonNo)
-  # Store booker bookings
-  if (self.bookerBooking[msg.sender])[_runningSeason].date == 0: # New book
-    (self.bookerBooking[msg.sender])[_runningSeason].date = block.timestamp
-    (self.bookerBooking[msg.sender])[_runningSeason].originalVolume += _volume
-    (self.bookerBooking[msg.sender])[_runningSeason].volume += _volume
-    (self.bookerBooking[msg.sender])[_runningSeason].delivered = False
-    (self.bookerBooking[msg.sender])[_runningSeason].deposit += msg.value
-    (self.bookerBooking[msg.sender])[_runningSeason].booker = msg.sender
-    (self.bookerBooking[msg.sender])[_runningSeason].marketId = _tokenId
-    (self.bookerBooking[msg.sender])[_runningSeason].season = _seasonNo
-    (self.bookerBooking[msg.sender])[_runningSeason].harvestId = _harvestId
-  else: # Update old season booking
-    (self.bookerBooking[msg.sender])[_runningSeason].originalVolume += _volume
-    (self.bookerBooking[msg.sender])[_runningSeason].volume += _volume
-    (self.bookerBooking[msg.sender])[_runningSeason].delivered = False
-    (self.bookerBooking[msg.sender])[_runningSeason].deposit += msg.value
-  # Increment booker total bookings
-  if (self.bookedSeason[msg.sender])[_runningSeason] == False:
+  _key: uint256 = self.bookingKey(_tokenId, _seasonNo)
+  _book: Book = (self.bookerBooking[msg.sender])[_key]
+  if _book.date == 0: # New book
+    _book.date = block.timestamp
+    _book.booker = msg.sender
+    _book.marketId = _tokenId
+    _book.season = _seasonNo
+    _book.harvestId = self.farmMarket[_tokenId].harvestId
     # Count total booker bookings
     self.totalBookerBookings[msg.sender] += 1
     # Count farm bookers
     self.farmMarket[_tokenId].bookers += 1
-    # Account seasons booked for tracking
-    (self.bookedSeason[msg.sender])[_runningSeason] = True
-    # Count total market bookers
+    # Count total market bookers and index market bookings
     self.marketBookers[_tokenId] += 1
-    (self.marketBookingIndex[_tokenId])[_runningSeason] = self.marketBookers[_tokenId] # Index market bookings
+    (self.marketBooking[_tokenId])[self.marketBookers[_tokenId]] = BookRef({ booker: msg.sender, key: _key })
     # Index seasons booked
-    (self.seasonsBooked[msg.sender])[self.totalBookerBookings[msg.sender]] = _runningSeason
-    
+    (self.seasonsBooked[msg.sender])[self.totalBookerBookings[msg.sender]] = _key
+  _book.originalVolume += _volume
+  _book.volume += _volume
+  _book.delivered = False
+  _book.deposit += msg.value
+  # Store booking
+  (self.bookerBooking[msg.sender])[_key] = _book
   # Burn supply
   self.burnSupply(_tokenId, _volume)
-  # Store market booking
-  _book: Book = (self.bookerBooking[msg.sender])[_runningSeason]
-  _marketIndex: uint256 = (self.marketBookingIndex[_tokenId])[_runningSeason]
-  if (self.marketBooking[_tokenId])[_marketIndex].date == 0: # New book
-    # Index market booking
-    (self.marketBooking[_tokenId])[_marketIndex] = _book  
-  else: # Old book
-    (self.marketBooking[_tokenId])[_marketIndex].originalVolume += _volume
-    (self.marketBooking[_tokenId])[_marketIndex].volume += _volume
-    (self.marketBooking[_tokenId])[_marketIndex].delivered = False
-    (self.marketBooking[_tokenId])[_marketIndex].deposit += msg.value
   # Log booking
   log BookHarvest(
     _tokenId,
+    _seasonNo,
     self.farmMarket[_tokenId].remainingSupply,
-    (self.bookerBooking[msg.sender])[_runningSeason].volume,
+    _book.volume,
     msg.sender,
     self.farmMarket[_tokenId].closeDate,
     self.farmMarket[_tokenId].bookers
@@ -451,19 +534,16 @@ def getReviewForMarket(_tokenId: uint256, _index: uint256) -> Review:
 @internal
 def burnBooking(_tokenId: uint256, _booker: address, _seasonNo: uint256, _volume: uint256, _review: String[100]) -> (uint256, uint256, uint256):
   burningDeposit: uint256 = self.farmMarket[_tokenId].price * _volume
-  _runningSeason: uint256 = _tokenId + _seasonNo
+  _key: uint256 = self.bookingKey(_tokenId, _seasonNo)
   # Burn booker deposit
-  (self.bookerBooking[_booker])[_runningSeason].deposit -= burningDeposit
+  (self.bookerBooking[_booker])[_key].deposit -= burningDeposit
   # Burn booker volume
-  (self.bookerBooking[_booker])[_runningSeason].volume -= _volume
-  if (self.bookerBooking[_booker])[_runningSeason].volume == 0:
-    # Update book status for booker
-    (self.bookerBooking[_booker])[_runningSeason].delivered = True
+  (self.bookerBooking[_booker])[_key].volume -= _volume
+  if (self.bookerBooking[_booker])[_key].volume == 0:
+    # Update book status: market bookings reference this record
+    (self.bookerBooking[_booker])[_key].delivered = True
     # Review
     self.leaveReview(_tokenId, _review, _booker)
-    # Update book status for market
-    _index: uint256 = (self.marketBookingIndex[_tokenId])[_runningSeason]
-    (self.marketBooking[_tokenId])[_index].delivered = True
   # Calculate farm dues
   farmDues: uint256 = burningDeposit - MARKET_FEE
   # Calculate provider fee
@@ -471,44 +551,72 @@ def burnBooking(_tokenId: uint256, _booker: address, _seasonNo: uint256, _volume
   # Return farm overdues
   return burningDeposit, farmDues, providerFee
 
+# @dev Settle a delivered booking volume for a booker
+# @dev Farm dues go to the owner of the farm market
+# @param _tokenId Tokenized farm id
+# @param _seasonNo Season number
+# @param _volume Booking volume to confirm
+# @param _booker Booker address
+# @param _review Comment left once the booking is fully delivered
+# Throw if `farmContract.exists(_tokenId) == False`
+# Throw if `_volume == 0`
+# Throw if `_volume > (bookerBooking[_booker])[key].volume`
+# Throw if the farm market has no owner to credit
+# @return Burned deposit, provider fee
+@internal
+def settleDelivery(_tokenId: uint256, _seasonNo: uint256, _volume: uint256, _booker: address, _review: String[100]) -> (uint256, uint256):
+  assert self.farmContract.exists(_tokenId) == True # dev: invalid token id
+  assert _volume != 0 # dev: volume cannot be 0
+  _key: uint256 = self.bookingKey(_tokenId, _seasonNo)
+  assert (self.bookerBooking[_booker])[_key].volume != 0 # dev: no bookings
+  assert _volume <= (self.bookerBooking[_booker])[_key].volume # dev: volume out of range
+  # Dues of ZERO_ADDRESS could never be withdrawn
+  _owner: address = self.farmMarket[_tokenId].owner
+  assert _owner != ZERO_ADDRESS # dev: market has no owner
+  burningDeposit: uint256 = 0
+  farmDues: uint256 = 0
+  providerFee: uint256 = 0
+  (burningDeposit, farmDues, providerFee) = self.burnBooking(_tokenId, _booker, _seasonNo, _volume, _review)
+  # Update seal deals tx and delivered booking for farm market
+  self.farmTx[_tokenId] += burningDeposit - MARKET_FEE
+  self.marketDelivery[_tokenId] += 1
+  # Credit farmer dues
+  self.dues[_owner] += farmDues
+  return burningDeposit, providerFee
+
 # @dev Confirm receivership and leave a review
+# @dev ABI change: the `_farmer` argument is gone, callers pass
+# (_tokenId, _volume, _seasonNo, _provider, _review)
+# @dev Farm dues go to the market owner at delivery time, the current farm
+# owner, not to whoever owned the farm when the booking was made
 # @param _tokenId Tokenized farm id
 # @param _volume Booking volume to confirm
 # @param _seasonNo Season number
 # @param _provider Service provider
-# @param _farmer Farm beneficiary
 # Throw if `_volume > (bookerBooking[msg.sender])[_seasonNo].volume`
 # Throw if `_volume == 0`
 # Throw if `registryInterface.exists(_tokenId) == False`
 # Throw if `_seasonNo > seasonInterface.currentSeason(_tokenId)`
+# Throw if the farm market has no owner to credit
 @external
 @payable
-def confirmReceivership(_tokenId: uint256, _volume: uint256, _seasonNo: uint256, _farmer: address, _provider: address, _review: String[100]):
-  assert self.farmContract.exists(_tokenId) == True # dev: invalid token id
-  assert _volume != 0 # dev: volume cannot be 0
-  assert (self.bookerBooking[msg.sender])[_tokenId + _seasonNo].volume != 0 # dev: no bookings
-  assert _volume <= (self.bookerBooking[msg.sender])[_tokenId + _seasonNo].volume # dev: volume out of range
-  assert msg.value == MARKET_FEE # dev: insufficient confirmation fee
-  _runningSeason: uint256 = _tokenId + _seasonNo
+def confirmReceivership(_tokenId: uint256, _volume: uint256, _seasonNo: uint256, _provider: address, _review: String[100]):
   burningDeposit: uint256 = 0
-  farmDues: uint256 = 0
   providerFee: uint256 = 0
-  (burningDeposit, farmDues, providerFee) = self.burnBooking(_tokenId, msg.sender, _seasonNo, _volume, _review)
+  (burningDeposit, providerFee) = self.settleDelivery(_tokenId, _seasonNo, _volume, msg.sender, _review)
+  assert msg.value == MARKET_FEE # dev: insufficient confirmation fee
   # Update seal deals tx
   _returnTx: uint256 = burningDeposit - MARKET_FEE
-  self.farmTx[_tokenId] += _returnTx
   self.accountTx[msg.sender] += _returnTx
   self.platformTx += _returnTx
   # Update delivered booking for booker
   self.bookerDelivery[msg.sender] += 1
-  # Update delivered booking for farm market
-  self.marketDelivery[_tokenId] += 1
   # Update total receivership
   self.completedDelivery += 1
-  # Transfer dues
-  send(_farmer, farmDues)
-  send(_provider, providerFee)
+  # Credit provider fee
+  self.dues[_provider] += providerFee
   # Log booking confirmation event
+  _key: uint256 = self.bookingKey(_tokenId, _seasonNo)
   log Confirmation(
     self.platformTx,
     self.accountTx[msg.sender],
@@ -516,11 +624,114 @@ def confirmReceivership(_tokenId: uint256, _volume: uint256, _seasonNo: uint256,
     _tokenId,
     _seasonNo,
     self.farmTx[_tokenId],
-    self.bookerBooking[msg.sender][_runningSeason].delivered,
-    self.bookerBooking[msg.sender][_runningSeason].volume,
-    self.bookerBooking[msg.sender][_runningSeason].deposit
+    self.bookerBooking[msg.sender][_key].delivered,
+    self.bookerBooking[msg.sender][_key].volume,
+    self.bookerBooking[msg.sender][_key].deposit
   )
 
+# @dev Confirm receivership for a batch of bookings in one transaction
+# @dev Logs a Confirmation per delivery, as confirmReceivership would, and a
+# BatchConfirmation summary. Strings can't be passed as arrays: review `i`
+# is the first `_reviewLengths[i]` bytes of the `i`th REVIEW_SLOT bytes of
+# `_reviews`
+# @param _tokenIds Tokenized farm ids
+# @param _seasonNos Season numbers
+# @param _volumes Booking volumes to confirm
+# @param _reviews Review of every delivery, each padded to REVIEW_SLOT bytes
+# @param _reviewLengths Length of every review
+# @param _count Number of deliveries to read from the arrays
+# @param _provider Service provider
+# Throw if `_count == 0 or _count > 20`
+# Throw if `msg.value != MARKET_FEE * _count`
+# Throw if a delivery closing its booking has no review slot in `_reviews`,
+# or a review longer than its slot
+@external
+@payable
+def batchConfirmReceivership(
+    _tokenIds: uint256[20],
+    _seasonNos: uint256[20],
+    _volumes: uint256[20],
+    _reviews: String[2000],
+    _reviewLengths: uint256[20],
+    _count: uint256,
+    _provider: address
+  ):
+  assert _count != 0 and _count <= 20 # dev: invalid batch size
+  assert msg.value == MARKET_FEE * _count # dev: insufficient confirmation fee
+  burningDeposit: uint256 = 0
+  providerFee: uint256 = 0
+  _platformTx: uint256 = self.platformTx
+  _accountTx: uint256 = self.accountTx[msg.sender]
+  _providerFees: uint256 = 0
+  _key: uint256 = 0
+  for i in range(20):
+    if i >= _count:
+      break
+    _key = self.bookingKey(_tokenIds[i], _seasonNos[i])
+    # Reviews are only kept for deliveries closing their booking: skip the copy otherwise
+    _review: String[100] = ""
+    if _volumes[i] == self.bookerBooking[msg.sender][_key].volume:
+      _slot: String[100] = slice(_reviews, REVIEW_SLOT * i, REVIEW_SLOT)
+      _review = slice(_slot, 0, _reviewLengths[i])
+    (burningDeposit, providerFee) = self.settleDelivery(_tokenIds[i], _seasonNos[i], _volumes[i], msg.sender, _review)
+    _platformTx += burningDeposit - MARKET_FEE
+    _accountTx += burningDeposit - MARKET_FEE
+    _providerFees += providerFee
+    # Log delivery confirmation event
+    log Confirmation(
+      _platformTx,
+      _accountTx,
+      msg.sender,
+      _tokenIds[i],
+      _seasonNos[i],
+      self.farmTx[_tokenIds[i]],
+      self.bookerBooking[msg.sender][_key].delivered,
+      self.bookerBooking[msg.sender][_key].volume,
+      self.bookerBooking[msg.sender][_key].deposit
+    )
+  # Update seal deals tx
+  self.accountTx[msg.sender] = _accountTx
+  self.platformTx = _platformTx
+  # Update delivered bookings for booker and total receivership
+  self.bookerDelivery[msg.sender] += _count
+  self.completedDelivery += _count
+  # Credit provider fees
+  self.dues[_provider] += _providerFees
+  # Log batch confirmation event
+  log BatchConfirmation(msg.sender, _count, _platformTx, _accountTx)
+
+# @dev Get dues owed to an account
+# @param _address Address of the account
+# @return uint256
+@external
+@view
+def accountDues(_address: address) -> uint256:
+  return self.dues[_address]
+
+# @dev Get dues owed to a batch of accounts
+# @param _accounts Addresses of the accounts
+# @return uint256[20]
+@external
+@view
+def batchAccountDues(_accounts: address[20]) -> uint256[20]:
+  _dues: uint256[20] = empty(uint256[20])
+  for i in range(20):
+    _dues[i] = self.dues[_accounts[i]]
+  return _dues
+
+# @dev Claim all dues owed to `msg.sender` in one transfer
+# @dev Forwards all gas so contract accounts(multisigs, cooperatives) can claim
+# Throw if `self.dues[msg.sender] == 0`
+# Throw if the transfer fails
+@external
+@nonreentrant('withdraw')
+def withdraw():
+  _amount: uint256 = self.dues[msg.sender]
+  assert _amount != 0 # dev: nothing to withdraw
+  self.dues[msg.sender] = 0
+  raw_call(msg.sender, b"", value=_amount)
+  log Withdrawal(msg.sender, _amount)
+
 # @dev Get total delivery for an account
 # @param _address Address of the account
 # @return uint256
@@ -0,0 +1,39 @@
+# @version ^0.2.0
+
+# @dev Read aggregator: runs many view calls in one eth_call
+# @dev Results come back as consecutive 32-byte words, each call at most 32 words
+
+# @dev Aggregate static calls
+# @param _targets Contracts to call
+# @param _calldata Calldata of every call, concatenated
+# @param _lengths Calldata length of every call
+# @param _count Number of calls
+# Throw if `_count > 20`
+# Throw if any call reverts
+# Throw if any call returns more than 1024 bytes
+# @return (block number, return data size of every call, return data words)
+@external
+@view
+def aggregate(_targets: address[20], _calldata: Bytes[2048], _lengths: uint256[20], _count: uint256) -> (uint256, uint256[20], bytes32[640]):
+  assert _count <= 20 # dev: too many calls
+  _sizes: uint256[20] = empty(uint256[20])
+  _words: bytes32[640] = empty(bytes32[640])
+  _offset: uint256 = 0
+  _cursor: uint256 = 0
+  for i in range(20):
+    if i >= _count:
+      break
+    # One spare word so oversized return data is caught instead of truncated
+    _ret: Bytes[1056] = raw_call(_targets[i], slice(_calldata, _offset, _lengths[i]), max_outsize=1056, is_static_call=True)
+    assert len(_ret) <= 1024 # dev: return data too large
+    _offset += _lengths[i]
+    _sizes[i] = len(_ret)
+    # Copy return data into the word buffer
+    _start: int128 = 0
+    for j in range(32):
+      if convert(_start, uint256) >= _sizes[i]:
+        break
+      _words[_cursor] = extract32(_ret, _start)
+      _cursor += 1
+      _start += 32
+  return block.number, _sizes, _words
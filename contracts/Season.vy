@@ -2,10 +2,9 @@
 
 # External Interfaces
 interface Frmregistry:
-    def ownerOf(_tokenId: uint256) -> address: view
     def exists(_tokenId: uint256) -> bool: view
-    def transitionState(_tokenId: uint256, _state: String[20], _sender: address): nonpayable
-    def getTokenState(_tokenId: uint256) -> String[20]: view
+    def advanceState(_tokenId: uint256, _expected: uint256, _state: uint256, _sender: address) -> (address, uint256, bool): nonpayable
+    def getTokenState(_tokenId: uint256) -> uint256: view
 
 # Events
 
@@ -25,6 +24,21 @@ event Harvesting:
   _tokenId: indexed(uint256)
   _season: indexed(String[20])
 
+# @dev Farm lifecycle states(mirrors FRMRegistry)
+DORMANT: constant(uint256) = 0
+PREPARATION: constant(uint256) = 1
+PLANTING: constant(uint256) = 2
+CROP_GROWTH: constant(uint256) = 3
+HARVESTING: constant(uint256) = 4
+MARKETING: constant(uint256) = 5
+
+# @dev Trace hash: Merkle root over season data, 8 groups of 8 leaves
+# @dev Groups: 0 open, 1 preparations, 2 planting, 3 crop growth, 4 harvest
+# @dev Leaf: keccak256(index ++ value), index is group * 8 + position and
+# strings are committed as their keccak256 hash. Unused leaves and groups
+# are EMPTY_BYTES32. Each step commits its group root to `traceGroups`,
+# harvest confirmation folds them into the trace hash and clears them
+
 # State data
 
 # @dev Total farm state count
@@ -40,6 +54,7 @@ farmCompleteSeason: HashMap[uint256, uint256]
 runningSeason: HashMap[uint256, uint256]
 
 # @dev Farm season data
+# @dev Proofs and images are IPFS CIDv0 hashes stored as their 32-byte sha2-256 digest
 struct SeasonData:
   # Open season
   tokenId: uint256
@@ -48,43 +63,60 @@ struct SeasonData:
   crop: String[225]
   preparationFertilizer: String[225]
   preparationFertilizerSupplier: String[225]
-  preparationFertilizerProof: String[225]
+  preparationFertilizerProof: bytes32
   preparationDate: uint256
   # Confirm planting
   seedsUsed: String[225]
   seedsSupplier: String[225]
-  seedProof: String[225]
+  seedProof: bytes32
   expectedYield: String[50]
   plantingFertilizer: String[225]
   plantingFertilizerSupplier: String[225]
-  plantingFertilizerProof: String[225]
+  plantingFertilizerProof: bytes32
   plantingDate: uint256
   # Confirm crop growth
   pestOrVirus: String[225]
   pesticideUsed: String[225]
-  pesticideImage: String[225]
+  pesticideImage: bytes32
   pesticideSupplier: String[225]
-  proofOfTxForPesticide: String[225]
+  proofOfTxForPesticide: bytes32
   growthDate: uint256
   # Confirm harvesting
   harvestDate: uint256
   harvestSupply: String[225]
   traceHash: bytes32
 
+# @dev Season summary: dates, crop and trace hash of a season
+struct SeasonSummary:
+  tokenId: uint256
+  season: uint256
+  crop: String[225]
+  openingDate: uint256
+  preparationDate: uint256
+  plantingDate: uint256
+  growthDate: uint256
+  harvestDate: uint256
+  traceHash: bytes32
+
+# @dev Season data reference: points a trace hash at seasonData
+struct SeasonRef:
+  tokenId: uint256
+  season: uint256
+
 # @dev Map season data to farm
 seasonData: HashMap[uint256, HashMap[uint256, SeasonData]]
 
 # @dev Farm registry interface variable
-farmContract: Frmregistry
-
-# @dev Resolved hashes
-resolvedHashes: HashMap[bytes32, bool]
+farmContract: public(Frmregistry)
 
 # @dev Map tokenized farm season to its hash
 seasonHash: HashMap[uint256, HashMap[uint256, bytes32]]
 
-# @dev Season data hashing
-seasonDataHash: HashMap[bytes32, SeasonData]
+# @dev Season data hashing: hash => SeasonRef(season is 0 for unresolved hashes)
+seasonDataHash: HashMap[bytes32, SeasonRef]
+
+# @dev Trace tree group roots of running seasons, cleared on harvest: tokenId => season => group roots
+traceGroups: HashMap[uint256, HashMap[uint256, bytes32[8]]]
 
 @external
 def __init__(registry_contract_address: address):
@@ -92,10 +124,10 @@ def __init__(registry_contract_address: address):
 
 # @dev Get token season
 # @param _tokenId Token ID
-# @return String
+# @return uint256
 @external
 @view
-def getSeason(_tokenId: uint256) -> String[20]:
+def getSeason(_tokenId: uint256) -> uint256:
   assert self.farmContract.exists(_tokenId) == True
   return self.farmContract.getTokenState(_tokenId)
 
@@ -115,16 +147,37 @@ def currentSeason(_tokenId: uint256) -> uint256:
   assert self.farmContract.exists(_tokenId) == True
   return self.runningSeason[_tokenId]
 
+# @dev Merkle root over a list of nodes, keccak256(left ++ right) per pair
+# @dev Unused nodes are EMPTY_BYTES32
+# @param _nodes Leaves of a group, or group roots
+# @return bytes32
+@internal
+@pure
+def _merkleRoot(_nodes: bytes32[8]) -> bytes32:
+  _level: bytes32[8] = _nodes
+  _width: uint256 = 4
+  for _depth in range(3):
+    for i in range(4):
+      if i >= _width:
+        break
+      _level[i] = keccak256(concat(_level[2 * i], _level[2 * i + 1]))
+    _width /= 2
+  return _level[0]
+
 # @dev Open season: Token should be in dormant state to open new season
 # @param _tokenId Tokenized farm ID
 @external
 def openSeason(_tokenId: uint256):
-  assert self.farmContract.getTokenState(_tokenId) == 'Dormant' # dev: is not dormant
+  _owner: address = ZERO_ADDRESS
+  _state: uint256 = 0
+  _authorized: bool = False
+  _owner, _state, _authorized = self.farmContract.advanceState(_tokenId, DORMANT, PREPARATION, msg.sender)
+  assert _state == DORMANT # dev: is not dormant
+  assert _authorized # dev: only owner can update state
   self.runningSeason[_tokenId] += 1
   _runningSeason: uint256 = self.runningSeason[_tokenId]
   (self.seasonData[_tokenId])[_runningSeason].tokenId = _tokenId
   (self.seasonData[_tokenId])[_runningSeason].openingDate = block.timestamp
-  self.farmContract.transitionState(_tokenId, 'Preparation', msg.sender) # dev: only owner can update state
 
 # @dev Confirm preparations for new plantings
 # @param _tokenId Tokenized farm ID
@@ -138,18 +191,32 @@ def confirmPreparations(
     _crop: String[225],
     _preparationFertilizer: String[225],
     _preparationFertilizerSupplier: String[225],
-    _txBinding: String[225]
+    _txBinding: bytes32
   ):
-    assert self.farmContract.ownerOf(_tokenId) == msg.sender # dev: only owner can confirm preparations
-    assert self.farmContract.getTokenState(_tokenId) == 'Preparation' # dev: state is not preparations
+    _owner: address = ZERO_ADDRESS
+    _state: uint256 = 0
+    _authorized: bool = False
+    # Transition state
+    _owner, _state, _authorized = self.farmContract.advanceState(_tokenId, PREPARATION, PLANTING, msg.sender)
+    assert _authorized # dev: only owner can confirm preparations
+    assert _state == PREPARATION # dev: state is not preparations
     _runningSeason: uint256 = self.runningSeason[_tokenId]
     (self.seasonData[_tokenId])[_runningSeason].crop = _crop
     (self.seasonData[_tokenId])[_runningSeason].preparationFertilizer = _preparationFertilizer
     (self.seasonData[_tokenId])[_runningSeason].preparationFertilizerSupplier = _preparationFertilizerSupplier
     (self.seasonData[_tokenId])[_runningSeason].preparationFertilizerProof = _txBinding
     (self.seasonData[_tokenId])[_runningSeason].preparationDate = block.timestamp
-    # Transition state
-    self.farmContract.transitionState(_tokenId, 'Planting', msg.sender)
+    # Commit preparations
+    (self.traceGroups[_tokenId])[_runningSeason][1] = self._merkleRoot([
+      keccak256(concat(convert(8, bytes32), keccak256(_crop))),
+      keccak256(concat(convert(9, bytes32), keccak256(_preparationFertilizer))),
+      keccak256(concat(convert(10, bytes32), keccak256(_preparationFertilizerSupplier))),
+      keccak256(concat(convert(11, bytes32), _txBinding)),
+      keccak256(concat(convert(12, bytes32), convert(block.timestamp, bytes32))),
+      EMPTY_BYTES32,
+      EMPTY_BYTES32,
+      EMPTY_BYTES32
+    ])
 
 # @dev Confirm planting
 # @param _tokenId Tokenized farm ID
@@ -165,14 +232,19 @@ def confirmPlanting(
     _tokenId: uint256,
     _seedsUsed: String[225],
     _seedsSupplier: String[225],
-    _seedProof: String[225],
+    _seedProof: bytes32,
     _expectedYield: String[50],
     _plantingFertilizer: String[225],
     _plantingFertilizerSupplier: String[225],
-    _plantingFertilizerSupplierProof: String[225]
+    _plantingFertilizerSupplierProof: bytes32
   ):
-    assert self.farmContract.ownerOf(_tokenId) == msg.sender # dev: only owner can confirm planting
-    assert self.farmContract.getTokenState(_tokenId) == 'Planting' # dev: state is not planting
+    _owner: address = ZERO_ADDRESS
+    _state: uint256 = 0
+    _authorized: bool = False
+    # Transition state
+    _owner, _state, _authorized = self.farmContract.advanceState(_tokenId, PLANTING, CROP_GROWTH, msg.sender)
+    assert _authorized # dev: only owner can confirm planting
+    assert _state == PLANTING # dev: state is not planting
     _runningSeason: uint256 = self.runningSeason[_tokenId]
     (self.seasonData[_tokenId])[_runningSeason].seedsUsed = _seedsUsed
     (self.seasonData[_tokenId])[_runningSeason].seedsSupplier = _seedsSupplier
@@ -182,8 +254,17 @@ def confirmPlanting(
     (self.seasonData[_tokenId])[_runningSeason].plantingFertilizerSupplier = _plantingFertilizerSupplier
     (self.seasonData[_tokenId])[_runningSeason].plantingFertilizerProof = _plantingFertilizerSupplierProof
     (self.seasonData[_tokenId])[_runningSeason].plantingDate = block.timestamp
-    # Transition state
-    self.farmContract.transitionState(_tokenId, 'Crop Growth', msg.sender)
+    # Commit planting
+    (self.traceGroups[_tokenId])[_runningSeason][2] = self._merkleRoot([
+      keccak256(concat(convert(16, bytes32), keccak256(_seedsUsed))),
+      keccak256(concat(convert(17, bytes32), keccak256(_seedsSupplier))),
+      keccak256(concat(convert(18, bytes32), _seedProof)),
+      keccak256(concat(convert(19, bytes32), keccak256(_expectedYield))),
+      keccak256(concat(convert(20, bytes32), keccak256(_plantingFertilizer))),
+      keccak256(concat(convert(21, bytes32), keccak256(_plantingFertilizerSupplier))),
+      keccak256(concat(convert(22, bytes32), _plantingFertilizerSupplierProof)),
+      keccak256(concat(convert(23, bytes32), convert(block.timestamp, bytes32)))
+    ])
 
 # @dev Confirm crop growth
 # @param _tokenId Tokenized farm ID
@@ -195,13 +276,18 @@ def confirmPlanting(
 def confirmGrowth(
     _tokenId: uint256,
     _pestOrVirus: String[225],
-    _image: String[225],
+    _image: bytes32,
     _pesticideUsed: String[225],
     _pesticideSupplier: String[225],
-    _proofOfTxForPesticide: String[225]
+    _proofOfTxForPesticide: bytes32
   ):
-    assert self.farmContract.ownerOf(_tokenId) == msg.sender # dev: only owner can confirm crop growth
-    assert self.farmContract.getTokenState(_tokenId) == 'Crop Growth' # dev: state is not crop growth
+    _owner: address = ZERO_ADDRESS
+    _state: uint256 = 0
+    _authorized: bool = False
+    # Transition state
+    _owner, _state, _authorized = self.farmContract.advanceState(_tokenId, CROP_GROWTH, HARVESTING, msg.sender)
+    assert _authorized # dev: only owner can confirm crop growth
+    assert _state == CROP_GROWTH # dev: state is not crop growth
     _runningSeason: uint256 = self.runningSeason[_tokenId]
     (self.seasonData[_tokenId])[_runningSeason].pestOrVirus = _pestOrVirus
     (self.seasonData[_tokenId])[_runningSeason].pesticideImage = _image
@@ -209,8 +295,17 @@ def confirmGrowth(
     (self.seasonData[_tokenId])[_runningSeason].pesticideSupplier = _pesticideSupplier
     (self.seasonData[_tokenId])[_runningSeason].proofOfTxForPesticide = _proofOfTxForPesticide
     (self.seasonData[_tokenId])[_runningSeason].growthDate = block.timestamp
-    # Transition state
-    self.farmContract.transitionState(_tokenId, 'Harvesting', msg.sender)
+    # Commit crop growth
+    (self.traceGroups[_tokenId])[_runningSeason][3] = self._merkleRoot([
+      keccak256(concat(convert(24, bytes32), keccak256(_pestOrVirus))),
+      keccak256(concat(convert(25, bytes32), keccak256(_pesticideUsed))),
+      keccak256(concat(convert(26, bytes32), _image)),
+      keccak256(concat(convert(27, bytes32), keccak256(_pesticideSupplier))),
+      keccak256(concat(convert(28, bytes32), _proofOfTxForPesticide)),
+      keccak256(concat(convert(29, bytes32), convert(block.timestamp, bytes32))),
+      EMPTY_BYTES32,
+      EMPTY_BYTES32
+    ])
 
 # @dev Confirm harvesting
 # @param _tokenId Tokenized farm ID
@@ -219,24 +314,49 @@ def confirmGrowth(
 # @param _unitPrice Harvest price per unit
 @external
 def confirmHarvesting(_tokenId: uint256, _supply: String[225]):
-  assert self.farmContract.ownerOf(_tokenId) == msg.sender # dev: only owner can confirm harvesting
-  assert self.farmContract.getTokenState(_tokenId) == 'Harvesting' # dev: state is not harvesting
+  _owner: address = ZERO_ADDRESS
+  _state: uint256 = 0
+  _authorized: bool = False
+  # Transition state
+  _owner, _state, _authorized = self.farmContract.advanceState(_tokenId, HARVESTING, MARKETING, msg.sender)
+  assert _authorized # dev: only owner can confirm harvesting
+  assert _state == HARVESTING # dev: state is not harvesting
   _runningSeason: uint256 = self.runningSeason[_tokenId]
   # When was the harvest date
   (self.seasonData[_tokenId])[_runningSeason].harvestDate = block.timestamp
   (self.seasonData[_tokenId])[_runningSeason].harvestSupply = _supply
-  # Hash season data after harvest confirmation
-  _tr: uint256 = _tokenId + _runningSeason
-  _trHash: bytes32 = convert(_tr, bytes32)
-  _hash: bytes32 = keccak256(_trHash)
+  # Commit season data after harvest confirmation: the trace hash is the
+  # Merkle root over the step groups
+  _groups: bytes32[8] = (self.traceGroups[_tokenId])[_runningSeason]
+  # Group roots are only needed up to here: clearing them refunds the slots
+  (self.traceGroups[_tokenId])[_runningSeason] = empty(bytes32[8])
+  _groups[0] = self._merkleRoot([
+    keccak256(concat(convert(0, bytes32), convert(_tokenId, bytes32))),
+    keccak256(concat(convert(1, bytes32), convert((self.seasonData[_tokenId])[_runningSeason].openingDate, bytes32))),
+    EMPTY_BYTES32,
+    EMPTY_BYTES32,
+    EMPTY_BYTES32,
+    EMPTY_BYTES32,
+    EMPTY_BYTES32,
+    EMPTY_BYTES32
+  ])
+  _groups[4] = self._merkleRoot([
+    keccak256(concat(convert(32, bytes32), convert(block.timestamp, bytes32))),
+    keccak256(concat(convert(33, bytes32), keccak256(_supply))),
+    keccak256(concat(convert(34, bytes32), convert(_runningSeason, bytes32))),
+    EMPTY_BYTES32,
+    EMPTY_BYTES32,
+    EMPTY_BYTES32,
+    EMPTY_BYTES32,
+    EMPTY_BYTES32
+  ])
+  _hash: bytes32 = self._merkleRoot(_groups)
   (self.seasonData[_tokenId])[_runningSeason].traceHash = _hash # Trace ID
   # Resolve season hash to season data
-  self.seasonDataHash[_hash] = (self.seasonData[_tokenId])[_runningSeason]
-  self.resolvedHashes[_hash] = True
+  assert self.seasonDataHash[_hash].season == 0 # dev: trace hash taken
+  self.seasonDataHash[_hash] = SeasonRef({ tokenId: _tokenId, season: _runningSeason })
   # Resolve hash to farm season
   (self.seasonHash[_tokenId])[_runningSeason] = _hash
-  # Transition state
-  self.farmContract.transitionState(_tokenId, 'Marketing', msg.sender)
   self.farmCompleteSeason[_tokenId] += 1
   self.totalCompletedSeasons += 1
 
@@ -250,6 +370,55 @@ def querySeasonData(_tokenId: uint256, _index: uint256) -> SeasonData:
   assert _index <= self.runningSeason[_tokenId]
   return (self.seasonData[_tokenId])[_index]
 
+# @dev Summarize season data
+# @param _tokenId Tokenized farm
+# @param _season Season number
+# @return SeasonSummary
+@internal
+@view
+def _summary(_tokenId: uint256, _season: uint256) -> SeasonSummary:
+  return SeasonSummary({
+    tokenId: _tokenId,
+    season: _season,
+    crop: (self.seasonData[_tokenId])[_season].crop,
+    openingDate: (self.seasonData[_tokenId])[_season].openingDate,
+    preparationDate: (self.seasonData[_tokenId])[_season].preparationDate,
+    plantingDate: (self.seasonData[_tokenId])[_season].plantingDate,
+    growthDate: (self.seasonData[_tokenId])[_season].growthDate,
+    harvestDate: (self.seasonData[_tokenId])[_season].harvestDate,
+    traceHash: (self.seasonData[_tokenId])[_season].traceHash
+  })
+
+# @dev Query season summary
+# @param _tokenId Tokenized farm
+# @param _index Season index
+# @return SeasonSummary
+@external
+@view
+def querySeasonSummary(_tokenId: uint256, _index: uint256) -> SeasonSummary:
+  assert self.farmContract.exists(_tokenId) == True
+  assert _index <= self.runningSeason[_tokenId]
+  return self._summary(_tokenId, _index)
+
+# @dev Return a page of season summaries of a farm
+# @param _tokenId Tokenized farm
+# @param _start Season to start from(1-based)
+# @param _count Number of seasons to return, capped at 10
+# @return Season summary page and number of summaries filled in the page
+@external
+@view
+def querySeasonSummaries(_tokenId: uint256, _start: uint256, _count: uint256) -> (SeasonSummary[10], uint256):
+  assert self.farmContract.exists(_tokenId) == True
+  assert _start != 0 # dev: index starts at 1
+  _summaries: SeasonSummary[10] = empty(SeasonSummary[10])
+  _filled: uint256 = 0
+  for i in range(10):
+    if i >= _count or _start + i > self.runningSeason[_tokenId]:
+      break
+    _summaries[i] = self._summary(_tokenId, _start + i)
+    _filled += 1
+  return _summaries, _filled
+
 # @dev Farm complete season
 # @param _tokenId Tokenized farm
 @external
@@ -262,11 +431,43 @@ def getFarmCompleteSeasons(_tokenId: uint256) -> uint256:
 # @param _tokenId Tokenized farm ID
 @external
 def closeSeason(_tokenId: uint256):
-  assert self.farmContract.exists(_tokenId) == True
-  assert self.farmContract.getTokenState(_tokenId) == 'Marketing' # dev: is not harvesting
+  _owner: address = ZERO_ADDRESS
+  _state: uint256 = 0
+  _authorized: bool = False
+  _owner, _state, _authorized = self.farmContract.advanceState(_tokenId, MARKETING, DORMANT, msg.sender)
+  assert _owner != ZERO_ADDRESS # dev: invalid token id
+  assert _state == MARKETING # dev: is not harvesting
   # Is market supply exhausted?
-  assert self.farmContract.ownerOf(_tokenId) == msg.sender # dev: only owner can close shop
-  self.farmContract.transitionState(_tokenId, 'Dormant', msg.sender)
+  assert _authorized # dev: only owner can close shop
+
+# @dev Run a batch of season steps in one transaction
+# @dev Every call is calldata of a season step(openSeason, confirm* or
+# closeSeason), delegate-called so that `msg.sender` acts on every farm.
+# Step data can't be passed as arrays of strings
+# @param _calldata Calldata of every step, concatenated
+# @param _lengths Calldata length of every step
+# @param _count Number of steps
+# Throw if `_count` is 0 or `_count > 20`
+# Throw if a call is not a season step
+# Throw if any step fails
+@external
+def batchSeasonSteps(_calldata: Bytes[16384], _lengths: uint256[20], _count: uint256):
+  assert _count != 0 and _count <= 20 # dev: invalid batch size
+  _offset: uint256 = 0
+  for i in range(20):
+    if i >= _count:
+      break
+    _selector: Bytes[4] = slice(_calldata, _offset, 4)
+    assert (
+      _selector == method_id("openSeason(uint256)") or
+      _selector == method_id("confirmPreparations(uint256,string,string,string,bytes32)") or
+      _selector == method_id("confirmPlanting(uint256,string,string,bytes32,string,string,string,bytes32)") or
+      _selector == method_id("confirmGrowth(uint256,string,bytes32,string,string,bytes32)") or
+      _selector == method_id("confirmHarvesting(uint256,string)") or
+      _selector == method_id("closeSeason(uint256)")
+    ) # dev: not a season step
+    raw_call(self, slice(_calldata, _offset, _lengths[i]), is_delegate_call=True)
+    _offset += _lengths[i]
 
 # @dev Season data hash status
 # @param _hash Season data hash
@@ -274,18 +475,31 @@ def closeSeason(_tokenId: uint256):
 @view
 def resolvedHash(_hash: bytes32) -> bool:
   assert _hash != EMPTY_BYTES32
-  return self.resolvedHashes[_hash]
+  return self.seasonDataHash[_hash].season != 0
 
 # @dev Resolve season data hash
 # @param _hash Season data hash signature
 # @return SeasonData
-# Throw if `self.resolvedHashes[_hash] == False`
+# Throw if `_hash` is not resolved
 @external
 @view
 def resolveSeasonHash(_hash: bytes32) -> SeasonData:
   assert _hash != EMPTY_BYTES32
-  assert self.resolvedHashes[_hash] == True
-  return self.seasonDataHash[_hash]
+  _ref: SeasonRef = self.seasonDataHash[_hash]
+  assert _ref.season != 0 # dev: unresolved hash
+  return (self.seasonData[_ref.tokenId])[_ref.season]
+
+# @dev Resolve season data hash to a season summary
+# @param _hash Season data hash signature
+# @return SeasonSummary
+# Throw if `_hash` is not resolved
+@external
+@view
+def resolveSeasonSummary(_hash: bytes32) -> SeasonSummary:
+  assert _hash != EMPTY_BYTES32
+  _ref: SeasonRef = self.seasonDataHash[_hash]
+  assert _ref.season != 0 # dev: unresolved hash
+  return self._summary(_ref.tokenId, _ref.season)
 
 # @dev Get farm season data hash
 # @param _tokenId Tokenized farm id
@@ -0,0 +1,179 @@
+from brownie import FRMRegistry, Market, Season, accounts, network, web3
+from eth_utils import to_checksum_address
+from hexbytes import HexBytes
+
+# EIP-2929/2930 gas: an access list pays 2400 per account and 1900 per storage
+# key up front, the first access of a listed account or key is then warm(100)
+# instead of cold(2600 account, 2100 storage key)
+ACCESS_LIST_ADDRESS_COST = 2400
+ACCESS_LIST_STORAGE_KEY_COST = 1900
+COLD_ACCOUNT_ACCESS_COST = 2600
+COLD_SLOAD_COST = 2100
+WARM_ACCESS_COST = 100
+
+# Addresses up to this one are precompiles, always warm(Vyper copies memory
+# through the identity precompile)
+LAST_PRECOMPILE = 0xff
+
+# Opcodes that touch an account => position of the address from the top of the stack
+ACCOUNT_OPCODES = {
+    'BALANCE': 0,
+    'EXTCODESIZE': 0,
+    'EXTCODECOPY': 0,
+    'EXTCODEHASH': 0,
+    'CALL': 1,
+    'CALLCODE': 1,
+    'STATICCALL': 1,
+    'DELEGATECALL': 1
+}
+
+# Calls that run code in the callee's storage, the others keep the caller's
+CONTEXT_CALLS = ('CALL', 'STATICCALL')
+
+STORAGE_OPCODES = ('SLOAD', 'SSTORE')
+
+CONTAINERS = {
+    'FRMRegistry': FRMRegistry,
+    'Season': Season,
+    'Market': Market
+}
+
+def rpc(w3, method, params):
+    response = w3.provider.make_request(method, params)
+    if 'error' in response:
+        raise ValueError('%s: %s' % (method, response['error'].get('message', response['error'])))
+    return response['result']
+
+def rpc_tx(tx):
+    # Call object of a transaction dict for raw RPC requests
+    call = {'from': tx['from'], 'to': tx['to'], 'data': '0x' + bytes(HexBytes(tx['data'])).hex()}
+    if tx.get('value'):
+        call['value'] = hex(tx['value'])
+    return call
+
+def _word(value):
+    # structLogs stack items are hex with or without 0x
+    return int(value, 16) if isinstance(value, str) else int(value)
+
+def access_list_from_trace(struct_logs, to):
+    # Every account and storage key a structLogs trace of a call to `to` touches
+    touched = dict()
+    # Storage context per call depth, the first log is at the outermost depth
+    contexts = [to_checksum_address(to)]
+    base = struct_logs[0]['depth'] if struct_logs else 0
+    for log in struct_logs:
+        depth = log['depth'] - base
+        op = log['op']
+        stack = log['stack']
+        if op in STORAGE_OPCODES:
+            key = '0x%064x' % _word(stack[-1])
+            touched.setdefault(contexts[depth], set()).add(key)
+        elif op in ACCOUNT_OPCODES:
+            address = to_checksum_address('0x%040x' % (_word(stack[-1 - ACCOUNT_OPCODES[op]]) % 2 ** 160))
+            touched.setdefault(address, set())
+            if op in ('CALL', 'CALLCODE', 'STATICCALL', 'DELEGATECALL'):
+                # Logs one level deeper run in the callee, or in the caller's storage
+                del contexts[depth + 1:]
+                contexts.append(address if op in CONTEXT_CALLS else contexts[depth])
+    return [{'address': address, 'storageKeys': sorted(keys)} for address, keys in touched.items()]
+
+def entry_savings(entry, warm):
+    # Gas an access list entry saves, negative when it costs more than it saves
+    # Listed accounts and keys are touched by the transaction: their first
+    # access would be cold. A key first written saves 100 more than counted
+    keys = len(entry['storageKeys']) * (COLD_SLOAD_COST - WARM_ACCESS_COST - ACCESS_LIST_STORAGE_KEY_COST)
+    if entry['address'] in warm or int(entry['address'], 16) <= LAST_PRECOMPILE:
+        return keys - ACCESS_LIST_ADDRESS_COST
+    return keys + COLD_ACCOUNT_ACCESS_COST - WARM_ACCESS_COST - ACCESS_LIST_ADDRESS_COST
+
+def prune(access_list, warm):
+    # Entries that pay for themselves: the sender, recipient and precompiles
+    # are warm already and only pay off with many storage keys
+    warm = {to_checksum_address(address) for address in warm}
+    pruned = list()
+    for entry in access_list:
+        entry = {'address': to_checksum_address(entry['address']), 'storageKeys': ['0x%064x' % _word(key) for key in entry['storageKeys']]}
+        if entry_savings(entry, warm) > 0:
+            pruned.append(entry)
+    return pruned
+
+def trace_access_list(w3, tx):
+    # Access list of `tx` from a trace on a dev node: the transaction is sent
+    # from an unlocked account, traced and reverted with evm_snapshot
+    snapshot = rpc(w3, 'evm_snapshot', [])
+    try:
+        tx_hash = w3.eth.send_transaction(tx)
+        receipt = w3.eth.wait_for_transaction_receipt(tx_hash)
+        trace = rpc(w3, 'debug_traceTransaction', ['0x' + bytes(tx_hash).hex(), {'disableStorage': True, 'disableMemory': True}])
+    finally:
+        rpc(w3, 'evm_revert', [snapshot])
+    if receipt['status'] != 1:
+        raise ValueError('transaction reverts')
+    return access_list_from_trace(trace['structLogs'], tx['to'])
+
+def create_access_list(w3, tx):
+    # Access list of `tx` and how it was made: the node's eth_createAccessList,
+    # or a trace when the node doesn't have it
+    try:
+        result = rpc(w3, 'eth_createAccessList', [rpc_tx(tx), 'latest'])
+    except ValueError:
+        return trace_access_list(w3, tx), 'trace'
+    if result.get('error'):
+        raise ValueError('eth_createAccessList: %s' % result['error'])
+    return result['accessList'], 'eth_createAccessList'
+
+class AccessListBuilder:
+    # Send suite transactions with precomputed access lists
+    #
+    # Storage keys follow from the call arguments(token IDs, bookers), so a
+    # list is made per transaction. Savings are priced per entry rather than
+    # by comparing gas estimates, which nodes only make to within a tolerance
+    # larger than the savings: `Contract.method` => [transactions, lists
+    # attached, gas saved].
+
+    def __init__(self, w3=web3):
+        self.web3 = w3
+        self.savings = dict()
+
+    def build(self, contract, method, *args, sender, value=0):
+        # Transaction dict with gas and, when it saves gas, an access list
+        tx = {'from': str(sender), 'to': contract.address, 'data': HexBytes(getattr(contract, method).encode_input(*args)), 'value': value}
+        warm = {to_checksum_address(tx['from']), to_checksum_address(tx['to'])}
+        access_list = prune(create_access_list(self.web3, tx)[0], warm)
+        if access_list:
+            tx['accessList'] = access_list
+        tx['gas'] = self.web3.eth.estimate_gas(tx)
+        entry = self.savings.setdefault('%s.%s' % (contract._name, method), [0, 0, 0])
+        entry[0] += 1
+        entry[1] += 1 if access_list else 0
+        entry[2] += sum(entry_savings(item, warm) for item in access_list)
+        return tx
+
+    def send(self, contract, method, *args, sender, value=0):
+        # Build and send, returns the receipt
+        tx = self.build(contract, method, *args, sender=sender, value=value)
+        if hasattr(sender, 'private_key'):
+            tx = dict(tx, nonce=self.web3.eth.get_transaction_count(tx['from']), gasPrice=self.web3.eth.gas_price, chainId=self.web3.eth.chain_id)
+            signed = self.web3.eth.account.sign_transaction(tx, sender.private_key)
+            tx_hash = self.web3.eth.send_raw_transaction(signed.rawTransaction)
+        else:
+            tx_hash = self.web3.eth.send_transaction(tx)
+        return self.web3.eth.wait_for_transaction_receipt(tx_hash)
+
+    def report(self):
+        lines = ['%-36s %6s %8s %10s %9s' % ('function', 'txs', 'listed', 'gas saved', 'per tx')]
+        for name, (count, listed, saved) in sorted(self.savings.items()):
+            lines.append('%-36s %6d %8d %10d %9d' % (name, count, listed, saved, saved // count))
+        return '\n'.join(lines)
+
+def main(contract, method, *args):
+    # Send one suite call with an access list, e.g. `Season openSeason 1`
+    if network.show_active() == 'development':
+        acc = accounts[0]
+    else:
+        acc = accounts.load('mkulima-acc1')
+    builder = AccessListBuilder()
+    args = [int(arg) if arg.isdigit() else arg for arg in args]
+    receipt = builder.send(CONTAINERS[contract][-1], method, *args, sender=acc)
+    print(receipt['transactionHash'].hex(), receipt['gasUsed'])
+    print(builder.report())
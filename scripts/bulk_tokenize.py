@@ -0,0 +1,107 @@
+import csv
+
+from brownie import FRMRegistry, accounts, network
+
+from scripts.ipfs import EMPTY_BYTES32, cid_to_bytes32
+
+# Limits of FRMRegistry.tokenizeLands: a farm slot holds the name, size,
+# location and soil fields, each at most its Farm string size
+MAX_FARMS = 20
+FARM_FIELDS = (('name', 100), ('size', 20), ('location', 225), ('soil', 20))
+FARM_SLOT = sum(size for _, size in FARM_FIELDS)
+
+# Gas budget of one batch transaction, of which GAS_MARGIN is kept unused
+# against estimate errors
+BATCH_GAS_LIMIT = 8000000
+GAS_MARGIN = 0.1
+
+# Gas estimates, rounded up from measured batches: a batch outside its farms
+# (base transaction, fixed-size arguments' calldata, BatchTokenize), a farm
+# outside its strings (token, owner index, Farm record), a storage word of a
+# farm string and a byte of calldata
+BATCH_GAS = 60000
+FARM_GAS = 215000
+WORD_GAS = 24500
+CALLDATA_ZERO_GAS = 4
+CALLDATA_BYTE_GAS = 16
+
+# CSV columns: the image column holds an IPFS CIDv0
+CSV_FIELDS = ('tokenId', 'name', 'size', 'location', 'image', 'soil')
+
+def read_farms(path):
+    with open(path, newline='') as f:
+        rows = list(csv.DictReader(f))
+    for line, row in enumerate(rows, start=2):
+        missing = [field for field in CSV_FIELDS if not row.get(field)]
+        if missing:
+            raise ValueError('line %d: missing %s' % (line, ', '.join(missing)))
+    return rows
+
+def encode_farm(row):
+    # (tokenId, imageHash, farm slot, field lengths) of a CSV row
+    slot = b''
+    lengths = list()
+    for field, size in FARM_FIELDS:
+        data = row[field].encode('utf-8')
+        if len(data) > size:
+            raise ValueError('%s longer than %d bytes: %r' % (field, size, row[field]))
+        slot += data + b'\x00' * (size - len(data))
+        lengths.append(len(data))
+    return int(row['tokenId']), cid_to_bytes32(row['image']), slot, lengths
+
+def farm_gas(farm):
+    # Estimated gas of an encoded farm: every non-empty string takes a length
+    # word and a word per 32 bytes of storage, its farm slot is calldata
+    lengths = farm[3]
+    words = sum((length + 31) // 32 + 1 for length in lengths if length)
+    calldata = CALLDATA_BYTE_GAS * sum(lengths) + CALLDATA_ZERO_GAS * (FARM_SLOT - sum(lengths))
+    return FARM_GAS + WORD_GAS * words + calldata
+
+def batch_gas(batch):
+    # Estimated gas of tokenizing a batch of encoded farms
+    return BATCH_GAS + sum(farm_gas(farm) for farm in batch)
+
+def chunk_farms(farms, gas_limit=BATCH_GAS_LIMIT):
+    # Split encoded farms, in order, into batches of at most MAX_FARMS filled
+    # while their estimated gas stays within the gas limit less GAS_MARGIN
+    budget = gas_limit * (1 - GAS_MARGIN)
+    batches = list()
+    batch = list()
+    for farm in farms:
+        assert batch_gas([farm]) <= budget, 'gas limit below the gas of farm %d' % farm[0]
+        if len(batch) == MAX_FARMS or batch_gas(batch + [farm]) > budget:
+            batches.append(batch)
+            batch = list()
+        batch.append(farm)
+    if batch:
+        batches.append(batch)
+    return batches
+
+def batch_args(batch):
+    # tokenizeLands arguments of a batch of encoded farms
+    assert 0 < len(batch) <= MAX_FARMS, 'invalid batch size'
+    padding = MAX_FARMS - len(batch)
+    token_ids, image_hashes, slots, lengths = zip(*batch)
+    return (
+        list(token_ids) + [0] * padding,
+        list(image_hashes) + [EMPTY_BYTES32] * padding,
+        b''.join(slots).decode('utf-8'),
+        list(lengths) + [[0] * len(FARM_FIELDS)] * padding,
+        len(batch)
+    )
+
+def tokenize_csv(registry, path, sender, gas_limit=BATCH_GAS_LIMIT):
+    # Tokenize every farm of a CSV to `sender`, one transaction per batch
+    farms = [encode_farm(row) for row in read_farms(path)]
+    txs = list()
+    for batch in chunk_farms(farms, gas_limit):
+        txs.append(registry.tokenizeLands(*batch_args(batch), {'from': sender, 'gas_limit': gas_limit}))
+    return txs
+
+def main(path):
+    if network.show_active() == 'development':
+        acc = accounts[0]
+    else:
+        acc = accounts.load('mkulima-acc1')
+    for tx in tokenize_csv(FRMRegistry[-1], path, acc):
+        print('tokenized %d farms, %d in total' % (tx.events['BatchTokenize']['_count'], tx.events['BatchTokenize']['_totalFarms']))
@@ -0,0 +1,58 @@
+from brownie import Market, accounts, network
+
+# Limits of Market.batchConfirmReceivership: a review fills at most its slot
+# of the packed reviews
+MAX_DELIVERIES = 20
+REVIEW_SLOT = 100
+
+# Confirmation fee per delivery(0.0037 ether)
+MARKET_FEE = 3700000000000000
+
+def pack_reviews(reviews):
+    # Reviews padded to REVIEW_SLOT bytes each, and their lengths
+    slots = list()
+    lengths = list()
+    for review in reviews:
+        data = review.encode('utf-8')
+        if len(data) > REVIEW_SLOT:
+            raise ValueError('review longer than %d bytes: %r' % (REVIEW_SLOT, review))
+        slots.append(data + b'\x00' * (REVIEW_SLOT - len(data)))
+        lengths.append(len(data))
+    return b''.join(slots).decode('utf-8'), lengths + [0] * (MAX_DELIVERIES - len(lengths))
+
+def batch_args(deliveries, provider):
+    # batchConfirmReceivership arguments of (tokenId, seasonNo, volume, review) deliveries
+    assert 0 < len(deliveries) <= MAX_DELIVERIES, 'invalid batch size'
+    padding = MAX_DELIVERIES - len(deliveries)
+    token_ids, season_nos, volumes, reviews = zip(*deliveries)
+    reviews, lengths = pack_reviews(reviews)
+    return (
+        list(token_ids) + [0] * padding,
+        list(season_nos) + [0] * padding,
+        list(volumes) + [0] * padding,
+        reviews,
+        lengths,
+        len(deliveries),
+        provider
+    )
+
+def confirm_deliveries(market, deliveries, provider, sender):
+    # Confirm deliveries as `sender`, one transaction per MAX_DELIVERIES
+    txs = list()
+    for start in range(0, len(deliveries), MAX_DELIVERIES):
+        chunk = deliveries[start:start + MAX_DELIVERIES]
+        txs.append(market.batchConfirmReceivership(*batch_args(chunk, provider), {'from': sender, 'value': MARKET_FEE * len(chunk)}))
+    return txs
+
+def main(provider, *deliveries):
+    # Deliveries as tokenId:seasonNo:volume:review
+    if network.show_active() == 'development':
+        acc = accounts[0]
+    else:
+        acc = accounts.load('mkulima-acc1')
+    parsed = list()
+    for delivery in deliveries:
+        token_id, season_no, volume, review = delivery.split(':', 3)
+        parsed.append((int(token_id), int(season_no), int(volume), review))
+    for tx in confirm_deliveries(Market[-1], parsed, provider, acc):
+        print(tx.txid, tx.events['BatchConfirmation']['_deliveries'], 'deliveries')
@@ -1,8 +1,123 @@
-from brownie import FRMRegistry, Market, Season, accounts
+import json
+import os
 
-def main():
-    acc = accounts.load('mkulima-acc1')
-    frmregistry_contract = FRMRegistry.deploy({'from': acc})
-    season_contract = Season.deploy(frmregistry_contract.address, {'from': acc})
-    Market.deploy(frmregistry_contract.address, season_contract.address,{'from': acc})
+import rlp
+from brownie import FRMRegistry, Market, Multicall, Season, accounts, network, web3
+from brownie.network.transaction import TransactionReceipt
+from eth_utils import keccak, to_checksum_address
+from hexbytes import HexBytes
+
+# Deployment manifests, one per network
+MANIFEST_DIR = 'deployments'
+
+# Deployment order: constructor arguments name contracts deployed before
+PIPELINE = (
+    ('FRMRegistry', ()),
+    ('Season', ('FRMRegistry',)),
+    ('Market', ('FRMRegistry', 'Season')),
+    ('Multicall', ()),
+)
+
+CONTAINERS = {
+    'FRMRegistry': FRMRegistry,
+    'Season': Season,
+    'Market': Market,
+    'Multicall': Multicall
+}
+
+def manifest_path(name=None):
+    return os.path.join(MANIFEST_DIR, '%s.json' % (name or network.show_active()))
+
+def load_manifest(path):
+    if not os.path.exists(path):
+        return {'contracts': {}}
+    with open(path) as f:
+        return json.load(f)
+
+def save_manifest(path, manifest):
+    os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+    with open(path, 'w') as f:
+        json.dump(manifest, f, indent=2, sort_keys=True)
+        f.write('\n')
+
+def bytecode_hash(container):
+    return '0x' + keccak(HexBytes(container.bytecode)).hex()
 
+def contract_address(sender, nonce):
+    # CREATE address of the contract `sender` deploys with `nonce`
+    return to_checksum_address(keccak(rlp.encode([HexBytes(sender), nonce]))[12:])
+
+def deployment_tx(deployed):
+    # Even with required_confs=0 brownie returns the contract rather than its
+    # receipt when the deployment confirmed before deploy() returned
+    if isinstance(deployed, TransactionReceipt):
+        return deployed
+    return deployed.tx
+
+def is_current(entry, code_hash, args):
+    # Deployed from the same bytecode and arguments, and still on chain
+    if not entry or entry.get('bytecodeHash') != code_hash or entry.get('args') != args:
+        return False
+    return len(web3.eth.get_code(entry['address'])) > 0
+
+def deploy_suite(acc, path):
+    # Deploy changed or missing contracts, returns contracts by name
+    #
+    # Constructor arguments only need the addresses of earlier contracts,
+    # which follow from the deployer's nonce. Every transaction is sent with
+    # an explicit nonce without waiting on receipts, then all are awaited.
+    manifest = load_manifest(path)
+    entries = manifest['contracts']
+    nonce = web3.eth.get_transaction_count(acc.address)
+    addresses = dict()
+    pending = list()
+    for name, deps in PIPELINE:
+        container = CONTAINERS[name]
+        args = [addresses[dep] for dep in deps]
+        code_hash = bytecode_hash(container)
+        if is_current(entries.get(name), code_hash, args):
+            addresses[name] = entries[name]['address']
+            print('%s unchanged at %s' % (name, addresses[name]))
+            continue
+        addresses[name] = contract_address(acc.address, nonce)
+        tx = deployment_tx(container.deploy(*args, {'from': acc, 'nonce': nonce, 'required_confs': 0}))
+        entries[name] = {'address': addresses[name], 'args': args, 'bytecodeHash': code_hash, 'tx': tx.txid}
+        pending.append((name, tx))
+        nonce += 1
+    # Record submitted transactions first, a rerun finds whichever got mined
+    manifest['deployer'] = acc.address
+    save_manifest(path, manifest)
+    for name, tx in pending:
+        tx.wait(1)
+        assert tx.status == 1, '%s deployment failed' % name
+        assert tx.contract_address == addresses[name], '%s deployed at %s, expected %s' % (name, tx.contract_address, addresses[name])
+        print('%s deployed at %s' % (name, addresses[name]))
+    contracts = {name: CONTAINERS[name].at(addresses[name]) for name, _ in PIPELINE}
+    wire_suite(acc, contracts)
+    verify_wiring(contracts)
+    return contracts
+
+def wire_suite(acc, contracts):
+    # Links set after deployment: the registry only takes state changes from
+    # the season contract and tells the market about owner changes
+    registry = contracts['FRMRegistry']
+    if registry.seasonContract() != contracts['Season'].address:
+        registry.setSeasonContract(contracts['Season'].address, {'from': acc})
+    if registry.marketContract() != contracts['Market'].address:
+        registry.setMarketContract(contracts['Market'].address, {'from': acc})
+
+def verify_wiring(contracts):
+    registry = contracts['FRMRegistry'].address
+    season = contracts['Season'].address
+    assert contracts['Season'].farmContract() == registry, 'Season points to the wrong registry'
+    assert contracts['Market'].farmContract() == registry, 'Market points to the wrong registry'
+    assert contracts['Market'].seasonContract() == season, 'Market points to the wrong season'
+    assert contracts['FRMRegistry'].seasonContract() == season, 'FRMRegistry points to the wrong season'
+    assert contracts['FRMRegistry'].marketContract() == contracts['Market'].address, 'FRMRegistry points to the wrong market'
+
+def main():
+    if network.show_active() == 'development':
+        acc = accounts[0]
+    else:
+        acc = accounts.load('mkulima-acc1')
+    deploy_suite(acc, manifest_path())
@@ -0,0 +1,52 @@
+from brownie import FRMRegistry
+
+from scripts.farm_states import state_name
+
+# Farms returned per paginated registry query
+PAGE_SIZE = 10
+
+# `Farm` struct fields in ABI order: struct arrays are returned unnamed
+FARM_FIELDS = ('tokenId', 'name', 'size', 'location', 'imageHash', 'soil', 'season', 'owner', 'userIndex', 'platformIndex')
+
+# `SeasonSummary` struct fields in ABI order
+SEASON_SUMMARY_FIELDS = ('tokenId', 'season', 'crop', 'openingDate', 'preparationDate', 'plantingDate', 'growthDate', 'harvestDate', 'traceHash')
+
+def walk_pages(registry, query, page_size=PAGE_SIZE):
+    # Yield farms from a paginated token ID `query(start, count)`,
+    # two RPC calls per page: token IDs, then the farms behind them
+    page_size = min(page_size, PAGE_SIZE)
+    start = 1
+    while True:
+        token_ids, filled = query(start, page_size)
+        if filled:
+            farms, _ = registry.getFarms(token_ids, filled)
+            for farm in farms[:filled]:
+                yield dict(zip(FARM_FIELDS, farm))
+        if filled < page_size:
+            break
+        start += filled
+
+def list_tokenized_farms(registry, page_size=PAGE_SIZE):
+    return list(walk_pages(registry, registry.queryTokenizedFarmIds, page_size))
+
+def list_owner_farms(registry, owner, page_size=PAGE_SIZE):
+    query = lambda start, count: registry.queryOwnerTokenizedFarmIds(owner, start, count)
+    return list(walk_pages(registry, query, page_size))
+
+def list_season_summaries(season, token_id, page_size=PAGE_SIZE):
+    # Dates, crop and trace hash of every season of a farm, one RPC call per page
+    page_size = min(page_size, PAGE_SIZE)
+    summaries = list()
+    start = 1
+    while True:
+        page, filled = season.querySeasonSummaries(token_id, start, page_size)
+        summaries.extend(dict(zip(SEASON_SUMMARY_FIELDS, summary)) for summary in page[:filled])
+        if filled < page_size:
+            break
+        start += filled
+    return summaries
+
+def main():
+    registry = FRMRegistry[-1]
+    for farm in list_tokenized_farms(registry):
+        print(farm['tokenId'], farm['name'], state_name(farm['season']))
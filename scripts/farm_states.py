@@ -0,0 +1,13 @@
+# Farm lifecycle states as stored on-chain by FRMRegistry
+DORMANT = 0
+PREPARATION = 1
+PLANTING = 2
+CROP_GROWTH = 3
+HARVESTING = 4
+MARKETING = 5
+
+# Display names indexed by state
+STATE_NAMES = ('Dormant', 'Preparation', 'Planting', 'Crop Growth', 'Harvesting', 'Marketing')
+
+def state_name(state):
+    return STATE_NAMES[state]
@@ -0,0 +1,290 @@
+import sqlite3
+import time
+
+from brownie import FRMRegistry, Market, web3
+from eth_utils import to_checksum_address
+from web3._utils.events import get_event_data
+
+# Blocks fetched per eth_getLogs call
+CHUNK_SIZE = 1000
+
+# Recent block hashes kept to detect reorgs
+REORG_DEPTH = 64
+
+ZERO_ADDRESS = '0x' + '00' * 20
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS checkpoint (
+    id INTEGER PRIMARY KEY CHECK (id = 1),
+    block_number INTEGER NOT NULL
+);
+CREATE TABLE IF NOT EXISTS block_hashes (
+    block_number INTEGER PRIMARY KEY,
+    block_hash TEXT NOT NULL
+);
+
+-- Event log tables, one row per log
+CREATE TABLE IF NOT EXISTS transfers (
+    block_number INTEGER NOT NULL,
+    log_index INTEGER NOT NULL,
+    tx_hash TEXT NOT NULL,
+    token_id TEXT NOT NULL,
+    from_address TEXT NOT NULL,
+    to_address TEXT NOT NULL,
+    PRIMARY KEY (block_number, log_index)
+);
+CREATE TABLE IF NOT EXISTS tokenizations (
+    block_number INTEGER NOT NULL,
+    log_index INTEGER NOT NULL,
+    tx_hash TEXT NOT NULL,
+    total_farms INTEGER NOT NULL,
+    PRIMARY KEY (block_number, log_index)
+);
+CREATE TABLE IF NOT EXISTS transitions (
+    block_number INTEGER NOT NULL,
+    log_index INTEGER NOT NULL,
+    token_id TEXT NOT NULL,
+    state INTEGER NOT NULL,
+    PRIMARY KEY (block_number, log_index)
+);
+CREATE TABLE IF NOT EXISTS market_openings (
+    block_number INTEGER NOT NULL,
+    log_index INTEGER NOT NULL,
+    token_id TEXT NOT NULL,
+    season INTEGER NOT NULL,
+    total_markets INTEGER NOT NULL,
+    PRIMARY KEY (block_number, log_index)
+);
+CREATE TABLE IF NOT EXISTS booking_events (
+    block_number INTEGER NOT NULL,
+    log_index INTEGER NOT NULL,
+    token_id TEXT NOT NULL,
+    season INTEGER NOT NULL,
+    booker TEXT NOT NULL,
+    booker_volume INTEGER NOT NULL,
+    market_volume INTEGER NOT NULL,
+    PRIMARY KEY (block_number, log_index)
+);
+CREATE TABLE IF NOT EXISTS confirmations (
+    block_number INTEGER NOT NULL,
+    log_index INTEGER NOT NULL,
+    booker TEXT NOT NULL,
+    token_id TEXT NOT NULL,
+    season INTEGER NOT NULL,
+    remaining_volume INTEGER NOT NULL,
+    PRIMARY KEY (block_number, log_index)
+);
+CREATE TABLE IF NOT EXISTS reviews (
+    block_number INTEGER NOT NULL,
+    log_index INTEGER NOT NULL,
+    token_id TEXT NOT NULL,
+    total_reviews INTEGER NOT NULL,
+    PRIMARY KEY (block_number, log_index)
+);
+
+-- Read model, derived from the event log tables
+CREATE TABLE IF NOT EXISTS farms (
+    token_id TEXT PRIMARY KEY,
+    owner TEXT NOT NULL,
+    state INTEGER NOT NULL DEFAULT 0
+);
+CREATE INDEX IF NOT EXISTS farms_by_state ON farms (state);
+CREATE INDEX IF NOT EXISTS farms_by_owner ON farms (owner);
+CREATE TABLE IF NOT EXISTS markets (
+    token_id TEXT PRIMARY KEY,
+    season INTEGER NOT NULL,
+    remaining_supply INTEGER,
+    reviews INTEGER NOT NULL DEFAULT 0
+);
+CREATE TABLE IF NOT EXISTS bookings (
+    booker TEXT NOT NULL,
+    token_id TEXT NOT NULL,
+    season INTEGER NOT NULL,
+    volume INTEGER NOT NULL,
+    PRIMARY KEY (booker, token_id, season)
+);
+CREATE INDEX IF NOT EXISTS open_bookings_by_booker ON bookings (booker, volume);
+"""
+
+# Event log tables in the order their rows are replayed within a log
+EVENT_TABLES = ('transfers', 'tokenizations', 'transitions', 'market_openings', 'booking_events', 'confirmations', 'reviews')
+
+READ_MODEL_TABLES = ('farms', 'markets', 'bookings')
+
+# uint256 token IDs overflow SQLite integers: store them as decimal text
+def _token(value):
+    return str(value)
+
+class Indexer:
+    # Stream FRMRegistry and Market logs into a resumable SQLite read model
+
+    def __init__(self, w3, registry, market, db_path, start_block=0, chunk_size=CHUNK_SIZE):
+        self.web3 = w3
+        self.registry = w3.eth.contract(address=registry.address, abi=registry.abi)
+        self.market = w3.eth.contract(address=market.address, abi=market.abi)
+        self.start_block = start_block
+        self.chunk_size = chunk_size
+        self.db = sqlite3.connect(db_path)
+        self.db.row_factory = sqlite3.Row
+        self.db.executescript(SCHEMA)
+        self._events = {}
+        for contract in (self.registry, self.market):
+            for abi in contract.abi:
+                if abi.get('type') == 'event':
+                    self._events[(contract.address, self._topic(abi))] = abi
+
+    def _topic(self, abi):
+        signature = '%s(%s)' % (abi['name'], ','.join(i['type'] for i in abi['inputs']))
+        return '0x' + bytes(self.web3.keccak(text=signature)).hex()
+
+    def checkpoint(self):
+        row = self.db.execute('SELECT block_number FROM checkpoint WHERE id = 1').fetchone()
+        return row['block_number'] if row else self.start_block - 1
+
+    def _block_hash(self, number):
+        try:
+            block = self.web3.eth.get_block(number)
+        except Exception:
+            return None
+        return '0x' + bytes(block['hash']).hex() if block else None
+
+    # SYNC
+
+    def sync(self):
+        # Index every block up to the chain head, returns the new checkpoint
+        self._handle_reorg()
+        head = self.web3.eth.block_number
+        start = self.checkpoint() + 1
+        while start <= head:
+            end = min(start + self.chunk_size - 1, head)
+            logs = self.web3.eth.get_logs({
+                'address': [self.registry.address, self.market.address],
+                'fromBlock': start,
+                'toBlock': end
+            })
+            with self.db:
+                for log in sorted(logs, key=lambda log: (log['blockNumber'], log['logIndex'])):
+                    self._ingest(log)
+                self._record_block(end, self._block_hash(end))
+                self.db.execute('INSERT OR REPLACE INTO checkpoint (id, block_number) VALUES (1, ?)', (end,))
+            start = end + 1
+        return self.checkpoint()
+
+    def run(self, poll_interval=2):
+        while True:
+            self.sync()
+            time.sleep(poll_interval)
+
+    def _record_block(self, number, block_hash):
+        self.db.execute('INSERT OR REPLACE INTO block_hashes (block_number, block_hash) VALUES (?, ?)', (number, block_hash))
+        self.db.execute('DELETE FROM block_hashes WHERE block_number <= ?', (number - REORG_DEPTH,))
+
+    # REORGS
+
+    def _handle_reorg(self):
+        # Roll back to the most recent indexed block still on the canonical chain
+        checkpoint = self.checkpoint()
+        ancestor = self.start_block - 1
+        for row in self.db.execute('SELECT block_number, block_hash FROM block_hashes ORDER BY block_number DESC').fetchall():
+            if self._block_hash(row['block_number']) == row['block_hash']:
+                ancestor = row['block_number']
+                break
+        if ancestor >= checkpoint:
+            return
+        with self.db:
+            for table in EVENT_TABLES:
+                self.db.execute('DELETE FROM %s WHERE block_number > ?' % table, (ancestor,))
+            self.db.execute('DELETE FROM block_hashes WHERE block_number > ?', (ancestor,))
+            self.db.execute('INSERT OR REPLACE INTO checkpoint (id, block_number) VALUES (1, ?)', (ancestor,))
+            self._rebuild()
+
+    def _rebuild(self):
+        # Replay the event log tables into an empty read model
+        for table in READ_MODEL_TABLES:
+            self.db.execute('DELETE FROM %s' % table)
+        rows = list()
+        for order, table in enumerate(EVENT_TABLES):
+            for row in self.db.execute('SELECT * FROM %s' % table).fetchall():
+                row = dict(row)
+                rows.append(((row['block_number'], row['log_index'], order), table, row))
+        for _, table, row in sorted(rows, key=lambda item: item[0]):
+            getattr(self, '_apply_' + table)(row)
+
+    # INGESTION
+
+    def _ingest(self, log):
+        abi = self._events.get((to_checksum_address(log['address']), '0x' + bytes(log['topics'][0]).hex()))
+        if abi is None:
+            return
+        args = get_event_data(self.web3.codec, abi, log)['args']
+        position = {'block_number': log['blockNumber'], 'log_index': log['logIndex']}
+        name = abi['name']
+        if name == 'Transfer':
+            self._store('transfers', dict(position, tx_hash='0x' + bytes(log['transactionHash']).hex(), token_id=_token(args['_tokenId']), from_address=args['_from'], to_address=args['_to']))
+        elif name in ('Tokenize', 'BatchTokenize'):
+            # A batch logs BatchTokenize alone, not a Tokenize per farm
+            self._store('tokenizations', dict(position, tx_hash='0x' + bytes(log['transactionHash']).hex(), total_farms=args['_totalFarms']))
+        elif name == 'Transition':
+            self._store('transitions', dict(position, token_id=_token(args['_tokenId']), state=args['_season']))
+        elif name == 'CreateMarket':
+            self._store('market_openings', dict(position, token_id=_token(args['_tokenId']), season=args['_season'], total_markets=args['_totalMarket']))
+        elif name == 'BookHarvest':
+            self._store('booking_events', dict(position, token_id=_token(args['_tokenId']), season=args['_seasonNo'], booker=args['_booker'], booker_volume=args['_bookerVolume'], market_volume=args['_newMarketVolume']))
+        elif name == 'Confirmation':
+            # Batched confirmations log one Confirmation per delivery too
+            self._store('confirmations', dict(position, booker=args['_booker'], token_id=_token(args['_tokenId']), season=args['_seasonNo'], remaining_volume=args['_newBookerVolume']))
+        elif name == 'LeaveReview':
+            self._store('reviews', dict(position, token_id=_token(args['_tokenId']), total_reviews=args['_totalReviews']))
+
+    def _store(self, table, row):
+        columns = ', '.join(row)
+        placeholders = ', '.join('?' for _ in row)
+        self.db.execute('INSERT OR REPLACE INTO %s (%s) VALUES (%s)' % (table, columns, placeholders), tuple(row.values()))
+        getattr(self, '_apply_' + table)(row)
+
+    # READ MODEL
+
+    def _apply_transfers(self, row):
+        if row['from_address'] == ZERO_ADDRESS:
+            self.db.execute('INSERT OR REPLACE INTO farms (token_id, owner, state) VALUES (?, ?, 0)', (row['token_id'], row['to_address']))
+        elif row['to_address'] == ZERO_ADDRESS:
+            self.db.execute('DELETE FROM farms WHERE token_id = ?', (row['token_id'],))
+        else:
+            self.db.execute('UPDATE farms SET owner = ? WHERE token_id = ?', (row['to_address'], row['token_id']))
+
+    def _apply_tokenizations(self, row):
+        pass
+
+    def _apply_transitions(self, row):
+        self.db.execute('UPDATE farms SET state = ? WHERE token_id = ?', (row['state'], row['token_id']))
+
+    def _apply_market_openings(self, row):
+        self.db.execute('INSERT OR REPLACE INTO markets (token_id, season, remaining_supply, reviews) VALUES (?, ?, NULL, COALESCE((SELECT reviews FROM markets WHERE token_id = ?), 0))', (row['token_id'], row['season'], row['token_id']))
+
+    def _apply_booking_events(self, row):
+        self.db.execute('INSERT OR REPLACE INTO bookings (booker, token_id, season, volume) VALUES (?, ?, ?, ?)', (row['booker'], row['token_id'], row['season'], row['booker_volume']))
+        self.db.execute('UPDATE markets SET remaining_supply = ? WHERE token_id = ?', (row['market_volume'], row['token_id']))
+
+    def _apply_confirmations(self, row):
+        self.db.execute('UPDATE bookings SET volume = ? WHERE booker = ? AND token_id = ? AND season = ?', (row['remaining_volume'], row['booker'], row['token_id'], row['season']))
+
+    def _apply_reviews(self, row):
+        self.db.execute('UPDATE markets SET reviews = ? WHERE token_id = ?', (row['total_reviews'], row['token_id']))
+
+    # QUERIES
+
+    def farms_in_state(self, state):
+        rows = self.db.execute('SELECT token_id, owner FROM farms WHERE state = ? ORDER BY length(token_id), token_id', (state,)).fetchall()
+        return [(int(row['token_id']), row['owner']) for row in rows]
+
+    def farms_of_owner(self, owner):
+        rows = self.db.execute('SELECT token_id, state FROM farms WHERE owner = ? ORDER BY length(token_id), token_id', (to_checksum_address(owner),)).fetchall()
+        return [(int(row['token_id']), row['state']) for row in rows]
+
+    def open_bookings(self, booker):
+        rows = self.db.execute('SELECT token_id, season, volume FROM bookings WHERE booker = ? AND volume > 0 ORDER BY length(token_id), token_id, season', (to_checksum_address(booker),)).fetchall()
+        return [(int(row['token_id']), row['season'], row['volume']) for row in rows]
+
+def main():
+    indexer = Indexer(web3, FRMRegistry[-1], Market[-1], 'reap-index.db')
+    indexer.run()
@@ -0,0 +1,49 @@
+# Convert IPFS CIDv0 hashes(`Qm...`) to and from the bytes32 digests stored on-chain.
+# A CIDv0 is the base58btc encoding of a sha2-256 multihash: 0x12 0x20 <32-byte digest>.
+
+BASE58_ALPHABET = '123456789ABCDEFGHJKLMNPQRSTUVWXYZabcdefghijkmnopqrstuvwxyz'
+
+# sha2-256 multihash prefix: function code, digest length
+MULTIHASH_PREFIX = bytes([0x12, 0x20])
+
+EMPTY_BYTES32 = '0x' + '00' * 32
+
+def b58decode(value):
+    number = 0
+    for char in value:
+        number = number * 58 + BASE58_ALPHABET.index(char)
+    body = number.to_bytes((number.bit_length() + 7) // 8, 'big')
+    leading_zeros = len(value) - len(value.lstrip(BASE58_ALPHABET[0]))
+    return b'\x00' * leading_zeros + body
+
+def b58encode(data):
+    number = int.from_bytes(data, 'big')
+    encoded = ''
+    while number:
+        number, remainder = divmod(number, 58)
+        encoded = BASE58_ALPHABET[remainder] + encoded
+    leading_zeros = len(data) - len(data.lstrip(b'\x00'))
+    return BASE58_ALPHABET[0] * leading_zeros + encoded
+
+def cid_to_bytes32(cid):
+    # Return the hex bytes32 digest of a CIDv0; an empty CID maps to EMPTY_BYTES32
+    if not cid:
+        return EMPTY_BYTES32
+    try:
+        multihash = b58decode(cid)
+    except ValueError:
+        raise ValueError('invalid base58 in CID: %s' % cid)
+    if len(multihash) != 34 or multihash[:2] != MULTIHASH_PREFIX:
+        raise ValueError('not a sha2-256 CIDv0: %s' % cid)
+    return '0x' + multihash[2:].hex()
+
+def bytes32_to_cid(value):
+    # Return the CIDv0 for a bytes32 digest(hex string or bytes); EMPTY_BYTES32 maps to ''
+    if isinstance(value, str):
+        value = bytes.fromhex(value[2:] if value.startswith('0x') else value)
+    value = bytes(value)
+    if len(value) != 32:
+        raise ValueError('digest must be 32 bytes')
+    if value == b'\x00' * 32:
+        return ''
+    return b58encode(MULTIHASH_PREFIX + value)
@@ -0,0 +1,84 @@
+from brownie import Market, Multicall
+from hexbytes import HexBytes
+
+# Limits of Multicall.aggregate, larger return data reverts the batch
+MAX_CALLS = 20
+MAX_CALLDATA = 2048
+MAX_RETURN_SIZE = 1024
+
+class BatchReader:
+    # Queue view calls and run them through the Multicall contract
+
+    def __init__(self, aggregator):
+        self.aggregator = aggregator
+        self.calls = list()
+        self.block_number = None
+
+    def add(self, contract, method, *args):
+        # Queue `contract.method(*args)`, returns its index in the results
+        call = getattr(contract, method)
+        self.calls.append((contract.address, method, call, HexBytes(call.encode_input(*args))))
+        return len(self.calls) - 1
+
+    def execute(self):
+        # One eth_call per MAX_CALLS queued calls, results in queue order
+        results = list()
+        calls, self.calls = self.calls, list()
+        start = 0
+        while start < len(calls):
+            chunk = list()
+            size = 0
+            for call in calls[start:start + MAX_CALLS]:
+                if size + len(call[3]) > MAX_CALLDATA:
+                    break
+                chunk.append(call)
+                size += len(call[3])
+            results.extend(self._aggregate(chunk))
+            start += len(chunk)
+        return results
+
+    def _aggregate(self, chunk):
+        targets = [call[0] for call in chunk]
+        lengths = [len(call[3]) for call in chunk]
+        padding = MAX_CALLS - len(chunk)
+        self.block_number, sizes, words = self.aggregator.aggregate(
+            targets + ['0x' + '00' * 20] * padding,
+            b''.join(call[3] for call in chunk),
+            lengths + [0] * padding,
+            len(chunk)
+        )
+        results = list()
+        cursor = 0
+        for (_, method, call, _), size in zip(chunk, sizes):
+            count = (size + 31) // 32
+            data = b''.join(bytes(HexBytes(word)) for word in words[cursor:cursor + count])
+            results.append(call.decode_output('0x' + data[:size].hex()))
+            cursor += count
+        return results
+
+def market_page(reader, market, token_id):
+    # Current market of a farm with its bookings, reviews and deliveries in two round trips
+    reader.add(market, 'getCurrentFarmMarket', token_id)
+    reader.add(market, 'totalMarketBookers', token_id)
+    reader.add(market, 'marketReviewCount', token_id)
+    reader.add(market, 'farmDeliverables', token_id)
+    current, bookers, reviews, deliveries = reader.execute()
+    for i in range(1, bookers + 1):
+        reader.add(market, 'getMarketBooking', token_id, i)
+    for i in range(1, reviews + 1):
+        reader.add(market, 'getReviewForMarket', token_id, i)
+    results = reader.execute()
+    return {
+        'market': current,
+        'bookings': results[:bookers],
+        'reviews': results[bookers:],
+        'deliveries': deliveries
+    }
+
+def main():
+    reader = BatchReader(Multicall[-1])
+    market = Market[-1]
+    for i in range(1, market.totalMarkets() + 1):
+        token_id = market.getIndexedEnlistedMarket(i)
+        page = market_page(reader, market, token_id)
+        print(token_id, page['market']['crop'], len(page['bookings']), 'bookings', len(page['reviews']), 'reviews')
@@ -0,0 +1,672 @@
+import json
+import os
+import random
+import time
+
+from eth_utils import keccak
+
+from scripts.farm_states import CROP_GROWTH, DORMANT, HARVESTING, MARKETING, PLANTING, PREPARATION
+from scripts.ipfs import cid_to_bytes32
+
+# In-process model of the FRMRegistry, Season and Market state transitions
+# for capacity planning. Operations are `(name, sender, args)` tuples: the
+# model and ChainReplay apply the same stream, state_diff compares them.
+#
+# Not modelled: farm, season and review strings, `approve`(it always
+# reverts), and batch entry points(tokenizeLands, batchSeasonSteps and
+# batchConfirmReceivership run the same transitions).
+
+ZERO_ADDRESS = '0x0000000000000000000000000000000000000000'
+
+# Market.MARKET_FEE and the price of a workload booking unit
+MARKET_FEE = 3700000000000000
+PRICE = 10000000000000000
+
+# Block gas a capacity plan fills
+BLOCK_GAS_LIMIT = 15000000
+
+# Recorded gas of the benchmarks
+GAS_BASELINE_PATH = os.path.join(os.path.dirname(__file__), os.pardir, 'benchmarks', 'gas_baseline.json')
+
+# Benchmark measuring the gas of every operation label. `.next` is a farm's
+# second season or market, `.close` books the last unit
+GAS_BENCHMARKS = {
+    'tokenize_land': 'FRMRegistry.tokenizeLand',
+    'transfer_from': 'FRMRegistry.transferFrom',
+    'transfer_from.market': 'FRMRegistry.transferFrom.market_farm',
+    'burn': 'FRMRegistry.burn',
+    'set_approval_for_all': 'FRMRegistry.setApprovalForAll',
+    'open_season': 'Season.openSeason',
+    'open_season.next': 'Season.openSeason.second_season',
+    'confirm_preparations': 'Season.confirmPreparations',
+    'confirm_planting': 'Season.confirmPlanting',
+    'confirm_growth': 'Season.confirmGrowth',
+    'confirm_harvesting': 'Season.confirmHarvesting',
+    'close_season': 'Season.closeSeason',
+    'create_market': 'Market.createMarket',
+    'create_market.next': 'Market.createMarket.second_market',
+    'book_harvest.new_booking': 'Market.bookHarvest.second_booker',
+    'book_harvest.new_booking.close': 'Market.bookHarvest.supply_exhaustion',
+    'book_harvest.repeat_booking': 'Market.bookHarvest.repeat_booking',
+    'book_harvest.repeat_booking.close': 'Market.bookHarvest.repeat_booking_exhaustion',
+    'confirm_receivership.partial_delivery': 'Market.confirmReceivership.partial_delivery',
+    'confirm_receivership.final_delivery': 'Market.confirmReceivership.final_delivery',
+    'withdraw': 'Market.withdraw'
+}
+
+def load_gas_costs(path=GAS_BASELINE_PATH):
+    # Gas per operation label, raises KeyError for a label no benchmark records
+    with open(path) as f:
+        baseline = json.load(f)
+    return {label: baseline[name] for label, name in GAS_BENCHMARKS.items()}
+
+# Gas per operation on the dev chain
+GAS_COSTS = load_gas_costs()
+
+ipfs_hash = cid_to_bytes32('QmUfideC1r5JhMVwgd8vjC7DtVnXw3QGfCSQA7fUVHK789')
+
+class Revert(Exception):
+    # The contracts revert the operation, `reason` is the dev revert string if any
+
+    def __init__(self, reason=None):
+        super().__init__(reason or 'reverted')
+        self.reason = reason
+
+class Farm:
+    # Registry token and its Season counters, kept after a burn
+    __slots__ = ('owner', 'state', 'user_index', 'platform_index', 'running', 'complete')
+
+    def __init__(self):
+        self.owner = ZERO_ADDRESS
+        self.state = DORMANT
+        self.user_index = 0
+        self.platform_index = 0
+        self.running = 0
+        self.complete = 0
+
+class FarmMarket:
+    # Current market of a farm and the farm's market counters
+    __slots__ = ('season', 'price', 'original_supply', 'remaining_supply', 'bookers', 'owner',
+                 'previous', 'total_bookers', 'transactions', 'deliveries', 'reviews')
+
+    def __init__(self):
+        self.previous = 0
+        self.total_bookers = 0
+        self.transactions = 0
+        self.deliveries = 0
+        self.reviews = 0
+
+class Booking:
+    # Booking of a booker on a farm season
+    __slots__ = ('volume', 'original_volume', 'deposit', 'delivered')
+
+    def __init__(self):
+        self.volume = 0
+        self.original_volume = 0
+        self.deposit = 0
+        self.delivered = False
+
+class ReferenceModel:
+    # State of the three contracts, one method per contract operation
+    #
+    # Methods raise Revert where the contracts revert, before changing any
+    # state, and otherwise return the gas the operation costs on chain.
+    # Owner and platform indexes are swap-popped exactly like FRMRegistry.
+
+    def __init__(self):
+        # FRMRegistry
+        self.farms = dict()
+        self.owned = dict()
+        self.platform = list()
+        self.operators = dict()
+        # Season
+        self.complete_seasons = 0
+        # Market
+        self.markets = dict()
+        self.market_count = 0
+        self.bookings = dict()
+        self.booker_bookings = dict()
+        self.booker_delivery = dict()
+        self.account_tx = dict()
+        self.dues = dict()
+        self.platform_tx = 0
+        self.completed_delivery = 0
+        # Gas: label => [operations, gas]
+        self.gas = dict()
+        self.gas_used = 0
+
+    def apply(self, op):
+        name, sender, args = op
+        return getattr(self, name)(sender, *args)
+
+    def _charge(self, label):
+        gas = GAS_COSTS[label]
+        entry = self.gas.get(label)
+        if entry is None:
+            self.gas[label] = [1, gas]
+        else:
+            entry[0] += 1
+            entry[1] += gas
+        self.gas_used += gas
+        return gas
+
+    # FRMREGISTRY
+
+    def _authorized(self, sender, farm):
+        if farm.owner == ZERO_ADDRESS:
+            return False
+        return sender == farm.owner or sender in self.operators.get(farm.owner, ())
+
+    def _add_token(self, owner, token_id, farm):
+        owned = self.owned.setdefault(owner, list())
+        farm.owner = owner
+        farm.user_index = len(owned)
+        owned.append(token_id)
+
+    def _remove_token(self, token_id, farm):
+        owned = self.owned[farm.owner]
+        last = owned.pop()
+        if last != token_id:
+            owned[farm.user_index] = last
+            self.farms[last].user_index = farm.user_index
+
+    def tokenize_land(self, sender, token_id):
+        farm = self.farms.get(token_id)
+        if farm is not None and farm.owner != ZERO_ADDRESS:
+            raise Revert()
+        if farm is None:
+            farm = self.farms[token_id] = Farm()
+        self._add_token(sender, token_id, farm)
+        farm.state = DORMANT
+        farm.platform_index = len(self.platform)
+        self.platform.append(token_id)
+        # A burned token minted again takes over its market
+        market = self.markets.get(token_id)
+        if market is not None:
+            market.owner = sender
+        return self._charge('tokenize_land')
+
+    def transfer_from(self, sender, from_, to, token_id):
+        farm = self.farms.get(token_id)
+        if farm is None or not self._authorized(sender, farm) or to == ZERO_ADDRESS or farm.owner != from_:
+            raise Revert()
+        self._remove_token(token_id, farm)
+        self._add_token(to, token_id, farm)
+        market = self.markets.get(token_id)
+        if market is None:
+            return self._charge('transfer_from')
+        market.owner = to
+        return self._charge('transfer_from.market')
+
+    def burn(self, sender, token_id):
+        farm = self.farms.get(token_id)
+        if farm is None or not self._authorized(sender, farm):
+            raise Revert()
+        self._remove_token(token_id, farm)
+        farm.owner = ZERO_ADDRESS
+        last = self.platform.pop()
+        if last != token_id:
+            self.platform[farm.platform_index] = last
+            self.farms[last].platform_index = farm.platform_index
+        market = self.markets.get(token_id)
+        if market is not None:
+            market.owner = ZERO_ADDRESS
+        return self._charge('burn')
+
+    def set_approval_for_all(self, sender, operator, approved):
+        if operator == ZERO_ADDRESS or operator == sender:
+            raise Revert()
+        operators = self.operators.setdefault(sender, set())
+        if approved:
+            operators.add(operator)
+        else:
+            operators.discard(operator)
+        return self._charge('set_approval_for_all')
+
+    # SEASON
+
+    def _step(self, sender, token_id, expected, state, unauthorized, wrong_state):
+        # Season step checking authorization first, like every confirm step
+        farm = self.farms.get(token_id)
+        if farm is None or not self._authorized(sender, farm):
+            raise Revert(unauthorized)
+        if farm.state != expected:
+            raise Revert(wrong_state)
+        farm.state = state
+        return farm
+
+    def open_season(self, sender, token_id):
+        farm = self.farms.get(token_id)
+        if (farm.state if farm is not None else DORMANT) != DORMANT:
+            raise Revert('dev: is not dormant')
+        if farm is None or not self._authorized(sender, farm):
+            raise Revert('dev: only owner can update state')
+        farm.state = PREPARATION
+        farm.running += 1
+        return self._charge('open_season' if farm.running == 1 else 'open_season.next')
+
+    def confirm_preparations(self, sender, token_id):
+        self._step(sender, token_id, PREPARATION, PLANTING, 'dev: only owner can confirm preparations', 'dev: state is not preparations')
+        return self._charge('confirm_preparations')
+
+    def confirm_planting(self, sender, token_id):
+        self._step(sender, token_id, PLANTING, CROP_GROWTH, 'dev: only owner can confirm planting', 'dev: state is not planting')
+        return self._charge('confirm_planting')
+
+    def confirm_growth(self, sender, token_id):
+        self._step(sender, token_id, CROP_GROWTH, HARVESTING, 'dev: only owner can confirm crop growth', 'dev: state is not crop growth')
+        return self._charge('confirm_growth')
+
+    def confirm_harvesting(self, sender, token_id):
+        farm = self._step(sender, token_id, HARVESTING, MARKETING, 'dev: only owner can confirm harvesting', 'dev: state is not harvesting')
+        farm.complete += 1
+        self.complete_seasons += 1
+        return self._charge('confirm_harvesting')
+
+    def close_season(self, sender, token_id):
+        farm = self.farms.get(token_id)
+        if farm is None or farm.owner == ZERO_ADDRESS:
+            raise Revert('dev: invalid token id')
+        if farm.state != MARKETING:
+            raise Revert('dev: is not harvesting')
+        if not self._authorized(sender, farm):
+            raise Revert('dev: only owner can close shop')
+        farm.state = DORMANT
+        return self._charge('close_season')
+
+    # MARKET
+
+    def create_market(self, sender, token_id, price, supply):
+        farm = self.farms.get(token_id)
+        if farm is None or farm.owner == ZERO_ADDRESS:
+            raise Revert('dev: invalid tokenized farm')
+        if farm.owner != sender:
+            raise Revert('dev: only owner can create market')
+        if farm.state != MARKETING:
+            raise Revert()
+        market = self.markets.get(token_id)
+        if market is not None and market.remaining_supply:
+            raise Revert('dev: exhaust previous market supply')
+        label = 'create_market.next'
+        if market is None:
+            market = self.markets[token_id] = FarmMarket()
+            self.market_count += 1
+            label = 'create_market'
+        market.season = farm.running
+        market.price = price
+        market.original_supply = supply
+        market.remaining_supply = supply
+        market.bookers = 0
+        market.owner = sender
+        return self._charge(label)
+
+    def book_harvest(self, sender, token_id, volume, season_no, value):
+        market = self.markets.get(token_id)
+        if market is None or market.owner == ZERO_ADDRESS:
+            raise Revert('dev: invalid token id')
+        if sender == market.owner:
+            raise Revert('dev: owner cannot book his/her harvest')
+        if season_no != market.season:
+            raise Revert('dev: season not on market')
+        if volume == 0:
+            raise Revert('dev: volume cannot be 0')
+        if volume > market.remaining_supply:
+            raise Revert()
+        if value == 0:
+            raise Revert('dev: booking funds cannot be 0')
+        if value != market.price * volume:
+            raise Revert('dev: insufficient booking funds')
+        key = (sender, token_id, season_no)
+        booking = self.bookings.get(key)
+        label = 'book_harvest.repeat_booking'
+        if booking is None:
+            booking = self.bookings[key] = Booking()
+            self.booker_bookings[sender] = self.booker_bookings.get(sender, 0) + 1
+            market.bookers += 1
+            market.total_bookers += 1
+            label = 'book_harvest.new_booking'
+        booking.original_volume += volume
+        booking.volume += volume
+        booking.delivered = False
+        booking.deposit += value
+        market.remaining_supply -= volume
+        if market.remaining_supply == 0:
+            market.previous += 1
+            label += '.close'
+        return self._charge(label)
+
+    def confirm_receivership(self, sender, token_id, volume, season_no, provider, value):
+        farm = self.farms.get(token_id)
+        if farm is None or farm.owner == ZERO_ADDRESS:
+            raise Revert('dev: invalid token id')
+        if volume == 0:
+            raise Revert('dev: volume cannot be 0')
+        booking = self.bookings.get((sender, token_id, season_no))
+        if booking is None or booking.volume == 0:
+            raise Revert('dev: no bookings')
+        if volume > booking.volume:
+            raise Revert('dev: volume out of range')
+        market = self.markets[token_id]
+        if market.owner == ZERO_ADDRESS:
+            raise Revert('dev: market has no owner')
+        # Deposits are burned at the current market price
+        burning = market.price * volume
+        if burning > booking.deposit or burning < MARKET_FEE:
+            raise Revert()
+        if value != MARKET_FEE:
+            raise Revert('dev: insufficient confirmation fee')
+        booking.deposit -= burning
+        booking.volume -= volume
+        label = 'confirm_receivership.partial_delivery'
+        if booking.volume == 0:
+            booking.delivered = True
+            market.reviews += 1
+            label = 'confirm_receivership.final_delivery'
+        returned = burning - MARKET_FEE
+        market.transactions += returned
+        market.deliveries += 1
+        self.account_tx[sender] = self.account_tx.get(sender, 0) + returned
+        self.platform_tx += returned
+        self.booker_delivery[sender] = self.booker_delivery.get(sender, 0) + 1
+        self.completed_delivery += 1
+        self.dues[market.owner] = self.dues.get(market.owner, 0) + returned
+        self.dues[provider] = self.dues.get(provider, 0) + MARKET_FEE
+        return self._charge(label)
+
+    def withdraw(self, sender):
+        if not self.dues.get(sender):
+            raise Revert('dev: nothing to withdraw')
+        del self.dues[sender]
+        return self._charge('withdraw')
+
+# Season actions of a farm in order, create_market waits for a sold out market
+STAGES = ('open_season', 'confirm_preparations', 'confirm_planting', 'confirm_growth', 'confirm_harvesting', 'create_market', 'close_season')
+MARKET_STAGE = STAGES.index('create_market')
+
+class Workload:
+    # Random operation stream: farms cycle through seasons into markets that
+    # bookers book and confirm, then everyone paid withdraws
+    #
+    # Owners and bookers must be distinct accounts. With `invalid_rate`,
+    # operations the contracts reject are mixed in without changing state.
+    # Waiting farms and bookings sit in swap-popped lists: O(1) per operation.
+
+    def __init__(self, owners, bookers, provider, farms, bookings, seed=0, price=PRICE, supply=(5, 50), volume=(1, 5), transfer_rate=0.0, invalid_rate=0.0):
+        assert farms > 0, 'workload needs farms'
+        self.owners = list(owners)
+        self.bookers = list(bookers)
+        self.provider = provider
+        self.farms = farms
+        self.bookings = bookings
+        self.rng = random.Random(seed)
+        self.price = price
+        self.supply = supply
+        self.volume = volume
+        self.transfer_rate = transfer_rate
+        self.invalid_rate = invalid_rate
+
+    def __iter__(self):
+        rng = self.rng
+        self.owner_of = dict()
+        self.season_of = dict()
+        self.stage = dict()
+        self.remaining = dict()
+        self.stepping = list()
+        self.open = list()
+        self.pending = list()
+        self.left = dict()
+        self.paid = dict()
+        for token_id in range(1, self.farms + 1):
+            owner = self.owners[(token_id - 1) % len(self.owners)]
+            self.owner_of[token_id] = owner
+            self.season_of[token_id] = 0
+            self.stage[token_id] = 0
+            self.stepping.append(token_id)
+            yield ('tokenize_land', owner, (token_id,))
+        booked = 0
+        while booked < self.bookings:
+            if self.invalid_rate and rng.random() < self.invalid_rate:
+                yield self._invalid()
+                continue
+            roll = rng.random()
+            if self.open and (roll < 0.5 or not self.stepping):
+                booked += 1
+                yield self._book()
+            elif self.pending and roll < 0.75:
+                yield self._confirm()
+            elif roll >= 1 - self.transfer_rate and len(self.owners) > 1:
+                yield self._transfer()
+            else:
+                # Farms without an open market wait on a season action
+                yield self._step()
+        # Deliver every open booking in full
+        while self.pending:
+            yield self._confirm(full=True)
+        for account in self.paid:
+            yield ('withdraw', account, ())
+
+    def _pop(self, items, index):
+        last = items.pop()
+        if index < len(items):
+            items[index] = last
+
+    def _step(self):
+        index = self.rng.randrange(len(self.stepping))
+        token_id = self.stepping[index]
+        stage = self.stage[token_id]
+        owner = self.owner_of[token_id]
+        self.stage[token_id] = (stage + 1) % len(STAGES)
+        if stage == 0:
+            self.season_of[token_id] += 1
+        if stage == MARKET_STAGE:
+            supply = self.rng.randint(*self.supply)
+            self._pop(self.stepping, index)
+            self.open.append(token_id)
+            self.remaining[token_id] = supply
+            return ('create_market', owner, (token_id, self.price, supply))
+        return (STAGES[stage], owner, (token_id,))
+
+    def _book(self):
+        index = self.rng.randrange(len(self.open))
+        token_id = self.open[index]
+        booker = self.rng.choice(self.bookers)
+        season = self.season_of[token_id]
+        volume = min(self.rng.randint(*self.volume), self.remaining[token_id])
+        self.remaining[token_id] -= volume
+        if not self.remaining[token_id]:
+            # Sold out: the farm can close its season
+            self._pop(self.open, index)
+            self.stepping.append(token_id)
+        key = (booker, token_id, season)
+        if key not in self.left:
+            self.left[key] = 0
+            self.pending.append(key)
+        self.left[key] += volume
+        return ('book_harvest', booker, (token_id, volume, season, self.price * volume))
+
+    def _confirm(self, full=False):
+        index = len(self.pending) - 1 if full else self.rng.randrange(len(self.pending))
+        key = self.pending[index]
+        booker, token_id, season = key
+        volume = self.left[key] if full else self.rng.randint(1, self.left[key])
+        self.left[key] -= volume
+        if not self.left[key]:
+            del self.left[key]
+            self._pop(self.pending, index)
+        # Dues go to the farm's current owner
+        self.paid[self.owner_of[token_id]] = True
+        self.paid[self.provider] = True
+        return ('confirm_receivership', booker, (token_id, volume, season, self.provider, MARKET_FEE))
+
+    def _transfer(self):
+        token_id = self.rng.randint(1, self.farms)
+        owner = self.owner_of[token_id]
+        receiver = owner
+        while receiver == owner:
+            receiver = self.rng.choice(self.owners)
+        self.owner_of[token_id] = receiver
+        return ('transfer_from', owner, (owner, receiver, token_id))
+
+    def _invalid(self):
+        # An operation the contracts reject
+        if self.open and (not self.stepping or self.rng.random() < 0.5):
+            token_id = self.rng.choice(self.open)
+            remaining = self.remaining[token_id]
+            if self.rng.random() < 0.5:
+                # Owner books own harvest
+                return ('book_harvest', self.owner_of[token_id], (token_id, 1, self.season_of[token_id], self.price))
+            # Book more than the market supply
+            return ('book_harvest', self.rng.choice(self.bookers), (token_id, remaining + 1, self.season_of[token_id], self.price * (remaining + 1)))
+        # Booker runs a farm's next season action
+        token_id = self.rng.choice(self.stepping)
+        stage = self.stage[token_id]
+        args = (token_id, self.price, 1) if stage == MARKET_STAGE else (token_id,)
+        return (STAGES[stage], self.rng.choice(self.bookers), args)
+
+class ChainReplay:
+    # Send model operations to deployed contracts
+
+    def __init__(self, registry, season, market):
+        self.registry = registry
+        self.season = season
+        self.market = market
+
+    def apply(self, op):
+        name, sender, args = op
+        return getattr(self, name)(sender, *args)
+
+    def tokenize_land(self, sender, token_id):
+        return self.registry.tokenizeLand('Arunga Vineyard', '294.32ha', 'Lyaduywa, Kenya', ipfs_hash, 'loam soil', token_id, {'from': sender})
+
+    def transfer_from(self, sender, from_, to, token_id):
+        return self.registry.transferFrom(from_, to, token_id, {'from': sender})
+
+    def burn(self, sender, token_id):
+        return self.registry.burn(token_id, {'from': sender})
+
+    def set_approval_for_all(self, sender, operator, approved):
+        return self.registry.setApprovalForAll(operator, approved, {'from': sender})
+
+    def open_season(self, sender, token_id):
+        return self.season.openSeason(token_id, {'from': sender})
+
+    def confirm_preparations(self, sender, token_id):
+        return self.season.confirmPreparations(token_id, 'Tomatoe', 'Organic Fertilizer', 'Cow Shed Manure', ipfs_hash, {'from': sender})
+
+    def confirm_planting(self, sender, token_id):
+        return self.season.confirmPlanting(token_id, 'F1', 'Kenya Seed Company', ipfs_hash, '1200kg', 'Jobe 1960 Organic Fertilizer', 'Kenya Seed Supplier', ipfs_hash, {'from': sender})
+
+    def confirm_growth(self, sender, token_id):
+        return self.season.confirmGrowth(token_id, 'Army worm', ipfs_hash, 'Infestor x32H', 'Aphids Supplier', ipfs_hash, {'from': sender})
+
+    def confirm_harvesting(self, sender, token_id):
+        return self.season.confirmHarvesting(token_id, '120 KG', {'from': sender})
+
+    def close_season(self, sender, token_id):
+        return self.season.closeSeason(token_id, {'from': sender})
+
+    def create_market(self, sender, token_id, price, supply):
+        return self.market.createMarket(token_id, 'Tomatoe', ipfs_hash, price, supply, 'KG', {'from': sender})
+
+    def book_harvest(self, sender, token_id, volume, season_no, value):
+        return self.market.bookHarvest(token_id, volume, season_no, {'from': sender, 'value': value})
+
+    def confirm_receivership(self, sender, token_id, volume, season_no, provider, value):
+        return self.market.confirmReceivership(token_id, volume, season_no, provider, 'Fresh produce', {'from': sender, 'value': value})
+
+    def withdraw(self, sender):
+        return self.market.withdraw({'from': sender})
+
+def replay(model, chain, ops):
+    # Apply every operation to the model and the chain, the chain must revert
+    # exactly where the model does. Returns the number of reverted operations
+    #
+    # brownie.reverts only exists inside a brownie test session: import the
+    # context manager it wraps here so the model loads anywhere
+    from brownie.test.managers.runner import RevertContextManager
+    reverted = 0
+    for op in ops:
+        try:
+            model.apply(op)
+        except Revert as error:
+            reverted += 1
+            with RevertContextManager(error.reason):
+                chain.apply(op)
+        else:
+            chain.apply(op)
+    return reverted
+
+def booking_key(token_id, season_no):
+    # Market.bookingKey
+    return int.from_bytes(keccak(token_id.to_bytes(32, 'big') + season_no.to_bytes(32, 'big')), 'big')
+
+def state_diff(model, chain, accounts):
+    # (view, expected, actual) for every view the model gets wrong, empty when
+    # the model and the contracts agree
+    registry, season, market = chain.registry, chain.season, chain.market
+    diff = list()
+
+    def check(view, expected, actual):
+        if expected != actual:
+            diff.append((view, expected, actual))
+
+    check('totalSupply', len(model.platform), registry.totalSupply())
+    check('tokenByIndex', model.platform, [registry.tokenByIndex(i) for i in range(registry.totalSupply())])
+    check('completeSeasons', model.complete_seasons, season.completeSeasons())
+    check('totalMarkets', model.market_count, market.totalMarkets())
+    check('platformTransactions', model.platform_tx, market.platformTransactions())
+    for token_id, farm in sorted(model.farms.items()):
+        check('exists(%d)' % token_id, farm.owner != ZERO_ADDRESS, registry.exists(token_id))
+        if farm.owner == ZERO_ADDRESS:
+            continue
+        check('ownerOf(%d)' % token_id, str(farm.owner), str(registry.ownerOf(token_id)))
+        check('getTokenState(%d)' % token_id, farm.state, registry.getTokenState(token_id))
+        check('currentSeason(%d)' % token_id, farm.running, season.currentSeason(token_id))
+        check('getFarmCompleteSeasons(%d)' % token_id, farm.complete, season.getFarmCompleteSeasons(token_id))
+        farm_market = model.markets.get(token_id)
+        if farm_market is None:
+            continue
+        current = market.getCurrentFarmMarket(token_id)
+        check('getCurrentFarmMarket(%d)' % token_id,
+              (farm_market.season, farm_market.price, farm_market.original_supply, farm_market.remaining_supply, farm_market.bookers, str(farm_market.owner)),
+              (current['season'], current['price'], current['originalSupply'], current['remainingSupply'], current['bookers'], str(current['owner'])))
+        check('farmPrevMarkets(%d)' % token_id, farm_market.previous, market.farmPrevMarkets(token_id))
+        check('totalMarketBookers(%d)' % token_id, farm_market.total_bookers, market.totalMarketBookers(token_id))
+        check('farmTransactions(%d)' % token_id, farm_market.transactions, market.farmTransactions(token_id))
+        check('farmDeliverables(%d)' % token_id, farm_market.deliveries, market.farmDeliverables(token_id))
+    for account in accounts:
+        owned = model.owned.get(account, [])
+        check('balanceOf(%s)' % account, len(owned), registry.balanceOf(account))
+        check('tokenOfOwnerByIndex(%s)' % account, owned, [registry.tokenOfOwnerByIndex(account, i) for i in range(len(owned))])
+        check('accountDues(%s)' % account, model.dues.get(account, 0), market.accountDues(account))
+        check('userTransactions(%s)' % account, model.account_tx.get(account, 0), market.userTransactions(account))
+        check('totalBookerBooking(%s)' % account, model.booker_bookings.get(account, 0), market.totalBookerBooking(account))
+        check('accountDeliverables(%s)' % account, model.booker_delivery.get(account, 0), market.accountDeliverables(account))
+    for (booker, token_id, season_no), booking in model.bookings.items():
+        book = market.getBookerBooking(booking_key(token_id, season_no), booker)
+        check('getBookerBooking(%d, %d, %s)' % (token_id, season_no, booker),
+              (booking.volume, booking.original_volume, booking.deposit, booking.delivered),
+              (book['volume'], book['originalVolume'], book['deposit'], book['delivered']))
+    return diff
+
+def gas_report(model, block_gas_limit=BLOCK_GAS_LIMIT):
+    lines = ['%-40s %10s %16s %10s' % ('operation', 'count', 'gas', 'blocks')]
+    for label, (count, gas) in sorted(model.gas.items()):
+        lines.append('%-40s %10d %16d %10.1f' % (label, count, gas, gas / block_gas_limit))
+    lines.append('%-40s %10d %16d %10.1f' % ('total', sum(count for count, _ in model.gas.values()), model.gas_used, model.gas_used / block_gas_limit))
+    return '\n'.join(lines)
+
+def main(farms=10000, bookings=100000, owners=2000, bookers=20000, seed=0):
+    # Plan a season of activity, no chain needed
+    owners = ['0x%040x' % (i + 1) for i in range(int(owners))]
+    bookers = ['0x%040x' % (len(owners) + i + 1) for i in range(int(bookers))]
+    provider = '0x%040x' % (len(owners) + len(bookers) + 1)
+    model = ReferenceModel()
+    started = time.perf_counter()
+    operations = 0
+    for op in Workload(owners, bookers, provider, int(farms), int(bookings), seed=int(seed)):
+        model.apply(op)
+        operations += 1
+    elapsed = time.perf_counter() - started
+    print('%d operations in %.1fs, %d per minute' % (operations, elapsed, operations * 60 / elapsed))
+    print(gas_report(model))
@@ -0,0 +1,89 @@
+from brownie import FRMRegistry, Market, Season, web3
+
+from scripts.farm_states import CROP_GROWTH, HARVESTING, MARKETING, PLANTING, PREPARATION
+from scripts.ipfs import EMPTY_BYTES32, cid_to_bytes32
+
+ipfs_hash = cid_to_bytes32('QmUfideC1r5JhMVwgd8vjC7DtVnXw3QGfCSQA7fUVHK789')
+
+class Scenario:
+    # Deployed contracts with farms driven to a lifecycle stage
+
+    def __init__(self, registry, season, market, farms, owners, bookers):
+        self.registry = registry
+        self.season = season
+        self.market = market
+        self.farms = farms
+        self.owners = owners
+        self.bookers = bookers
+
+    def owner_of(self, token_id):
+        return self.owners[self.farms.index(token_id)]
+
+class ScenarioFactory:
+    # Build and cache lifecycle scenarios
+    #
+    # Build from module-scoped fixtures: brownie's fn_isolation snapshots the
+    # chain after them and reverts to it after every test, so a scenario is
+    # replayed once per module rather than once per test.
+
+    def __init__(self, accounts, deployer=None):
+        self.accounts = accounts
+        self.deployer = deployer or accounts[0]
+        self._cache = dict()
+
+    def deploy(self):
+        registry = FRMRegistry.deploy({'from': self.deployer})
+        season = Season.deploy(registry.address, {'from': self.deployer})
+        market = Market.deploy(registry.address, season.address, {'from': self.deployer})
+        registry.setSeasonContract(season.address, {'from': self.deployer})
+        registry.setMarketContract(market.address, {'from': self.deployer})
+        return registry, season, market
+
+    def build(self, farms=1, stage=MARKETING, seasons=1, bookers=0, supply=30, price=None, volume=1, token_ids=None, owners=None):
+        # Tokenize `farms`, run `seasons - 1` full seasons and drive the last one to `stage`
+        # With `supply`, a market opens at MARKETING and `bookers` book `volume` on each farm
+        token_ids = tuple(token_ids or range(1, farms + 1))
+        owners = tuple(owners or (self.accounts[i % 2] for i in range(len(token_ids))))
+        key = (token_ids, owners, stage, seasons, bookers, supply, price, volume)
+        scenario = self._cache.get(key)
+        if scenario is not None and self._alive(scenario):
+            return scenario
+        registry, season, market = self.deploy()
+        # Addresses of scenarios lost to a revert are reused
+        self._cache = {k: v for k, v in self._cache.items() if v.market.address != market.address}
+        booker_accounts = list(self.accounts[2:2 + bookers])
+        scenario = Scenario(registry, season, market, list(token_ids), list(owners), booker_accounts)
+        for token_id, owner in zip(token_ids, owners):
+            registry.tokenizeLand('Arunga Vineyard', '294.32ha', 'Lyaduywa, Kenya', ipfs_hash, 'loam soil', token_id, {'from': owner})
+            for _ in range(seasons - 1):
+                self.advance(scenario, token_id, MARKETING)
+                season.closeSeason(token_id, {'from': owner})
+            self.advance(scenario, token_id, stage)
+        if stage == MARKETING and supply:
+            price = price or web3.toWei(1, 'ether')
+            for token_id, owner in zip(token_ids, owners):
+                market.createMarket(token_id, 'Tomatoe', ipfs_hash, price, supply, "KG", {'from': owner})
+            for booker in booker_accounts:
+                for token_id in token_ids:
+                    market.bookHarvest(token_id, volume, seasons, {'from': booker, 'value': price * volume})
+        self._cache[key] = scenario
+        return scenario
+
+    def advance(self, scenario, token_id, stage):
+        # Drive a dormant farm through the season steps up to `stage`
+        owner = {'from': scenario.owner_of(token_id)}
+        season = scenario.season
+        if stage >= PREPARATION:
+            season.openSeason(token_id, owner)
+        if stage >= PLANTING:
+            season.confirmPreparations(token_id, 'Tomatoe', 'Organic Fertilizer', 'Cow Shed Manure', ipfs_hash, owner)
+        if stage >= CROP_GROWTH:
+            season.confirmPlanting(token_id, 'F1', 'Kenya Seed Company', ipfs_hash, '1200kg', 'Jobe 1960 Organic Fertilizer', 'Kenya Seed Supplier', ipfs_hash, owner)
+        if stage >= HARVESTING:
+            season.confirmGrowth(token_id, '', EMPTY_BYTES32, '', '', EMPTY_BYTES32, owner)
+        if stage >= MARKETING:
+            season.confirmHarvesting(token_id, "120 KG", owner)
+
+    def _alive(self, scenario):
+        # A scenario built inside a test is gone once the test reverts
+        return len(web3.eth.get_code(scenario.market.address)) > 0
@@ -0,0 +1,51 @@
+from brownie import Season, accounts, network
+from hexbytes import HexBytes
+
+# Limits of Season.batchSeasonSteps
+MAX_CALLS = 20
+MAX_CALLDATA = 16384
+
+class SeasonBatch:
+    # Queue season steps and send them through Season.batchSeasonSteps
+    #
+    # Steps run as `sender`: the farm owner or an operator approved with
+    # FRMRegistry.setApprovalForAll. A failing step reverts its whole batch.
+
+    def __init__(self, season):
+        self.season = season
+        self.calls = list()
+
+    def add(self, method, *args):
+        # Queue `season.method(*args)`
+        self.calls.append(HexBytes(getattr(self.season, method).encode_input(*args)))
+        return len(self.calls) - 1
+
+    def execute(self, sender):
+        # One transaction per MAX_CALLS queued steps, in queue order
+        txs = list()
+        calls, self.calls = self.calls, list()
+        start = 0
+        while start < len(calls):
+            chunk = list()
+            size = 0
+            for call in calls[start:start + MAX_CALLS]:
+                if chunk and size + len(call) > MAX_CALLDATA:
+                    break
+                chunk.append(call)
+                size += len(call)
+            lengths = [len(call) for call in chunk]
+            txs.append(self.season.batchSeasonSteps(b''.join(chunk), lengths + [0] * (MAX_CALLS - len(chunk)), len(chunk), {'from': sender}))
+            start += len(chunk)
+        return txs
+
+def main(step, *token_ids):
+    # Run a step without data(openSeason or closeSeason) on many farms
+    if network.show_active() == 'development':
+        acc = accounts[0]
+    else:
+        acc = accounts.load('mkulima-acc1')
+    batch = SeasonBatch(Season[-1])
+    for token_id in token_ids:
+        batch.add(step, int(token_id))
+    for tx in batch.execute(acc):
+        print(tx.txid, tx.gas_used)
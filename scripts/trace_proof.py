@@ -0,0 +1,129 @@
+from brownie import Season
+from eth_utils import keccak
+from hexbytes import HexBytes
+
+# Merkle proofs of single season data fields against the season trace hash,
+# mirrors Season._merkleRoot and the leaf layout documented in Season.vy
+
+EMPTY_NODE = b'\x00' * 32
+
+# Leaves per group and groups per season
+GROUP_SIZE = 8
+GROUPS = 8
+
+# Field => (leaf index, ABI type). `season` is the season number
+TRACE_FIELDS = {
+    # Open season
+    'tokenId': (0, 'uint256'),
+    'openingDate': (1, 'uint256'),
+    # Confirm preparations
+    'crop': (8, 'string'),
+    'preparationFertilizer': (9, 'string'),
+    'preparationFertilizerSupplier': (10, 'string'),
+    'preparationFertilizerProof': (11, 'bytes32'),
+    'preparationDate': (12, 'uint256'),
+    # Confirm planting
+    'seedsUsed': (16, 'string'),
+    'seedsSupplier': (17, 'string'),
+    'seedProof': (18, 'bytes32'),
+    'expectedYield': (19, 'string'),
+    'plantingFertilizer': (20, 'string'),
+    'plantingFertilizerSupplier': (21, 'string'),
+    'plantingFertilizerProof': (22, 'bytes32'),
+    'plantingDate': (23, 'uint256'),
+    # Confirm crop growth
+    'pestOrVirus': (24, 'string'),
+    'pesticideUsed': (25, 'string'),
+    'pesticideImage': (26, 'bytes32'),
+    'pesticideSupplier': (27, 'string'),
+    'proofOfTxForPesticide': (28, 'bytes32'),
+    'growthDate': (29, 'uint256'),
+    # Confirm harvesting
+    'harvestDate': (32, 'uint256'),
+    'harvestSupply': (33, 'string'),
+    'season': (34, 'uint256')
+}
+
+# Groups with committed leaves, the rest have an empty root
+USED_GROUPS = sorted(set(index // GROUP_SIZE for index, _ in TRACE_FIELDS.values()))
+
+def encode_value(kind, value):
+    if kind == 'string':
+        return keccak(text=value)
+    if kind == 'bytes32':
+        value = bytes(HexBytes(value))
+        assert len(value) == 32, 'bytes32 value expected'
+        return value
+    return int(value).to_bytes(32, 'big')
+
+def leaf(field, value):
+    index, kind = TRACE_FIELDS[field]
+    return keccak(index.to_bytes(32, 'big') + encode_value(kind, value))
+
+def merkle_levels(nodes):
+    # Levels from `nodes` up to the root, pairs hashed in order
+    levels = [list(nodes)]
+    while len(levels[-1]) > 1:
+        level = levels[-1]
+        levels.append([keccak(level[i] + level[i + 1]) for i in range(0, len(level), 2)])
+    return levels
+
+def season_values(season_data, season):
+    # Field values of a `querySeasonData`/`resolveSeasonHash` result
+    values = {field: season_data[field] for field in TRACE_FIELDS if field != 'season'}
+    values['season'] = season
+    return values
+
+def build_tree(values):
+    # Leaf levels of every group and the group root levels
+    leaves = [[EMPTY_NODE] * GROUP_SIZE for _ in range(GROUPS)]
+    for field, value in values.items():
+        index = TRACE_FIELDS[field][0]
+        leaves[index // GROUP_SIZE][index % GROUP_SIZE] = leaf(field, value)
+    group_levels = [merkle_levels(group) for group in leaves]
+    roots = [levels[-1][0] if group in USED_GROUPS else EMPTY_NODE for group, levels in enumerate(group_levels)]
+    return group_levels, merkle_levels(roots)
+
+def siblings(levels, position):
+    path = list()
+    for level in levels[:-1]:
+        path.append(level[position ^ 1])
+        position //= 2
+    return path
+
+def trace_root(values):
+    return '0x' + build_tree(values)[1][-1][0].hex()
+
+def build_proof(values, field):
+    # Proof of one field, JSON serializable for offline verification
+    group_levels, root_levels = build_tree(values)
+    index = TRACE_FIELDS[field][0]
+    group, position = divmod(index, GROUP_SIZE)
+    path = siblings(group_levels[group], position) + siblings(root_levels, group)
+    return {
+        'field': field,
+        'value': values[field],
+        'index': index,
+        'siblings': ['0x' + node.hex() for node in path]
+    }
+
+def verify_proof(root, proof):
+    # Check a field proof against a trace hash, no chain access needed
+    field = proof['field']
+    if field not in TRACE_FIELDS or TRACE_FIELDS[field][0] != proof['index']:
+        return False
+    node = leaf(field, proof['value'])
+    position = proof['index']
+    for sibling in proof['siblings']:
+        sibling = bytes(HexBytes(sibling))
+        node = keccak(sibling + node) if position & 1 else keccak(node + sibling)
+        position //= 2
+    return position == 0 and len(proof['siblings']) == 6 and node == bytes(HexBytes(root))
+
+def main(token_id, season_no, field='pesticideSupplier'):
+    token_id, season_no = int(token_id), int(season_no)
+    season = Season[-1]
+    values = season_values(season.querySeasonData(token_id, season_no), season_no)
+    root = season.hashedSeason(token_id, season_no)
+    proof = build_proof(values, field)
+    print(root, proof, verify_proof(root, proof))
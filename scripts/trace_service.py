@@ -0,0 +1,235 @@
+import json
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from brownie import FRMRegistry, Season, web3
+from hexbytes import HexBytes
+from web3._utils.events import get_event_data
+
+from scripts.farm_states import MARKETING
+
+# Blocks fetched per eth_getLogs call while warming
+CHUNK_SIZE = 1000
+
+# Resolved seasons kept in memory
+CACHE_SIZE = 10000
+
+HOST = '127.0.0.1'
+PORT = 8008
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS seasons (
+    trace_hash TEXT PRIMARY KEY,
+    season_data TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS checkpoint (
+    id INTEGER PRIMARY KEY CHECK (id = 1),
+    block_number INTEGER NOT NULL
+);
+"""
+
+def _hash(value):
+    # Normalized trace hash: lowercase 0x-prefixed hex, raises on bad input
+    value = bytes(HexBytes(value))
+    if len(value) != 32:
+        raise ValueError('trace hash must be 32 bytes')
+    return '0x' + value.hex()
+
+def _json_value(value):
+    if isinstance(value, (bytes, bytearray)):
+        return '0x' + bytes(value).hex()
+    return value
+
+class TraceCache:
+    # Resolved seasons: bounded in-memory LRU backed by SQLite
+    #
+    # Harvested season data never changes, so entries are never invalidated.
+    # Disk hits are promoted into memory, memory evictions stay on disk.
+
+    def __init__(self, db_path, capacity=CACHE_SIZE):
+        self.capacity = capacity
+        self.entries = OrderedDict()
+        self.lock = threading.Lock()
+        self.db = sqlite3.connect(db_path, check_same_thread=False)
+        self.db.executescript(SCHEMA)
+        self.metrics = {'memory_hits': 0, 'disk_hits': 0, 'misses': 0, 'evictions': 0}
+        # Start with the most recently stored seasons in memory
+        rows = self.db.execute('SELECT trace_hash, season_data FROM seasons ORDER BY rowid DESC LIMIT ?', (capacity,)).fetchall()
+        for trace_hash, season_data in reversed(rows):
+            self.entries[trace_hash] = json.loads(season_data)
+
+    def get(self, trace_hash):
+        with self.lock:
+            entry = self.entries.get(trace_hash)
+            if entry is not None:
+                self.entries.move_to_end(trace_hash)
+                self.metrics['memory_hits'] += 1
+                return entry
+            row = self.db.execute('SELECT season_data FROM seasons WHERE trace_hash = ?', (trace_hash,)).fetchone()
+            if row is None:
+                self.metrics['misses'] += 1
+                return None
+            self.metrics['disk_hits'] += 1
+            entry = json.loads(row[0])
+            self._remember(trace_hash, entry)
+            return entry
+
+    def put(self, trace_hash, entry):
+        with self.lock:
+            with self.db:
+                self.db.execute('INSERT OR REPLACE INTO seasons (trace_hash, season_data) VALUES (?, ?)', (trace_hash, json.dumps(entry)))
+            self._remember(trace_hash, entry)
+
+    def contains(self, trace_hash):
+        with self.lock:
+            if trace_hash in self.entries:
+                return True
+            return self.db.execute('SELECT 1 FROM seasons WHERE trace_hash = ?', (trace_hash,)).fetchone() is not None
+
+    def _remember(self, trace_hash, entry):
+        self.entries[trace_hash] = entry
+        self.entries.move_to_end(trace_hash)
+        while len(self.entries) > self.capacity:
+            self.entries.popitem(last=False)
+            self.metrics['evictions'] += 1
+
+    def checkpoint(self, default):
+        row = self.db.execute('SELECT block_number FROM checkpoint WHERE id = 1').fetchone()
+        return row[0] if row else default
+
+    def set_checkpoint(self, block_number):
+        with self.lock:
+            with self.db:
+                self.db.execute('INSERT OR REPLACE INTO checkpoint (id, block_number) VALUES (1, ?)', (block_number,))
+
+    def stats(self):
+        with self.lock:
+            stats = dict(self.metrics, entries=len(self.entries), capacity=self.capacity)
+            stats['disk_entries'] = self.db.execute('SELECT COUNT(*) FROM seasons').fetchone()[0]
+        lookups = stats['memory_hits'] + stats['disk_hits'] + stats['misses']
+        stats['hit_ratio'] = (stats['memory_hits'] + stats['disk_hits']) / lookups if lookups else 0.0
+        return stats
+
+class TraceResolver:
+    # Resolve trace hashes to season data, the node is only asked on cache misses
+
+    def __init__(self, w3, registry, season, cache, start_block=0, chunk_size=CHUNK_SIZE):
+        self.web3 = w3
+        self.registry = w3.eth.contract(address=registry.address, abi=registry.abi)
+        self.season = w3.eth.contract(address=season.address, abi=season.abi)
+        self.cache = cache
+        self.start_block = start_block
+        self.chunk_size = chunk_size
+        # SeasonData fields: Vyper returns a struct as one output per field
+        resolve_abi = next(abi for abi in season.abi if abi.get('name') == 'resolveSeasonHash')
+        self.fields = [output['name'] for output in resolve_abi['outputs']]
+        self.transition = next(abi for abi in registry.abi if abi.get('type') == 'event' and abi['name'] == 'Transition')
+        # Handler threads share the resolver: metrics only change under the lock
+        self.lock = threading.Lock()
+        self.metrics = {'resolved': 0, 'unresolved': 0, 'rpc_seconds': 0.0, 'warmed': 0}
+
+    def resolve(self, trace_hash):
+        # Season data as a dict, None for unresolved hashes
+        trace_hash = _hash(trace_hash)
+        entry = self.cache.get(trace_hash)
+        if entry is not None:
+            return entry
+        return self._fetch(trace_hash)
+
+    def _fetch(self, trace_hash):
+        started = time.perf_counter()
+        try:
+            if not self.season.functions.resolvedHash(trace_hash).call():
+                self._count('unresolved')
+                return None
+            data = self.season.functions.resolveSeasonHash(trace_hash).call()
+        finally:
+            self._count('rpc_seconds', time.perf_counter() - started)
+        entry = {field: _json_value(value) for field, value in zip(self.fields, data)}
+        self._count('resolved')
+        # Unresolved hashes are not cached: they may be harvested later
+        self.cache.put(trace_hash, entry)
+        return entry
+
+    def warm(self):
+        # Cache seasons harvested since the last warm-up, returns the number cached
+        #
+        # confirmHarvesting moves a farm to MARKETING through the registry, so
+        # its Transition logs name every farm with a harvested season.
+        head = self.web3.eth.block_number
+        start = self.cache.checkpoint(self.start_block - 1) + 1
+        topic = '0x' + bytes(self.web3.keccak(text='Transition(uint256,uint256)')).hex()
+        token_ids = set()
+        while start <= head:
+            end = min(start + self.chunk_size - 1, head)
+            logs = self.web3.eth.get_logs({'address': self.registry.address, 'topics': [topic], 'fromBlock': start, 'toBlock': end})
+            for log in logs:
+                args = get_event_data(self.web3.codec, self.transition, log)['args']
+                if args['_season'] == MARKETING:
+                    token_ids.add(args['_tokenId'])
+            start = end + 1
+        warmed = 0
+        for token_id in sorted(token_ids):
+            # Burned farms can't be enumerated, their hashes still resolve on request
+            if not self.registry.functions.exists(token_id).call():
+                continue
+            for season_no in range(1, self.season.functions.getFarmCompleteSeasons(token_id).call() + 1):
+                trace_hash = _hash(self.season.functions.hashedSeason(token_id, season_no).call())
+                if not self.cache.contains(trace_hash) and self._fetch(trace_hash) is not None:
+                    warmed += 1
+        self.cache.set_checkpoint(head)
+        self._count('warmed', warmed)
+        return warmed
+
+    def _count(self, metric, amount=1):
+        with self.lock:
+            self.metrics[metric] += amount
+
+    def stats(self):
+        with self.lock:
+            metrics = dict(self.metrics)
+        return dict(self.cache.stats(), **metrics)
+
+class TraceRequestHandler(BaseHTTPRequestHandler):
+    # GET /trace/<hash>: season data, GET /metrics: cache and resolver metrics
+
+    resolver = None
+
+    def do_GET(self):
+        path = self.path.rstrip('/')
+        if path == '/metrics':
+            return self._send(200, self.resolver.stats())
+        if not path.startswith('/trace/'):
+            return self._send(404, {'error': 'not found'})
+        try:
+            entry = self.resolver.resolve(path[len('/trace/'):])
+        except ValueError as error:
+            return self._send(400, {'error': str(error)})
+        if entry is None:
+            return self._send(404, {'error': 'unresolved trace hash'})
+        self._send(200, entry)
+
+    def _send(self, status, body):
+        payload = json.dumps(body).encode()
+        self.send_response(status)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(payload)))
+        self.end_headers()
+        self.wfile.write(payload)
+
+    def log_message(self, format, *args):
+        pass
+
+def serve(resolver, host=HOST, port=PORT):
+    handler = type('Handler', (TraceRequestHandler,), {'resolver': resolver})
+    return ThreadingHTTPServer((host, port), handler)
+
+def main():
+    resolver = TraceResolver(web3, FRMRegistry[-1], Season[-1], TraceCache('reap-traces.db'))
+    print('warmed %d seasons' % resolver.warm())
+    server = serve(resolver)
+    print('serving traces on http://%s:%d' % server.server_address)
+    server.serve_forever()
@@ -0,0 +1,12 @@
+import pytest
+
+from scripts.scenarios import ScenarioFactory
+
+# Revert to the module's built scenarios after every test
+@pytest.fixture(autouse=True)
+def isolation(fn_isolation):
+    pass
+
+@pytest.fixture(scope='module')
+def scenarios(accounts):
+    yield ScenarioFactory(accounts)
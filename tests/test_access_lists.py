@@ -0,0 +1,60 @@
+import pytest
+
+from scripts.access_lists import AccessListBuilder, access_list_from_trace, prune
+from scripts.farm_states import DORMANT, PREPARATION
+
+season_address = '0x' + '11' * 20
+registry_address = '0x' + '22' * 20
+library_address = '0x' + '33' * 20
+sender_address = '0x' + '44' * 20
+
+def word(value):
+    return '%064x' % int(value, 16)
+
+@pytest.fixture(scope='module')
+def scenario(scenarios, accounts):
+    yield scenarios.build(stage=DORMANT, token_ids=(1,), owners=(accounts[0],))
+
+def test_access_list_from_trace():
+    struct_logs = [
+        {'op': 'SLOAD', 'depth': 1, 'stack': ['0x5']},
+        {'op': 'EXTCODESIZE', 'depth': 1, 'stack': [registry_address]},
+        {'op': 'STATICCALL', 'depth': 1, 'stack': ['0x0', registry_address, '0xffff']},
+        {'op': 'SLOAD', 'depth': 2, 'stack': [word('0x7')]},
+        {'op': 'DELEGATECALL', 'depth': 2, 'stack': ['0x0', library_address, '0xffff']},
+        {'op': 'SSTORE', 'depth': 3, 'stack': ['0x1', '0x8']},
+        {'op': 'STATICCALL', 'depth': 1, 'stack': ['0x0', '0x4', '0xffff']},
+        {'op': 'SSTORE', 'depth': 1, 'stack': ['0x1', '0x9']}
+    ]
+    access_list = {entry['address'].lower(): entry['storageKeys'] for entry in access_list_from_trace(struct_logs, season_address)}
+
+    # Assertions
+    assert access_list[season_address] == ['0x' + word('0x5'), '0x' + word('0x9')]
+    assert access_list[registry_address] == ['0x' + word('0x7'), '0x' + word('0x8')]
+    assert access_list[library_address] == []
+
+def test_prune_access_list():
+    access_list = [
+        {'address': season_address, 'storageKeys': ['0x5', '0x9']},
+        {'address': sender_address, 'storageKeys': []},
+        {'address': '0x' + '00' * 19 + '04', 'storageKeys': []},
+        {'address': registry_address, 'storageKeys': ['0x7']}
+    ]
+    pruned = prune(access_list, (sender_address, season_address))
+
+    # Assertions
+    assert [entry['address'].lower() for entry in pruned] == [registry_address]
+    assert pruned[0]['storageKeys'] == ['0x' + word('0x7')]
+
+def test_send_with_access_list(scenario, accounts, web3):
+    builder = AccessListBuilder(web3)
+    tx = builder.build(scenario.season, 'openSeason', 1, sender=accounts[0])
+    receipt = builder.send(scenario.season, 'openSeason', 1, sender=accounts[0])
+
+    # Assertions
+    assert scenario.registry.address in [entry['address'] for entry in tx['accessList']]
+    assert receipt['status'] == 1
+    assert scenario.season.getSeason(1) == PREPARATION
+    count, listed, saved = builder.savings['Season.openSeason']
+    assert (count, listed) == (2, 2)
+    assert saved > 0
@@ -0,0 +1,63 @@
+import pytest
+
+from scripts.deploy import PIPELINE, deploy_suite, deployment_tx, load_manifest, save_manifest
+
+@pytest.fixture
+def manifest(tmp_path):
+    yield str(tmp_path / 'development.json')
+
+def test_deploy_suite(manifest, accounts):
+    contracts = deploy_suite(accounts[0], manifest)
+    entries = load_manifest(manifest)['contracts']
+
+    # Assertions
+    assert sorted(entries) == sorted(name for name, _ in PIPELINE)
+    assert entries['Market']['args'] == [contracts['FRMRegistry'].address, contracts['Season'].address]
+    assert contracts['Market'].seasonContract() == contracts['Season'].address
+    assert contracts['Season'].farmContract() == contracts['FRMRegistry'].address
+    assert contracts['FRMRegistry'].seasonContract() == contracts['Season'].address
+    assert contracts['FRMRegistry'].marketContract() == contracts['Market'].address
+
+def test_deployment_tx_of_confirmed_deployment(Multicall, accounts):
+    confirmed = Multicall.deploy({'from': accounts[0]})
+    pending = Multicall.deploy({'from': accounts[0], 'required_confs': 0})
+
+    # Assertions
+    assert deployment_tx(confirmed).contract_address == confirmed.address
+    assert deployment_tx(pending) is pending
+
+def test_redeploy_unchanged_suite(manifest, accounts, web3):
+    first = deploy_suite(accounts[0], manifest)
+    nonce = web3.eth.get_transaction_count(accounts[0].address)
+    second = deploy_suite(accounts[0], manifest)
+
+    # Assertions
+    assert web3.eth.get_transaction_count(accounts[0].address) == nonce
+    assert {name: c.address for name, c in first.items()} == {name: c.address for name, c in second.items()}
+
+def test_resume_partial_deployment(manifest, accounts):
+    first = deploy_suite(accounts[0], manifest)
+    deployed = load_manifest(manifest)
+    del deployed['contracts']['Market']
+    save_manifest(manifest, deployed)
+    second = deploy_suite(accounts[0], manifest)
+
+    # Assertions
+    assert second['FRMRegistry'].address == first['FRMRegistry'].address
+    assert second['Market'].address != first['Market'].address
+    assert second['Market'].farmContract() == first['FRMRegistry'].address
+    assert second['FRMRegistry'].marketContract() == second['Market'].address
+
+def test_redeploy_dependents_of_changed_contract(manifest, accounts):
+    first = deploy_suite(accounts[0], manifest)
+    deployed = load_manifest(manifest)
+    deployed['contracts']['FRMRegistry']['bytecodeHash'] = '0x' + '00' * 32
+    save_manifest(manifest, deployed)
+    second = deploy_suite(accounts[0], manifest)
+
+    # Assertions
+    assert second['Multicall'].address == first['Multicall'].address
+    for name in ('FRMRegistry', 'Season', 'Market'):
+        assert second[name].address != first[name].address
+    assert second['Market'].seasonContract() == second['Season'].address
+    assert second['FRMRegistry'].seasonContract() == second['Season'].address
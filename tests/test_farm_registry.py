@@ -2,6 +2,11 @@ import pytest
 
 import brownie
 
+from scripts.bulk_tokenize import BATCH_GAS_LIMIT, batch_args, batch_gas, chunk_farms, encode_farm, tokenize_csv
+from scripts.farm_listing import list_owner_farms, list_tokenized_farms
+from scripts.farm_states import DORMANT, MARKETING, PLANTING, PREPARATION
+from scripts.ipfs import bytes32_to_cid, cid_to_bytes32
+
 farmDict = {
     'tokenId': 0,
     'name': 1,
@@ -15,14 +20,23 @@ farmDict = {
     'platformIndex': 9
 }
 
+ipfs_hash = cid_to_bytes32('QmUfideC1r5JhMVwgd8vjC7DtVnXw3QGfCSQA7fUVHK789')
+
 token_id = 293730023
 
-@pytest.fixture
-def frmregistry_contract(FRMRegistry, accounts):
-    yield FRMRegistry.deploy({'from': accounts[0]})
+@pytest.fixture(scope='module')
+def season_caller(accounts):
+    # Stands in for the season contract, the only caller allowed to move states
+    yield accounts[9]
+
+@pytest.fixture(scope='module')
+def frmregistry_contract(FRMRegistry, accounts, season_caller):
+    registry = FRMRegistry.deploy({'from': accounts[0]})
+    registry.setSeasonContract(season_caller, {'from': accounts[0]})
+    yield registry
 
 def tokenize_farm(frmregistry_contract, accounts):
-    tx = frmregistry_contract.tokenizeLand('Arunga Vineyard', '294.32ha', 'Lyaduywa, Kenya', 'QmUfideC1r5JhMVwgd8vjC7DtVnXw3QGfCSQA7fUVHK789', 'loam soil', token_id, {'from': accounts[0]})
+    tx = frmregistry_contract.tokenizeLand('Arunga Vineyard', '294.32ha', 'Lyaduywa, Kenya', ipfs_hash, 'loam soil', token_id, {'from': accounts[0]})
     return tx
 
 def test_initial_state(frmregistry_contract):
@@ -72,6 +86,17 @@ def test_total_user_tokenized_farms(frmregistry_contract, accounts):
     # Assertions
     assert frmregistry_contract.balanceOf(accounts[0]) == 1
 
+def test_transfer_tokenized_farm(frmregistry_contract, accounts):
+    tokenize_farm(frmregistry_contract, accounts)
+    tx = frmregistry_contract.transferFrom(accounts[0], accounts[1], token_id, {'from': accounts[0]})
+
+    # Assertions
+    assert frmregistry_contract.ownerOf(token_id) == accounts[1]
+    assert frmregistry_contract.balanceOf(accounts[0]) == 0
+    assert frmregistry_contract.balanceOf(accounts[1]) == 1
+    assert tx.events['Transfer']['_from'] == accounts[0]
+    assert tx.events['Transfer']['_to'] == accounts[1]
+
 def test_total_tokenized_farms(frmregistry_contract, accounts):
     tokenize_farm(frmregistry_contract, accounts)
 
@@ -89,7 +114,7 @@ def test_query_farms_belonging_to_an_account(frmregistry_contract, accounts):
     assert len(user_farms) == 1
     assert user_farms[0][farmDict['tokenId']] == token_id
     assert user_farms[0][farmDict['name']] == 'Arunga Vineyard'
-    assert user_farms[0][farmDict['season']] == 'Dormant'
+    assert user_farms[0][farmDict['season']] == DORMANT
     assert user_farms[0][farmDict['location']] == 'Lyaduywa, Kenya'
 
 def test_query_all_tokenized_farms(frmregistry_contract, accounts):
@@ -103,36 +128,252 @@ def test_query_all_tokenized_farms(frmregistry_contract, accounts):
     assert len(indexed_farms) == 1
     assert indexed_farms[0][farmDict['tokenId']] == token_id
     assert indexed_farms[0][farmDict['name']] == 'Arunga Vineyard'
-    assert indexed_farms[0][farmDict['season']] == 'Dormant'
+    assert indexed_farms[0][farmDict['season']] == DORMANT
     assert indexed_farms[0][farmDict['location']] == 'Lyaduywa, Kenya'
 
+def tokenize_farms(frmregistry_contract, accounts, total):
+    for i in range(total):
+        frmregistry_contract.tokenizeLand('Farm %d' % i, '1ha', 'Lyaduywa, Kenya', ipfs_hash, 'loam soil', i + 1, {'from': accounts[i % 2]})
+
+def test_query_tokenized_farm_ids_page(frmregistry_contract, accounts):
+    tokenize_farms(frmregistry_contract, accounts, 5)
+    token_ids, filled = frmregistry_contract.queryTokenizedFarmIds(2, 3)
+
+    # Assertions
+    assert filled == 3
+    assert list(token_ids[:filled]) == [2, 3, 4]
+
+def test_query_tokenized_farm_ids_page_past_end(frmregistry_contract, accounts):
+    tokenize_farms(frmregistry_contract, accounts, 5)
+    token_ids, filled = frmregistry_contract.queryTokenizedFarmIds(4, 10)
+
+    # Assertions
+    assert filled == 2
+    assert list(token_ids[:filled]) == [4, 5]
+
+def test_query_owner_tokenized_farm_ids_page(frmregistry_contract, accounts):
+    tokenize_farms(frmregistry_contract, accounts, 5)
+    token_ids, filled = frmregistry_contract.queryOwnerTokenizedFarmIds(accounts[1], 1, 10)
+
+    # Assertions
+    assert filled == 2
+    assert list(token_ids[:filled]) == [2, 4]
+
+def test_query_tokenized_farm_ids_page_from_zero_index(frmregistry_contract, accounts):
+    tokenize_farms(frmregistry_contract, accounts, 1)
+
+    # Error assertions
+    with brownie.reverts('dev: index starts at 1'):
+        frmregistry_contract.queryTokenizedFarmIds(0, 1)
+
+def test_get_farms_page(frmregistry_contract, accounts):
+    tokenize_farms(frmregistry_contract, accounts, 3)
+    farms, filled = frmregistry_contract.getFarms([3, 1] + [0] * 8, 2)
+
+    # Assertions
+    assert filled == 2
+    assert farms[0][farmDict['name']] == 'Farm 2'
+    assert farms[1][farmDict['name']] == 'Farm 0'
+
+def test_get_farms_page_with_invalid_token_id(frmregistry_contract, accounts):
+    tokenize_farms(frmregistry_contract, accounts, 3)
+
+    # Error assertions
+    with brownie.reverts('dev: invalid token id'):
+        frmregistry_contract.getFarms([1, 7] + [0] * 8, 2)
+
+def test_list_farms_page_by_page(frmregistry_contract, accounts):
+    tokenize_farms(frmregistry_contract, accounts, 7)
+
+    farms = list_tokenized_farms(frmregistry_contract, page_size=3)
+    owner_farms = list_owner_farms(frmregistry_contract, accounts[0], page_size=3)
+
+    # Assertions
+    assert [farm['tokenId'] for farm in farms] == [1, 2, 3, 4, 5, 6, 7]
+    assert [farm['tokenId'] for farm in owner_farms] == [1, 3, 5, 7]
+
+def test_enumerate_tokens_by_index(frmregistry_contract, accounts):
+    tokenize_farms(frmregistry_contract, accounts, 3)
+
+    # Assertions
+    assert frmregistry_contract.supportsInterface('0x' + '780e9d63'.rjust(64, '0')) == True
+    assert [frmregistry_contract.tokenByIndex(i) for i in range(3)] == [1, 2, 3]
+    assert [frmregistry_contract.tokenOfOwnerByIndex(accounts[0], i) for i in range(2)] == [1, 3]
+    with brownie.reverts('dev: index out of range'):
+        frmregistry_contract.tokenByIndex(3)
+
+def test_enumerate_tokens_after_transfer(frmregistry_contract, accounts):
+    tokenize_farms(frmregistry_contract, accounts, 5)
+    frmregistry_contract.transferFrom(accounts[0], accounts[1], 1, {'from': accounts[0]})
+    farm = frmregistry_contract.getFarm(1)
+
+    # Assertions
+    assert [frmregistry_contract.tokenOfOwnerByIndex(accounts[0], i) for i in range(2)] == [5, 3]
+    assert [frmregistry_contract.tokenOfOwnerByIndex(accounts[1], i) for i in range(3)] == [2, 4, 1]
+    assert frmregistry_contract.queryUserTokenizedFarm(1, {'from': accounts[0]})[farmDict['tokenId']] == 5
+    assert farm[farmDict['owner']] == accounts[1]
+    assert farm[farmDict['userIndex']] == 3
+    with brownie.reverts('dev: index out of range'):
+        frmregistry_contract.tokenOfOwnerByIndex(accounts[0], 2)
+
+def test_enumerate_tokens_after_burn(frmregistry_contract, accounts):
+    tokenize_farms(frmregistry_contract, accounts, 5)
+    frmregistry_contract.burn(2, {'from': accounts[1]})
+
+    # Assertions
+    assert frmregistry_contract.totalSupply() == 4
+    assert [frmregistry_contract.tokenByIndex(i) for i in range(4)] == [1, 5, 3, 4]
+    assert [frmregistry_contract.tokenOfOwnerByIndex(accounts[1], i) for i in range(1)] == [4]
+    assert frmregistry_contract.getFarm(5)[farmDict['platformIndex']] == 2
+    assert frmregistry_contract.exists(2) == False
+
+def farm_rows(total, first=1):
+    return [{'tokenId': str(first + i), 'name': 'Farm %d' % i, 'size': '1ha', 'location': 'Lyaduywa, Kenya', 'image': 'QmUfideC1r5JhMVwgd8vjC7DtVnXw3QGfCSQA7fUVHK789', 'soil': 'loam soil'} for i in range(total)]
+
+def long_farm_rows(total, first=1):
+    return [dict(row, name='n' * 100, size='s' * 20, location='l' * 225, soil='o' * 20) for row in farm_rows(total, first)]
+
+def test_tokenize_farms_in_batch(frmregistry_contract, accounts):
+    tokenize_farms(frmregistry_contract, accounts, 2)
+    farms = [encode_farm(row) for row in farm_rows(3, first=3)]
+    tx = frmregistry_contract.tokenizeLands(*batch_args(farms), {'from': accounts[1]})
+
+    # Assertions
+    assert 'Tokenize' not in tx.events
+    assert len(tx.events['Transfer']) == 3
+    assert tx.events['BatchTokenize']['_owner'] == accounts[1]
+    assert tx.events['BatchTokenize']['_count'] == 3
+    assert tx.events['BatchTokenize']['_totalFarms'] == 5
+    assert [frmregistry_contract.tokenByIndex(i) for i in range(5)] == [1, 2, 3, 4, 5]
+    assert [frmregistry_contract.tokenOfOwnerByIndex(accounts[1], i) for i in range(4)] == [2, 3, 4, 5]
+    assert frmregistry_contract.getFarm(5)[farmDict['name']] == 'Farm 2'
+    assert frmregistry_contract.getFarm(5)[farmDict['platformIndex']] == 5
+    assert frmregistry_contract.getFarm(5)[farmDict['userIndex']] == 4
+    assert frmregistry_contract.getFarm(4)[farmDict['location']] == 'Lyaduywa, Kenya'
+    assert frmregistry_contract.getFarm(4)[farmDict['soil']] == 'loam soil'
+
+def test_tokenize_farms_in_batch_is_atomic(frmregistry_contract, accounts):
+    tokenize_farms(frmregistry_contract, accounts, 2)
+    farms = [encode_farm(row) for row in farm_rows(3, first=1)]
+    args = list(batch_args(farms[2:]))
+    args[4] = 0
+
+    # Error assertions
+    with brownie.reverts():
+        frmregistry_contract.tokenizeLands(*batch_args(farms[1:]), {'from': accounts[0]})
+    with brownie.reverts('dev: invalid batch size'):
+        frmregistry_contract.tokenizeLands(*args, {'from': accounts[0]})
+    with pytest.raises(ValueError):
+        encode_farm(dict(farm_rows(1, first=3)[0], size='1' * 21))
+    assert frmregistry_contract.totalSupply() == 2
+
+def test_tokenize_farms_from_csv(frmregistry_contract, accounts, tmp_path):
+    path = tmp_path / 'farms.csv'
+    rows = farm_rows(5)
+    path.write_text('tokenId,name,size,location,image,soil\n' + ''.join('%(tokenId)s,%(name)s,%(size)s,"%(location)s",%(image)s,%(soil)s\n' % row for row in rows))
+    txs = tokenize_csv(frmregistry_contract, str(path), accounts[0], gas_limit=2000000)
+
+    # Assertions
+    assert [tx.events['BatchTokenize']['_count'] for tx in txs] == [4, 1]
+    assert frmregistry_contract.balanceOf(accounts[0]) == 5
+    assert frmregistry_contract.getFarm(4)[farmDict['location']] == 'Lyaduywa, Kenya'
+
+def test_chunk_farms_by_gas():
+    farms = [encode_farm(row) for row in farm_rows(45)]
+    long_farms = [encode_farm(row) for row in long_farm_rows(25)]
+
+    # Assertions
+    assert [len(batch) for batch in chunk_farms(farms)] == [17, 17, 11]
+    assert [len(batch) for batch in chunk_farms(farms, gas_limit=2000000)] == [4] * 11 + [1]
+    assert [len(batch) for batch in chunk_farms(long_farms)] == [10, 10, 5]
+    assert [len(batch) for batch in chunk_farms(long_farms[:5] + farms[:10])] == [14, 1]
+
+    # Error assertions
+    with pytest.raises(AssertionError):
+        chunk_farms(long_farms, gas_limit=700000)
+
+def test_tokenize_long_farms_within_gas_estimate(frmregistry_contract, accounts):
+    farms = [encode_farm(row) for row in long_farm_rows(10)]
+    tx = frmregistry_contract.tokenizeLands(*batch_args(farms), {'from': accounts[0], 'gas_limit': BATCH_GAS_LIMIT})
+
+    # Assertions
+    assert chunk_farms(farms) == [farms]
+    assert tx.gas_used <= batch_gas(farms)
+    assert frmregistry_contract.getFarm(10)[farmDict['location']] == 'l' * 225
+
 def test_get_tokenized_farm_state(frmregistry_contract, accounts):
     tokenize_farm(frmregistry_contract, accounts)
 
     # Assertions
-    assert frmregistry_contract.getTokenState(token_id) == 'Dormant'
+    assert frmregistry_contract.getTokenState(token_id) == DORMANT
 
-def test_update_tokenized_farm_state(frmregistry_contract, accounts):
+def test_update_tokenized_farm_to_invalid_state(frmregistry_contract, accounts, season_caller):
     tokenize_farm(frmregistry_contract, accounts)
 
-    frmregistry_contract.transitionState(token_id, 'Preparation', accounts[0])
+    # Error assertions
+    with brownie.reverts('dev: invalid state'):
+        frmregistry_contract.advanceState(token_id, DORMANT, 6, accounts[0], {'from': season_caller})
+
+def test_advance_tokenized_farm_state(frmregistry_contract, accounts, season_caller):
+    tokenize_farm(frmregistry_contract, accounts)
+
+    tx = frmregistry_contract.advanceState(token_id, DORMANT, PREPARATION, accounts[0], {'from': season_caller})
 
     # Assertions
-    assert frmregistry_contract.getTokenState(token_id) == 'Preparation'
+    assert tx.return_value == (accounts[0], DORMANT, True)
+    assert frmregistry_contract.getTokenState(token_id) == PREPARATION
 
-def test_unrestricted_tokenized_farm_state_update(frmregistry_contract, accounts):
+def test_advance_tokenized_farm_state_from_unexpected_state(frmregistry_contract, accounts, season_caller):
     tokenize_farm(frmregistry_contract, accounts)
 
-    # Error assertions
-    with brownie.reverts():
-        frmregistry_contract.transitionState(token_id, 'Preparation', accounts[1])
+    tx = frmregistry_contract.advanceState(token_id, PREPARATION, PLANTING, accounts[0], {'from': season_caller})
+
+    # Assertions
+    assert tx.return_value == (accounts[0], DORMANT, True)
+    assert frmregistry_contract.getTokenState(token_id) == DORMANT
+
+def test_unrestricted_tokenized_farm_state_advance(frmregistry_contract, accounts, season_caller):
+    tokenize_farm(frmregistry_contract, accounts)
+
+    tx = frmregistry_contract.advanceState(token_id, DORMANT, PREPARATION, accounts[1], {'from': season_caller})
+
+    # Assertions
+    assert tx.return_value == (accounts[0], DORMANT, False)
+    assert frmregistry_contract.getTokenState(token_id) == DORMANT
 
-def test_update_invalid_tokenized_farm(frmregistry_contract, accounts):
+def test_operator_tokenized_farm_state_advance(frmregistry_contract, accounts, season_caller):
+    tokenize_farm(frmregistry_contract, accounts)
+    frmregistry_contract.setApprovalForAll(accounts[2], True, {'from': accounts[0]})
+
+    tx = frmregistry_contract.advanceState(token_id, DORMANT, PREPARATION, accounts[2], {'from': season_caller})
+
+    # Assertions
+    assert tx.return_value == (accounts[0], DORMANT, True)
+    assert frmregistry_contract.getTokenState(token_id) == PREPARATION
+
+def test_advance_state_from_third_party(frmregistry_contract, accounts):
     tokenize_farm(frmregistry_contract, accounts)
 
     # Error assertions
-    with brownie.reverts():
-        frmregistry_contract.transitionState(3, 'Planting', accounts[0])
+    for caller in (accounts[0], accounts[1]):
+        with brownie.reverts('dev: only season'):
+            frmregistry_contract.advanceState(token_id, DORMANT, MARKETING, accounts[0], {'from': caller})
+    assert frmregistry_contract.getTokenState(token_id) == DORMANT
+
+def test_set_season_contract_from_non_minter(frmregistry_contract, accounts):
+
+    # Error assertions
+    with brownie.reverts('dev: only minter'):
+        frmregistry_contract.setSeasonContract(accounts[1], {'from': accounts[1]})
+
+def test_update_invalid_tokenized_farm(frmregistry_contract, accounts, season_caller):
+    tokenize_farm(frmregistry_contract, accounts)
+
+    tx = frmregistry_contract.advanceState(3, DORMANT, PREPARATION, accounts[0], {'from': season_caller})
+
+    # Assertions
+    assert tx.return_value == ('0x' + '00' * 20, DORMANT, False)
+    assert frmregistry_contract.exists(3) == False
 
 def test_query_tokenized_farm_attached_to_a_token_id(frmregistry_contract, accounts):
     tokenize_farm(frmregistry_contract, accounts)
@@ -149,3 +390,18 @@ def test_query_tokenized_farm_attached_to_an_invalid_token_id(frmregistry_contra
     with brownie.reverts():
         frmregistry_contract.getFarm(2)
 
+
+def test_ipfs_hash_round_trip(frmregistry_contract, accounts):
+    tokenize_farm(frmregistry_contract, accounts)
+
+    farm = frmregistry_contract.getFarm(token_id)
+
+    # Assertions
+    assert farm['imageHash'] == ipfs_hash
+    assert bytes32_to_cid(farm['imageHash']) == 'QmUfideC1r5JhMVwgd8vjC7DtVnXw3QGfCSQA7fUVHK789'
+
+def test_invalid_ipfs_hash():
+
+    # Error assertions
+    with pytest.raises(ValueError):
+        cid_to_bytes32('zb2rhe5P4gXftAwvA4eXQ5HJwsER2owDyS9sKaQRRVQPn93bA')
@@ -0,0 +1,83 @@
+import pytest
+
+from scripts.delivery_batch import batch_args
+from scripts.farm_states import DORMANT, MARKETING
+from scripts.indexer import Indexer
+from scripts.ipfs import cid_to_bytes32
+
+ipfs_hash = cid_to_bytes32('QmUfideC1r5JhMVwgd8vjC7DtVnXw3QGfCSQA7fUVHK789')
+
+@pytest.fixture(scope='module')
+def scenario(scenarios, accounts):
+    yield scenarios.build(farms=2, stage=MARKETING, supply=0, token_ids=(1, 2), owners=(accounts[0], accounts[1]))
+
+@pytest.fixture
+def db_path(tmp_path):
+    yield str(tmp_path / 'index.db')
+
+@pytest.fixture
+def indexer(scenario, db_path, web3):
+    yield Indexer(web3, scenario.registry, scenario.market, db_path)
+
+def open_markets(scenario, accounts, web3):
+    _price = web3.toWei(1, 'ether')
+    scenario.market.createMarket(1, 'Tomatoe', ipfs_hash, _price, 5, "KG", {'from': accounts[0]})
+    scenario.market.createMarket(2, 'Green Banana', ipfs_hash, _price, 5, "KG", {'from': accounts[1]})
+    return _price
+
+def test_index_farms_in_marketing(scenario, indexer, accounts):
+    indexer.sync()
+    marketing = indexer.farms_in_state(MARKETING)
+    scenario.season.closeSeason(1, {'from': accounts[0]})
+    indexer.sync()
+
+    # Assertions
+    assert marketing == [(1, accounts[0]), (2, accounts[1])]
+    assert indexer.farms_in_state(MARKETING) == [(2, accounts[1])]
+    assert indexer.farms_in_state(DORMANT) == [(1, accounts[0])]
+    assert indexer.farms_of_owner(accounts[0]) == [(1, DORMANT)]
+
+def test_index_open_bookings(scenario, indexer, accounts, web3):
+    _price = open_markets(scenario, accounts, web3)
+    _fee = web3.toWei(0.0037, 'ether')
+    scenario.market.bookHarvest(1, 2, 1, {'from': accounts[2], 'value': _price * 2})
+    scenario.market.bookHarvest(2, 3, 1, {'from': accounts[2], 'value': _price * 3})
+    indexer.sync()
+    booked = indexer.open_bookings(accounts[2])
+    # A batch closes the first booking and part of the second
+    scenario.market.batchConfirmReceivership(*batch_args([(1, 1, 2, 'Fresh'), (2, 1, 1, 'Ripe')], accounts[3]), {'from': accounts[2], 'value': _fee * 2})
+    indexer.sync()
+
+    # Assertions
+    assert booked == [(1, 1, 2), (2, 1, 3)]
+    assert indexer.open_bookings(accounts[2]) == [(2, 1, 2)]
+    assert indexer.open_bookings(accounts[3]) == []
+
+def test_resume_from_checkpoint(scenario, indexer, db_path, accounts, web3):
+    _price = open_markets(scenario, accounts, web3)
+    checkpoint = indexer.sync()
+    scenario.market.bookHarvest(1, 1, 1, {'from': accounts[2], 'value': _price})
+    resumed = Indexer(web3, scenario.registry, scenario.market, db_path, chunk_size=1)
+
+    # Assertions
+    assert resumed.checkpoint() == checkpoint
+    assert resumed.sync() == web3.eth.block_number
+    assert resumed.db.execute('SELECT COUNT(*) FROM booking_events').fetchone()[0] == 1
+    assert resumed.open_bookings(accounts[2]) == [(1, 1, 1)]
+
+def test_reorg_rebuilds_read_model(scenario, indexer, accounts, web3, chain):
+    _price = open_markets(scenario, accounts, web3)
+    indexer.sync()
+    scenario.market.bookHarvest(1, 1, 1, {'from': accounts[2], 'value': _price})
+    indexer.sync()
+    booked = indexer.open_bookings(accounts[2])
+    # Replace the booking block with one holding another booking
+    chain.undo()
+    scenario.market.bookHarvest(2, 2, 1, {'from': accounts[3], 'value': _price * 2})
+    indexer.sync()
+
+    # Assertions
+    assert booked == [(1, 1, 1)]
+    assert indexer.open_bookings(accounts[2]) == []
+    assert indexer.open_bookings(accounts[3]) == [(2, 1, 2)]
+    assert indexer.db.execute('SELECT COUNT(*) FROM booking_events').fetchone()[0] == 1
@@ -1,32 +1,30 @@
 import pytest
 import brownie
 
+from scripts.delivery_batch import batch_args
+from scripts.farm_states import MARKETING
+from scripts.ipfs import cid_to_bytes32
+
+ipfs_hash = cid_to_bytes32('QmUfideC1r5JhMVwgd8vjC7DtVnXw3QGfCSQA7fUVHK789')
+
 token_id = 4863475
 token_id2 = 1089233
 
-@pytest.fixture
-def farm_contract(FRMRegistry, accounts):
-    yield FRMRegistry.deploy({'from': accounts[0]})
+@pytest.fixture(scope='module')
+def scenario(scenarios, accounts):
+    yield scenarios.build(stage=MARKETING, supply=0, token_ids=(token_id, token_id2), owners=(accounts[0], accounts[1]))
 
-@pytest.fixture
-def season_contract(Season, farm_contract, accounts):
-    yield Season.deploy(farm_contract.address, {'from': accounts[0]})
+@pytest.fixture(scope='module')
+def farm_contract(scenario):
+    yield scenario.registry
 
-@pytest.fixture
-def market_contract(farm_contract, season_contract, Market, accounts):
-    farm_contract.tokenizeLand('Arunga Vineyard', '294.32ha', 'Lyaduywa, Kenya', 'QmUfideC1r5JhMVwgd8vjC7DtVnXw3QGfCSQA7fUVHK789', 'loam soil', token_id, {'from': accounts[0]})
-    farm_contract.tokenizeLand('Matoke Farm', '4.3ha', 'Lurambi, Kenya', 'QmUfideC1r5JhMVwgd8vjC7DtVnXw3QGfCSQA7fUVHK789', 'clay soil', token_id2, {'from': accounts[1]})
-    season_contract.openSeason(token_id)
-    season_contract.openSeason(token_id2, {'from': accounts[1]})
-    season_contract.confirmPreparations(token_id, 'Tomatoe', 'Organic Fertilizer', 'Cow Shed Manure', 'QmUfideC1r5JhMVwgd8vjC7DtVnXw3QGfCSQA7fUVHK789')
-    season_contract.confirmPreparations(token_id2, 'Green Banana', 'Organic Fertilizer', 'Cow Shed Manure', 'QmUfideC1r5JhMVwgd8vjC7DtVnXw3QGfCSQA7fUVHK789', {'from': accounts[1]})
-    season_contract.confirmPlanting(token_id, 'F1', 'Kenya Seed Company', 'QmUfideC1r5JhMVwgd8vjC7DtVnXw3QGfCSQA7fUVHK789', '1200kg', 'Jobe 1960 Organic Fertilizer', 'Kenya Seed Supplier', 'QmUfideC1r5JhMVwgd8vjC7DtVnXw3QGfCSQA7fUVHK789')
-    season_contract.confirmPlanting(token_id2, 'Flore 0xlpq', 'One Acre Fund', 'QmUfideC1r5JhMVwgd8vjC7DtVnXw3QGfCSQA7fUVHK789', '120kg', 'Jobe 1960 Organic Fertilizer', 'One Acre Fund', 'QmUfideC1r5JhMVwgd8vjC7DtVnXw3QGfCSQA7fUVHK789', {'from': accounts[1]})
-    season_contract.confirmGrowth(token_id, 'Army worm', 'QmUfideC1r5JhMVwgd8vjC7DtVnXw3QGfCSQA7fUVHK789', 'Infestor x32H', 'Aphids Supplier' , 'QmUfideC1r5JhMVwgd8vjC7DtVnXw3QGfCSQA7fUVHK789')
-    season_contract.confirmGrowth(token_id2, '', '', '', '' , '', {'from': accounts[1]})
-    season_contract.confirmHarvesting(token_id, "120 KG")
-    season_contract.confirmHarvesting(token_id2, "60 KG", {'from': accounts[1]})
-    yield Market.deploy(farm_contract.address, season_contract.address, {'from': accounts[0]})
+@pytest.fixture(scope='module')
+def season_contract(scenario):
+    yield scenario.season
+
+@pytest.fixture(scope='module')
+def market_contract(scenario):
+    yield scenario.market
 
 def test_initial_state(market_contract):
 
@@ -37,8 +35,8 @@ def test_initial_state(market_contract):
 
 def test_create_market(market_contract, accounts, web3):
     _price = web3.toWei(1, 'ether')
-    market_contract.createMarket(token_id, 'Tomatoe', 'QmUfideC1r5JhMVwgd8vjC7DtVnXw3QGfCSQA7fUVHK789', _price, 3, "KG")
-    market_contract.createMarket(token_id2, 'Green Banana', 'QmUfideC1r5JhMVwgd8vjC7DtVnXw3QGfCSQA7fUVHK789', _price, 3, "KG", {'from': accounts[1]})
+    market_contract.createMarket(token_id, 'Tomatoe', ipfs_hash, _price, 3, "KG")
+    market_contract.createMarket(token_id2, 'Green Banana', ipfs_hash, _price, 3, "KG", {'from': accounts[1]})
     # Query market
     market = market_contract.getCurrentFarmMarket(token_id)
 
@@ -50,8 +48,8 @@ def test_create_market(market_contract, accounts, web3):
 
 def test_query_current_farm_market(market_contract, accounts, web3):
     _price = web3.toWei(1, 'ether')
-    market_contract.createMarket(token_id, 'Tomatoe', 'QmUfideC1r5JhMVwgd8vjC7DtVnXw3QGfCSQA7fUVHK789', _price, 3, "KG")
-    market_contract.createMarket(token_id2, 'Green Banana', 'QmUfideC1r5JhMVwgd8vjC7DtVnXw3QGfCSQA7fUVHK789', _price, 30, "KG", {'from': accounts[1]})
+    market_contract.createMarket(token_id, 'Tomatoe', ipfs_hash, _price, 3, "KG")
+    market_contract.createMarket(token_id2, 'Green Banana', ipfs_hash, _price, 30, "KG", {'from': accounts[1]})
 
     # Query current farm market
     market = market_contract.getCurrentFarmMarket(token_id2)
@@ -61,23 +59,23 @@ def test_query_current_farm_market(market_contract, accounts, web3):
 
 def test_invalid_market_create_with_existing_supply(market_contract, accounts, web3):
     _price = web3.toWei(1, 'ether')
-    market_contract.createMarket(token_id, 'tomatoe', 'QmUfideC1r5JhMVwgd8vjC7DtVnXw3QGfCSQA7fUVHK789', _price, 3, "KG")
+    market_contract.createMarket(token_id, 'tomatoe', ipfs_hash, _price, 3, "KG")
 
     # Error assertion
     with brownie.reverts('dev: exhaust previous market supply'):
-        market_contract.createMarket(token_id, 'Tomatoe', 'QmUfideC1r5JhMVwgd8vjC7DtVnXw3QGfCSQA7fUVHK789', _price, 3, "KG")
+        market_contract.createMarket(token_id, 'Tomatoe', ipfs_hash, _price, 3, "KG")
 
 def test_invalid_market_create_with_invalid_tokenized_farm(market_contract, accounts, web3):
     _price = web3.toWei(1, 'ether')
 
     # Error assertion
     with brownie.reverts('dev: invalid tokenized farm'):
-        market_contract.createMarket(3, 'Tomatoe', 'QmUfideC1r5JhMVwgd8vjC7DtVnXw3QGfCSQA7fUVHK789', _price, 3, "KG")
+        market_contract.createMarket(3, 'Tomatoe', ipfs_hash, _price, 3, "KG")
 
 def test_query_enlisted_markets(market_contract, accounts, web3):
     _price = web3.toWei(1, 'ether')
-    market_contract.createMarket(token_id, 'Tomatoe', 'QmUfideC1r5JhMVwgd8vjC7DtVnXw3QGfCSQA7fUVHK789', _price, 3, "KG")
-    market_contract.createMarket(token_id2, 'Green Banana', 'QmUfideC1r5JhMVwgd8vjC7DtVnXw3QGfCSQA7fUVHK789', _price, 30, "KG", {'from': accounts[1]})
+    market_contract.createMarket(token_id, 'Tomatoe', ipfs_hash, _price, 3, "KG")
+    market_contract.createMarket(token_id2, 'Green Banana', ipfs_hash, _price, 30, "KG", {'from': accounts[1]})
 
     # Query markets
     markets = list()
@@ -92,7 +90,7 @@ def test_query_enlisted_markets(market_contract, accounts, web3):
 
 def test_invalid_booking_with_invalid_tokenized_farm(market_contract, accounts, web3):
     _price = web3.toWei(1, 'ether')
-    market_contract.createMarket(token_id, 'Tomatoe', 'QmUfideC1r5JhMVwgd8vjC7DtVnXw3QGfCSQA7fUVHK789', _price, 3, "KG")
+    market_contract.createMarket(token_id, 'Tomatoe', ipfs_hash, _price, 3, "KG")
 
     # Book harvest
     with brownie.reverts('dev: invalid token id'):
@@ -100,15 +98,77 @@ def test_invalid_booking_with_invalid_tokenized_farm(market_contract, accounts,
 
 def test_invalid_booking_with_not_farm_owner(market_contract, accounts, web3):
     _price = web3.toWei(1, 'ether')
-    market_contract.createMarket(token_id, 'Tomatoe', 'QmUfideC1r5JhMVwgd8vjC7DtVnXw3QGfCSQA7fUVHK789', _price, 3, "KG")
+    market_contract.createMarket(token_id, 'Tomatoe', ipfs_hash, _price, 3, "KG")
 
     # Book harvest
     with brownie.reverts('dev: owner cannot book his/her harvest'):
         market_contract.bookHarvest(token_id, 2, 1, {'from': accounts[0], 'value': _price * 2})
 
+def test_market_snapshots_owner_and_harvest(market_contract, season_contract, accounts, web3):
+    _price = web3.toWei(1, 'ether')
+    market_contract.createMarket(token_id, 'Tomatoe', ipfs_hash, _price, 3, "KG")
+    market_contract.bookHarvest(token_id, 1, 1, {'from': accounts[2], 'value': _price})
+    market = market_contract.getCurrentFarmMarket(token_id)
+
+    # Assertions
+    assert market['owner'] == accounts[0]
+    assert market['harvestId'] == season_contract.hashedSeason(token_id, 1)
+    assert market_contract.getBookerBooking(market_contract.getSeasonBooked(1, accounts[2]), accounts[2])['harvestId'] == market['harvestId']
+
+def test_booking_follows_farm_transfer(market_contract, farm_contract, accounts, web3):
+    _price = web3.toWei(1, 'ether')
+    market_contract.createMarket(token_id, 'Tomatoe', ipfs_hash, _price, 3, "KG")
+    farm_contract.transferFrom(accounts[0], accounts[3], token_id)
+
+    # Assertions
+    assert market_contract.getCurrentFarmMarket(token_id)['owner'] == accounts[3]
+    with brownie.reverts('dev: owner cannot book his/her harvest'):
+        market_contract.bookHarvest(token_id, 1, 1, {'from': accounts[3], 'value': _price})
+    market_contract.bookHarvest(token_id, 1, 1, {'from': accounts[0], 'value': _price})
+    assert market_contract.getCurrentFarmMarket(token_id)['remainingSupply'] == 2
+
+def test_invalid_booking_after_farm_burn(market_contract, farm_contract, accounts, web3):
+    _price = web3.toWei(1, 'ether')
+    market_contract.createMarket(token_id, 'Tomatoe', ipfs_hash, _price, 3, "KG")
+    farm_contract.burn(token_id)
+
+    # Book harvest
+    with brownie.reverts('dev: invalid token id'):
+        market_contract.bookHarvest(token_id, 1, 1, {'from': accounts[2], 'value': _price})
+
+def test_confirm_booking_on_reminted_farm(market_contract, farm_contract, accounts, web3):
+    _price = web3.toWei(1, 'ether')
+    _fee = web3.toWei(0.0037, 'ether')
+    market_contract.createMarket(token_id, 'Tomatoe', ipfs_hash, _price, 3, "KG")
+    market_contract.bookHarvest(token_id, 2, 1, {'from': accounts[2], 'value': _price * 2})
+    farm_contract.burn(token_id)
+    with brownie.reverts('dev: invalid token id'):
+        market_contract.confirmReceivership(token_id, 1, 1, accounts[3], '', {'from': accounts[2], 'value': _fee})
+    farm_contract.tokenizeLand('Arunga Vineyard', '294.32ha', 'Lyaduywa, Kenya', ipfs_hash, 'loam soil', token_id, {'from': accounts[5]})
+    market_contract.confirmReceivership(token_id, 1, 1, accounts[3], '', {'from': accounts[2], 'value': _fee})
+
+    # Assertions
+    assert market_contract.getCurrentFarmMarket(token_id)['owner'] == accounts[5]
+    assert market_contract.accountDues(accounts[5]) == _price - _fee
+    assert market_contract.accountDues(accounts[0]) == 0
+    assert market_contract.accountDues('0x' + '00' * 20) == 0
+
+def test_invalid_booking_for_season_not_on_market(market_contract, accounts, web3):
+    _price = web3.toWei(1, 'ether')
+    market_contract.createMarket(token_id, 'Tomatoe', ipfs_hash, _price, 3, "KG")
+
+    # Book harvest
+    with brownie.reverts('dev: season not on market'):
+        market_contract.bookHarvest(token_id, 1, 2, {'from': accounts[2], 'value': _price})
+
+def test_invalid_owner_sync_from_non_registry(market_contract, accounts):
+    # Assertions
+    with brownie.reverts('dev: only registry'):
+        market_contract.syncOwner(token_id, accounts[2], {'from': accounts[0]})
+
 def test_invalid_booking_with_insufficient_funds(market_contract, accounts, web3):
     _price = web3.toWei(0, 'ether')
-    market_contract.createMarket(token_id, 'Tomatoe', 'QmUfideC1r5JhMVwgd8vjC7DtVnXw3QGfCSQA7fUVHK789', _price, 3, "KG")
+    market_contract.createMarket(token_id, 'Tomatoe', ipfs_hash, _price, 3, "KG")
 
     # Book harvest
     with brownie.reverts('dev: booking funds cannot be 0'):
@@ -116,7 +176,7 @@ def test_invalid_booking_with_insufficient_funds(market_contract, accounts, web3
 
 def test_invalid_booking_with_excess_booking_funds(market_contract, accounts, web3):
     _price = web3.toWei(2, 'ether')
-    market_contract.createMarket(token_id, 'Tomatoe', 'QmUfideC1r5JhMVwgd8vjC7DtVnXw3QGfCSQA7fUVHK789', _price, 3, "KG")
+    market_contract.createMarket(token_id, 'Tomatoe', ipfs_hash, _price, 3, "KG")
 
     # Book harvest
     with brownie.reverts('dev: insufficient booking funds'):
@@ -124,7 +184,7 @@ def test_invalid_booking_with_excess_booking_funds(market_contract, accounts, we
 
 def test_invalid_booking_with_insufficient_booking_fee(market_contract, accounts, web3):
     _price = web3.toWei(1, 'ether')
-    market_contract.createMarket(token_id, 'Tomatoe', 'QmUfideC1r5JhMVwgd8vjC7DtVnXw3QGfCSQA7fUVHK789', _price, 3, "KG")
+    market_contract.createMarket(token_id, 'Tomatoe', ipfs_hash, _price, 3, "KG")
 
     # Book harvest
     with brownie.reverts('dev: insufficient booking funds'):
@@ -132,7 +192,7 @@ def test_invalid_booking_with_insufficient_booking_fee(market_contract, accounts
 
 def test_book_harvest(market_contract, season_contract, accounts, web3):
     _price = web3.toWei(1, 'ether')
-    market_contract.createMarket(token_id, 'Tomatoe', 'QmUfideC1r5JhMVwgd8vjC7DtVnXw3QGfCSQA7fUVHK789', _price, 3, "KG")
+    market_contract.createMarket(token_id, 'Tomatoe', ipfs_hash, _price, 3, "KG")
 
     # Book harvest
     _bookingFee = web3.toWei(1, 'ether')
@@ -142,11 +202,11 @@ def test_book_harvest(market_contract, season_contract, accounts, web3):
     market_contract.bookHarvest(token_id, volume, 1, {'from': accounts[2], 'value': _bookingFee * volume})
     season_contract.closeSeason(token_id)
     season_contract.openSeason(token_id)
-    season_contract.confirmPreparations(token_id, 'Avocado', 'Organic Fertilizer', 'Cow Shed Manure', 'QmUfideC1r5JhMVwgd8vjC7DtVnXw3QGfCSQA7fUVHK789')
-    season_contract.confirmPlanting(token_id, 'F1', 'Kenya Seed Company', 'QmUfideC1r5JhMVwgd8vjC7DtVnXw3QGfCSQA7fUVHK789', '1200kg', 'Jobe 1960 Organic Fertilizer', 'Kenya Seed Supplier', 'QmUfideC1r5JhMVwgd8vjC7DtVnXw3QGfCSQA7fUVHK789')
-    season_contract.confirmGrowth(token_id, 'Army worm', 'QmUfideC1r5JhMVwgd8vjC7DtVnXw3QGfCSQA7fUVHK789', 'Infestor x32H', 'Aphids Supplier' , 'QmUfideC1r5JhMVwgd8vjC7DtVnXw3QGfCSQA7fUVHK789')
+    season_contract.confirmPreparations(token_id, 'Avocado', 'Organic Fertilizer', 'Cow Shed Manure', ipfs_hash)
+    season_contract.confirmPlanting(token_id, 'F1', 'Kenya Seed Company', ipfs_hash, '1200kg', 'Jobe 1960 Organic Fertilizer', 'Kenya Seed Supplier', ipfs_hash)
+    season_contract.confirmGrowth(token_id, 'Army worm', ipfs_hash, 'Infestor x32H', 'Aphids Supplier' , ipfs_hash)
     season_contract.confirmHarvesting(token_id, "120 KG")
-    market_contract.createMarket(token_id, 'Avocado', 'QmUfideC1r5JhMVwgd8vjC7DtVnXw3QGfCSQA7fUVHK789', _price, 3, "KG")
+    market_contract.createMarket(token_id, 'Avocado', ipfs_hash, _price, 3, "KG")
     market_contract.bookHarvest(token_id, volume, 2, {'from': accounts[2], 'value': _bookingFee * volume})
     market_contract.bookHarvest(token_id, volume, 2, {'from': accounts[2], 'value': _bookingFee * volume})
     market_contract.bookHarvest(token_id, volume, 2, {'from': accounts[2], 'value': _bookingFee * volume})
@@ -177,9 +237,44 @@ def test_book_harvest(market_contract, season_contract, accounts, web3):
     assert market_booking_list[0]['volume'] == 3
     assert market_booking_list[0]['deposit'] == web3.toWei(3, 'ether')
 
+def test_book_harvest_with_many_bookers(market_contract, accounts, web3):
+    _price = web3.toWei(1, 'ether')
+    market_contract.createMarket(token_id, 'Tomatoe', ipfs_hash, _price, 5, "KG")
+
+    # Book harvest
+    market_contract.bookHarvest(token_id, 1, 1, {'from': accounts[2], 'value': _price})
+    market_contract.bookHarvest(token_id, 2, 1, {'from': accounts[3], 'value': _price * 2})
+    market_contract.bookHarvest(token_id, 1, 1, {'from': accounts[2], 'value': _price})
+
+    # Get market bookings
+    market_booking_list = list()
+    for i in range(1, market_contract.totalMarketBookers(token_id)+1):
+        market_booking_list.append(market_contract.getMarketBooking(token_id, i))
+
+    # Assertions
+    assert len(market_booking_list) == 2
+    assert market_booking_list[0]['booker'] == accounts[2]
+    assert market_booking_list[0]['volume'] == 2
+    assert market_booking_list[1]['booker'] == accounts[3]
+    assert market_booking_list[1]['volume'] == 2
+    assert market_booking_list[1]['deposit'] == web3.toWei(2, 'ether')
+
+def test_market_booking_reflects_delivery(market_contract, accounts, web3):
+    _price = web3.toWei(1, 'ether')
+    market_contract.createMarket(token_id, 'Tomatoe', ipfs_hash, _price, 3, "KG")
+    market_contract.bookHarvest(token_id, 3, 1, {'from': accounts[1], 'value': _price * 3})
+
+    # Confirm receivership
+    market_contract.confirmReceivership(token_id, 3, 1, accounts[2], 'Fresh tomatoes', {'from': accounts[1], 'value': web3.toWei(0.0037, 'ether')})
+    market_booking = market_contract.getMarketBooking(token_id, 1)
+
+    # Assertions
+    assert market_booking['delivered'] == True
+    assert market_booking['volume'] == 0
+
 def test_query_previous_markets_for_farm(market_contract, accounts, web3):
     _price = web3.toWei(1, 'ether')
-    market_contract.createMarket(token_id, 'Tomatoe', 'QmUfideC1r5JhMVwgd8vjC7DtVnXw3QGfCSQA7fUVHK789', _price, 3, "KG")
+    market_contract.createMarket(token_id, 'Tomatoe', ipfs_hash, _price, 3, "KG")
 
     # Book harvest
     booking_fee = web3.toWei(1, 'ether')
@@ -195,10 +290,15 @@ def test_query_previous_markets_for_farm(market_contract, accounts, web3):
     assert previous_markets[0]['originalSupply'] == 3
     assert previous_markets[0]['remainingSupply'] == 0
     assert previous_markets[0]['bookers'] == 1
+    assert previous_markets[0]['tokenId'] == token_id
+    assert previous_markets[0]['season'] == 1
+    assert previous_markets[0]['price'] == _price
+    assert previous_markets[0]['openDate'] > 0
+    assert previous_markets[0]['closeDate'] >= previous_markets[0]['openDate']
 
 def test_receive_confirmation_with_invalid_tokenized_farm(market_contract, accounts, web3):
     _price = web3.toWei(1, 'ether')
-    market_contract.createMarket(token_id, 'Tomatoe', 'QmUfideC1r5JhMVwgd8vjC7DtVnXw3QGfCSQA7fUVHK789', _price, 3, "KG")
+    market_contract.createMarket(token_id, 'Tomatoe', ipfs_hash, _price, 3, "KG")
 
     # Book harvest
     booking_fee = web3.toWei(1, 'ether')
@@ -206,11 +306,11 @@ def test_receive_confirmation_with_invalid_tokenized_farm(market_contract, accou
 
     # Error assertion
     with brownie.reverts('dev: invalid token id'):
-        market_contract.confirmReceivership(77777777, 3, 1, accounts[0], accounts[2], 'Rotten tomatoes', {'from': accounts[1], 'value': web3.toWei(0.003, 'ether')})
+        market_contract.confirmReceivership(77777777, 3, 1, accounts[2], 'Rotten tomatoes', {'from': accounts[1], 'value': web3.toWei(0.003, 'ether')})
 
 def test_receive_confirmation_with_invalid_booker(market_contract, accounts, web3):
     _price = web3.toWei(1, 'ether')
-    market_contract.createMarket(token_id, 'Tomatoe', 'QmUfideC1r5JhMVwgd8vjC7DtVnXw3QGfCSQA7fUVHK789', _price, 3, "KG")
+    market_contract.createMarket(token_id, 'Tomatoe', ipfs_hash, _price, 3, "KG")
 
     # Book harvest
     booking_fee = web3.toWei(1, 'ether')
@@ -218,11 +318,11 @@ def test_receive_confirmation_with_invalid_booker(market_contract, accounts, web
 
     # Error assertion
     with brownie.reverts('dev: no bookings'):
-        market_contract.confirmReceivership(token_id, 1, 1, accounts[0], accounts[2], 'Rotten tomatoes')
+        market_contract.confirmReceivership(token_id, 1, 1, accounts[2], 'Rotten tomatoes')
 
 def test_receive_confirmation_with_invalid_booking_volume(market_contract, accounts, web3):
     _price = web3.toWei(1, 'ether')
-    market_contract.createMarket(token_id, 'Tomatoe', 'QmUfideC1r5JhMVwgd8vjC7DtVnXw3QGfCSQA7fUVHK789', _price, 3, "KG")
+    market_contract.createMarket(token_id, 'Tomatoe', ipfs_hash, _price, 3, "KG")
 
     # Book harvest
     booking_fee = web3.toWei(1, 'ether')
@@ -230,11 +330,11 @@ def test_receive_confirmation_with_invalid_booking_volume(market_contract, accou
 
     # Error assertion
     with brownie.reverts('dev: volume out of range'):
-        market_contract.confirmReceivership(token_id, 4, 1, accounts[0], accounts[2], 'Rotten tomatoes', {'from': accounts[1], 'value': web3.toWei(0.003, 'ether')})
+        market_contract.confirmReceivership(token_id, 4, 1, accounts[2], 'Rotten tomatoes', {'from': accounts[1], 'value': web3.toWei(0.003, 'ether')})
 
 def test_receive_confirmation_with_zero_booking_volume(market_contract, accounts, web3):
     _price = web3.toWei(1, 'ether')
-    market_contract.createMarket(token_id, 'Tomatoe', 'QmUfideC1r5JhMVwgd8vjC7DtVnXw3QGfCSQA7fUVHK789', _price, 3, "KG")
+    market_contract.createMarket(token_id, 'Tomatoe', ipfs_hash, _price, 3, "KG")
 
     # Book harvest
     booking_fee = web3.toWei(1, 'ether')
@@ -242,11 +342,11 @@ def test_receive_confirmation_with_zero_booking_volume(market_contract, accounts
 
     # Error assertion
     with brownie.reverts('dev: volume cannot be 0'):
-        market_contract.confirmReceivership(token_id, 0, 1, accounts[0], accounts[2], 'Rotten tomatoes', {'from': accounts[1], 'value': web3.toWei(0.003, 'ether')})
+        market_contract.confirmReceivership(token_id, 0, 1, accounts[2], 'Rotten tomatoes', {'from': accounts[1], 'value': web3.toWei(0.003, 'ether')})
 
 def test_receive_confirmation_with_insufficient_booking_fee(market_contract, accounts, web3):
     _price = web3.toWei(1, 'ether')
-    market_contract.createMarket(token_id, 'Tomatoe', 'QmUfideC1r5JhMVwgd8vjC7DtVnXw3QGfCSQA7fUVHK789', _price, 3, "KG")
+    market_contract.createMarket(token_id, 'Tomatoe', ipfs_hash, _price, 3, "KG")
 
     # Book harvest
     booking_fee = web3.toWei(1, 'ether')
@@ -254,11 +354,11 @@ def test_receive_confirmation_with_insufficient_booking_fee(market_contract, acc
 
     # Error assertion
     with brownie.reverts('dev: insufficient confirmation fee'):
-        market_contract.confirmReceivership(token_id, 2, 1, accounts[0], accounts[2], 'Rotten tomatoes', {'from': accounts[1], 'value': web3.toWei(0.002, 'ether')})
+        market_contract.confirmReceivership(token_id, 2, 1, accounts[2], 'Rotten tomatoes', {'from': accounts[1], 'value': web3.toWei(0.002, 'ether')})
 
 def test_receive_confirmation(market_contract, accounts, web3):
     _price = web3.toWei(1, 'ether')
-    market_contract.createMarket(token_id, 'Tomatoe', 'QmUfideC1r5JhMVwgd8vjC7DtVnXw3QGfCSQA7fUVHK789', _price, 3, "KG")
+    market_contract.createMarket(token_id, 'Tomatoe', ipfs_hash, _price, 3, "KG")
     prev_balance = accounts[2].balance()
     prev_owner_balance = accounts[0].balance()
 
@@ -267,13 +367,23 @@ def test_receive_confirmation(market_contract, accounts, web3):
     market_contract.bookHarvest(token_id, 3, 1, {'from': accounts[1], 'value': booking_fee * 3})
 
     # Confirm receivership
-    market_contract.confirmReceivership(token_id, 1, 1, accounts[0], accounts[2], 'Rotten tomatoes', {'from': accounts[1], 'value': web3.toWei(0.0037, 'ether')})
+    market_contract.confirmReceivership(token_id, 1, 1, accounts[2], 'Rotten tomatoes', {'from': accounts[1], 'value': web3.toWei(0.0037, 'ether')})
+
+    # Assertions
+    assert market_contract.accountDues(accounts[0]) == web3.toWei(1, 'ether') - web3.toWei(0.0037, 'ether')
+    assert market_contract.accountDues(accounts[2]) == web3.toWei(0.0037, 'ether')
+    assert prev_owner_balance == accounts[0].balance()
+
+    # Withdraw dues
+    market_contract.withdraw({'from': accounts[0]})
+    market_contract.withdraw({'from': accounts[2]})
 
     # Assertions
     new_balance = prev_balance + web3.toWei(0.0037, 'ether')
     new_owner_balance = prev_owner_balance + (web3.toWei(1, 'ether') - web3.toWei(0.0037, 'ether'))
     assert new_owner_balance == accounts[0].balance()
     assert new_balance  == accounts[2].balance()
+    assert market_contract.accountDues(accounts[0]) == 0
     assert market_contract.accountDeliverables(accounts[1]) == 1
     assert market_contract.farmDeliverables(token_id) == 1
     sealed_tx = booking_fee - web3.toWei(0.0037, 'ether')
@@ -281,7 +391,7 @@ def test_receive_confirmation(market_contract, accounts, web3):
 
 def test_get_review_for_invalid_tokenized_farm_market(market_contract, accounts, web3):
     _price = web3.toWei(1, 'ether')
-    market_contract.createMarket(token_id, 'Tomatoe', 'QmUfideC1r5JhMVwgd8vjC7DtVnXw3QGfCSQA7fUVHK789', _price, 3, "KG")
+    market_contract.createMarket(token_id, 'Tomatoe', ipfs_hash, _price, 3, "KG")
     prev_balance = accounts[2].balance()
     prev_owner_balance = accounts[0].balance()
 
@@ -290,7 +400,7 @@ def test_get_review_for_invalid_tokenized_farm_market(market_contract, accounts,
     market_contract.bookHarvest(token_id, 3, 1, {'from': accounts[1], 'value': booking_fee * 3})
 
     # Confirm receivership
-    market_contract.confirmReceivership(token_id, 1, 1, accounts[0], accounts[2], 'Rotten tomatoes', {'from': accounts[1], 'value': web3.toWei(0.0037, 'ether')})   
+    market_contract.confirmReceivership(token_id, 1, 1, accounts[2], 'Rotten tomatoes', {'from': accounts[1], 'value': web3.toWei(0.0037, 'ether')})   
 
     # Error assertion
     with brownie.reverts('dev: invalid token id'):
@@ -298,7 +408,7 @@ def test_get_review_for_invalid_tokenized_farm_market(market_contract, accounts,
 
 def test_get_market_review(market_contract, accounts, web3):
     _price = web3.toWei(1, 'ether')
-    market_contract.createMarket(token_id, 'Tomatoe', 'QmUfideC1r5JhMVwgd8vjC7DtVnXw3QGfCSQA7fUVHK789', _price, 3, "KG")
+    market_contract.createMarket(token_id, 'Tomatoe', ipfs_hash, _price, 3, "KG")
     prev_balance = accounts[2].balance()
     prev_owner_balance = accounts[0].balance()
 
@@ -307,7 +417,7 @@ def test_get_market_review(market_contract, accounts, web3):
     market_contract.bookHarvest(token_id, 3, 1, {'from': accounts[1], 'value': booking_fee * 3})
 
     # Confirm receivership
-    market_contract.confirmReceivership(token_id, 1, 1, accounts[0], accounts[2], 'Rotten tomatoes', {'from': accounts[1], 'value': web3.toWei(0.0037, 'ether')})
+    market_contract.confirmReceivership(token_id, 1, 1, accounts[2], 'Rotten tomatoes', {'from': accounts[1], 'value': web3.toWei(0.0037, 'ether')})
 
     # Get reviews for this market
     reviews = market_contract.marketReviewCount(token_id)
@@ -317,7 +427,7 @@ def test_get_market_review(market_contract, accounts, web3):
 
 def test_get_market_review_after_total_booking_volume_confirmation(market_contract, accounts, web3):
     _price = web3.toWei(1, 'ether')
-    market_contract.createMarket(token_id, 'Tomatoe', 'QmUfideC1r5JhMVwgd8vjC7DtVnXw3QGfCSQA7fUVHK789', _price, 3, "KG")
+    market_contract.createMarket(token_id, 'Tomatoe', ipfs_hash, _price, 3, "KG")
     prev_balance = accounts[2].balance()
     prev_owner_balance = accounts[0].balance()
 
@@ -326,7 +436,7 @@ def test_get_market_review_after_total_booking_volume_confirmation(market_contra
     market_contract.bookHarvest(token_id, 3, 1, {'from': accounts[1], 'value': booking_fee * 3})
 
     # Confirm receivership
-    market_contract.confirmReceivership(token_id, 3, 1, accounts[0], accounts[2], 'Rotten tomatoes', {'from': accounts[1], 'value': web3.toWei(0.0037, 'ether')})
+    market_contract.confirmReceivership(token_id, 3, 1, accounts[2], 'Rotten tomatoes', {'from': accounts[1], 'value': web3.toWei(0.0037, 'ether')})
 
     # Get reviews for this market
     reviews = market_contract.marketReviewCount(token_id)
@@ -338,3 +448,146 @@ def test_get_market_review_after_total_booking_volume_confirmation(market_contra
     assert len(allReviews) == 1
     assert allReviews[0][1] == 'Rotten tomatoes'
 
+
+def batch(values, fill=0):
+    return list(values) + [fill] * (20 - len(values))
+
+def test_batch_confirm_receivership(market_contract, accounts, web3):
+    _price = web3.toWei(1, 'ether')
+    _fee = web3.toWei(0.0037, 'ether')
+    market_contract.createMarket(token_id, 'Tomatoe', ipfs_hash, _price, 3, "KG")
+    market_contract.createMarket(token_id2, 'Green Banana', ipfs_hash, _price, 3, "KG", {'from': accounts[1]})
+    market_contract.bookHarvest(token_id, 3, 1, {'from': accounts[2], 'value': _price * 3})
+    market_contract.bookHarvest(token_id2, 2, 1, {'from': accounts[2], 'value': _price * 2})
+    prev_owner_balance = accounts[0].balance()
+    prev_owner2_balance = accounts[1].balance()
+    prev_provider_balance = accounts[3].balance()
+
+    # Confirm receivership
+    tx = market_contract.batchConfirmReceivership(*batch_args([
+        (token_id, 1, 1, 'Crisp'),
+        (token_id, 1, 1, 'Still crisp'),
+        (token_id2, 1, 2, 'Ripe bananas'),
+        (token_id, 1, 1, 'Fresh tomatoes')
+    ], accounts[3]), {'from': accounts[2], 'value': _fee * 4})
+    dues = market_contract.batchAccountDues(batch([accounts[0], accounts[1], accounts[3]], '0x' + '00' * 20))
+    for account in (accounts[0], accounts[1], accounts[3]):
+        market_contract.withdraw({'from': account})
+
+    # Assertions
+    assert list(dues[:3]) == [(_price - _fee) * 3, _price * 2 - _fee, _fee * 4]
+    assert accounts[0].balance() == prev_owner_balance + (_price - _fee) * 3
+    assert accounts[1].balance() == prev_owner2_balance + _price * 2 - _fee
+    assert accounts[3].balance() == prev_provider_balance + _fee * 4
+    assert market_contract.accountDeliverables(accounts[2]) == 4
+    assert market_contract.farmDeliverables(token_id) == 3
+    assert market_contract.farmDeliverables(token_id2) == 1
+    assert market_contract.platformTransactions() == _price * 5 - _fee * 4
+    assert market_contract.marketReviewCount(token_id) == 1
+    assert market_contract.marketReviewCount(token_id2) == 1
+    assert market_contract.getReviewForMarket(token_id, 1)['comment'] == 'Fresh tomatoes'
+    assert market_contract.getReviewForMarket(token_id2, 1)['comment'] == 'Ripe bananas'
+    confirmations = [event for event in tx.events if event.name == 'Confirmation']
+    assert [(event['_tokenId'], event['_delivered']) for event in confirmations] == [(token_id, False), (token_id, False), (token_id2, True), (token_id, True)]
+    assert confirmations[-1]['_txVolume'] == market_contract.platformTransactions()
+    assert tx.events['BatchConfirmation']['_deliveries'] == 4
+
+def test_batch_confirm_receivership_matches_single_confirmations(market_contract, accounts, web3):
+    _price = web3.toWei(1, 'ether')
+    _fee = web3.toWei(0.0037, 'ether')
+    market_contract.createMarket(token_id, 'Tomatoe', ipfs_hash, _price, 3, "KG")
+    market_contract.bookHarvest(token_id, 3, 1, {'from': accounts[2], 'value': _price * 3})
+    single = market_contract.confirmReceivership(token_id, 1, 1, accounts[3], '', {'from': accounts[2], 'value': _fee})
+    batched = market_contract.batchConfirmReceivership(*batch_args([(token_id, 1, 1, '')], accounts[3]), {'from': accounts[2], 'value': _fee})
+
+    # Assertions
+    assert batched.events['Confirmation']['_txVolume'] == single.events['Confirmation']['_txVolume'] * 2
+    assert batched.events['Confirmation']['_bookerTxVolume'] == single.events['Confirmation']['_bookerTxVolume'] * 2
+    assert batched.events['Confirmation']['_newBookerVolume'] == 1
+
+def test_batch_confirm_receivership_with_long_review(market_contract, accounts, web3):
+    _price = web3.toWei(1, 'ether')
+    _fee = web3.toWei(0.0037, 'ether')
+    market_contract.createMarket(token_id, 'Tomatoe', ipfs_hash, _price, 3, "KG")
+    market_contract.bookHarvest(token_id, 3, 1, {'from': accounts[2], 'value': _price * 3})
+    args = list(batch_args([(token_id, 1, 3, '')], accounts[3]))
+    args[4] = batch([101])
+
+    # Error assertions
+    with pytest.raises(ValueError):
+        batch_args([(token_id, 1, 1, 'x' * 101)], accounts[3])
+    with brownie.reverts():
+        market_contract.batchConfirmReceivership(*args, {'from': accounts[2], 'value': _fee})
+
+def test_batch_confirm_receivership_with_insufficient_fee(market_contract, accounts, web3):
+    _price = web3.toWei(1, 'ether')
+    market_contract.createMarket(token_id, 'Tomatoe', ipfs_hash, _price, 3, "KG")
+    market_contract.bookHarvest(token_id, 3, 1, {'from': accounts[2], 'value': _price * 3})
+
+    # Error assertion
+    with brownie.reverts('dev: insufficient confirmation fee'):
+        market_contract.batchConfirmReceivership(*batch_args([(token_id, 1, 1, '')] * 2, accounts[3]), {'from': accounts[2], 'value': web3.toWei(0.0037, 'ether')})
+
+def test_batch_confirm_receivership_gas_per_delivery(market_contract, accounts, web3):
+    _price = web3.toWei(0.01, 'ether')
+    _fee = web3.toWei(0.0037, 'ether')
+    market_contract.createMarket(token_id, 'Tomatoe', ipfs_hash, _price, 20, "KG")
+    market_contract.bookHarvest(token_id, 20, 1, {'from': accounts[2], 'value': _price * 20})
+
+    # Confirm growing batches of single unit deliveries
+    gas_per_delivery = list()
+    for size in (1, 4, 10):
+        tx = market_contract.batchConfirmReceivership(*batch_args([(token_id, 1, 1, '')] * size, accounts[3]), {'from': accounts[2], 'value': _fee * size})
+        gas_per_delivery.append(tx.gas_used / size)
+
+    # Assertions
+    assert gas_per_delivery[0] > gas_per_delivery[1] > gas_per_delivery[2]
+
+def test_withdraw_without_dues(market_contract, accounts):
+
+    # Error assertion
+    with brownie.reverts('dev: nothing to withdraw'):
+        market_contract.withdraw({'from': accounts[4]})
+
+# Account contract spending more than the 2300 gas stipend on receipt, like a multisig
+RECEIVER_SOURCE = '''
+# @version ^0.2.0
+
+received: public(uint256)
+
+@external
+@payable
+def __default__():
+  self.received += msg.value
+
+@external
+def withdraw(_market: address):
+  raw_call(_market, method_id("withdraw()"))
+'''
+
+def test_withdraw_to_contract_account(market_contract, accounts, web3):
+    _price = web3.toWei(1, 'ether')
+    _fee = web3.toWei(0.0037, 'ether')
+    receiver = brownie.compile_source(RECEIVER_SOURCE).Vyper.deploy({'from': accounts[0]})
+    market_contract.createMarket(token_id, 'Tomatoe', ipfs_hash, _price, 3, "KG")
+    market_contract.bookHarvest(token_id, 1, 1, {'from': accounts[2], 'value': _price})
+    market_contract.confirmReceivership(token_id, 1, 1, receiver, '', {'from': accounts[2], 'value': _fee})
+    receiver.withdraw(market_contract, {'from': accounts[0]})
+
+    # Assertions
+    assert receiver.received() == _fee
+    assert market_contract.accountDues(receiver) == 0
+
+def test_dues_follow_farm_transfer(farm_contract, market_contract, accounts, web3):
+    _price = web3.toWei(1, 'ether')
+    _fee = web3.toWei(0.0037, 'ether')
+    market_contract.createMarket(token_id, 'Tomatoe', ipfs_hash, _price, 3, "KG")
+    market_contract.bookHarvest(token_id, 2, 1, {'from': accounts[2], 'value': _price * 2})
+    farm_contract.transferFrom(accounts[0], accounts[5], token_id, {'from': accounts[0]})
+    market_contract.confirmReceivership(token_id, 1, 1, accounts[3], '', {'from': accounts[2], 'value': _fee})
+    market_contract.batchConfirmReceivership(*batch_args([(token_id, 1, 1, '')], accounts[3]), {'from': accounts[2], 'value': _fee})
+
+    # Assertions
+    assert market_contract.accountDues(accounts[0]) == 0
+    assert market_contract.accountDues(accounts[5]) == (_price - _fee) * 2
+    assert market_contract.accountDues(accounts[2]) == 0
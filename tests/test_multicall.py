@@ -0,0 +1,105 @@
+import pytest
+import brownie
+
+from scripts.farm_states import MARKETING
+from scripts.ipfs import cid_to_bytes32
+from scripts.multicall import BatchReader, market_page
+
+ipfs_hash = cid_to_bytes32('QmUfideC1r5JhMVwgd8vjC7DtVnXw3QGfCSQA7fUVHK789')
+
+token_id = 4863475
+
+WORDS_SOURCE = '''
+# @version ^0.2.0
+
+@external
+@view
+def words() -> uint256[32]:
+  return empty(uint256[32])
+
+@external
+@view
+def moreWords() -> uint256[33]:
+  return empty(uint256[33])
+'''
+
+@pytest.fixture(scope='module')
+def scenario(scenarios, accounts):
+    yield scenarios.build(stage=MARKETING, supply=0, token_ids=(token_id,), owners=(accounts[0],))
+
+@pytest.fixture(scope='module')
+def farm_contract(scenario):
+    yield scenario.registry
+
+@pytest.fixture(scope='module')
+def season_contract(scenario):
+    yield scenario.season
+
+@pytest.fixture(scope='module')
+def market_contract(scenario):
+    yield scenario.market
+
+@pytest.fixture(scope='module')
+def reader(Multicall, accounts):
+    yield BatchReader(Multicall.deploy({'from': accounts[0]}))
+
+def test_batch_read_across_contracts(farm_contract, season_contract, market_contract, reader):
+    reader.add(farm_contract, 'getFarm', token_id)
+    reader.add(farm_contract, 'totalSupply')
+    reader.add(season_contract, 'getSeason', token_id)
+    reader.add(market_contract, 'totalMarkets')
+    farm, supply, state, markets = reader.execute()
+
+    # Assertions
+    assert farm == farm_contract.getFarm(token_id)
+    assert supply == 1
+    assert state == season_contract.getSeason(token_id)
+    assert markets == 0
+
+def test_market_page(market_contract, reader, accounts, web3):
+    _price = web3.toWei(1, 'ether')
+    _fee = web3.toWei(0.0037, 'ether')
+    market_contract.createMarket(token_id, 'Tomatoe', ipfs_hash, _price, 30, "KG")
+    for i in range(2, 7):
+        market_contract.bookHarvest(token_id, 2, 1, {'from': accounts[i], 'value': _price * 2})
+    for i in range(2, 5):
+        market_contract.confirmReceivership(token_id, 2, 1, accounts[8], 'Fresh produce %d' % i, {'from': accounts[i], 'value': _fee})
+    page = market_page(reader, market_contract, token_id)
+
+    # Assertions
+    assert page['market'] == market_contract.getCurrentFarmMarket(token_id)
+    assert page['bookings'] == [market_contract.getMarketBooking(token_id, i) for i in range(1, 6)]
+    assert page['reviews'] == [market_contract.getReviewForMarket(token_id, i) for i in range(1, 4)]
+    assert page['deliveries'] == 3
+
+def test_batch_read_over_many_calls(farm_contract, reader):
+    for _ in range(45):
+        reader.add(farm_contract, 'getFarm', token_id)
+    farms = reader.execute()
+
+    # Assertions
+    assert len(farms) == 45
+    assert farms[-1]['name'] == 'Arunga Vineyard'
+
+def test_batch_read_with_reverting_call(market_contract, reader):
+    reader.add(market_contract, 'farmDeliverables', 3)
+
+    # Error assertion
+    with brownie.reverts():
+        reader.execute()
+
+def test_batch_read_at_return_size_limit(reader, accounts):
+    words = brownie.compile_source(WORDS_SOURCE).Vyper.deploy({'from': accounts[0]})
+    reader.add(words, 'words')
+    result, = reader.execute()
+
+    # Assertions
+    assert list(result) == [0] * 32
+
+def test_batch_read_over_return_size_limit(reader, accounts):
+    words = brownie.compile_source(WORDS_SOURCE).Vyper.deploy({'from': accounts[0]})
+    reader.add(words, 'moreWords')
+
+    # Error assertion
+    with brownie.reverts('dev: return data too large'):
+        reader.execute()
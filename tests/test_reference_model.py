@@ -0,0 +1,98 @@
+import json
+
+import pytest
+
+from scripts.farm_states import MARKETING
+from scripts.reference_model import GAS_BENCHMARKS, GAS_COSTS, MARKET_FEE, PRICE, ChainReplay, ReferenceModel, Revert, Workload, load_gas_costs, replay, state_diff
+
+@pytest.fixture(scope='module')
+def chain(scenarios):
+    yield ChainReplay(*scenarios.deploy())
+
+def workload(accounts, bookings, **kwargs):
+    return Workload(accounts[:2], accounts[2:5], accounts[5], farms=3, bookings=bookings, supply=(2, 4), volume=(1, 2), **kwargs)
+
+def test_model_matches_contracts(chain, accounts):
+    model = ReferenceModel()
+    reverted = replay(model, chain, workload(accounts, 12, seed=1, transfer_rate=0.05, invalid_rate=0.1))
+
+    # Assertions
+    assert reverted > 0
+    assert state_diff(model, chain, accounts[:6]) == []
+
+def test_model_matches_contracts_after_burn(chain, accounts):
+    model = ReferenceModel()
+    replay(model, chain, workload(accounts, 6, seed=2))
+    replay(model, chain, [
+        ('set_approval_for_all', accounts[0], (accounts[6], True)),
+        ('burn', accounts[6], (1,)),
+        ('book_harvest', accounts[2], (1, 1, 1, 10 ** 16)),
+        ('tokenize_land', accounts[6], (1,))
+    ])
+
+    # Assertions
+    assert model.farms[1].owner == accounts[6]
+    assert state_diff(model, chain, accounts[:7]) == []
+
+def test_model_matches_contracts_on_reminted_market(chain, accounts):
+    model = ReferenceModel()
+    owner, booker, provider, minter = accounts[0], accounts[2], accounts[5], accounts[6]
+    steps = [(step, owner, (7,)) for step in ('open_season', 'confirm_preparations', 'confirm_planting', 'confirm_growth', 'confirm_harvesting')]
+    reverted = replay(model, chain, [('tokenize_land', owner, (7,))] + steps + [
+        ('create_market', owner, (7, PRICE, 3)),
+        ('book_harvest', booker, (7, 2, 1, PRICE * 2)),
+        ('burn', owner, (7,)),
+        ('confirm_receivership', booker, (7, 1, 1, provider, MARKET_FEE)),
+        ('tokenize_land', minter, (7,)),
+        ('confirm_receivership', booker, (7, 1, 1, provider, MARKET_FEE))
+    ])
+
+    # Assertions
+    assert reverted == 1
+    assert model.dues == {minter: PRICE - MARKET_FEE, provider: MARKET_FEE}
+    assert state_diff(model, chain, accounts[:7]) == []
+
+def test_model_revert_reasons(accounts):
+    model = ReferenceModel()
+    for op in workload(accounts, 0):
+        model.apply(op)
+    owner = accounts[0]
+    for step in ('open_season', 'confirm_preparations', 'confirm_planting', 'confirm_growth', 'confirm_harvesting'):
+        model.apply((step, owner, (1,)))
+    model.create_market(owner, 1, 10 ** 16, 2)
+
+    # Assertions
+    assert model.farms[1].state == MARKETING
+    with pytest.raises(Revert, match='dev: owner cannot book his/her harvest'):
+        model.book_harvest(owner, 1, 1, 1, 10 ** 16)
+    with pytest.raises(Revert, match='dev: season not on market'):
+        model.book_harvest(accounts[2], 1, 1, 2, 10 ** 16)
+    with pytest.raises(Revert, match='dev: only owner can close shop'):
+        model.close_season(accounts[2], 1)
+
+def test_model_gas_table(accounts):
+    model = ReferenceModel()
+    ops = list(workload(accounts, 20, seed=3))
+    for op in ops:
+        model.apply(op)
+
+    # Assertions
+    assert sum(count for count, _ in model.gas.values()) == len(ops)
+    assert model.gas_used == sum(gas for _, gas in model.gas.values())
+    assert set(model.gas) <= set(GAS_COSTS)
+    assert not any(booking.volume for booking in model.bookings.values())
+    assert model.dues == {}
+
+def test_gas_costs_from_baseline(tmp_path):
+    path = tmp_path / 'gas_baseline.json'
+    baseline = {name: gas for gas, name in enumerate(GAS_BENCHMARKS.values())}
+    path.write_text(json.dumps(baseline))
+    costs = load_gas_costs(str(path))
+    del baseline[GAS_BENCHMARKS['burn']]
+    path.write_text(json.dumps(baseline))
+
+    # Assertions
+    assert costs == {label: gas for gas, label in enumerate(GAS_BENCHMARKS)}
+    assert set(GAS_COSTS) == set(GAS_BENCHMARKS)
+    with pytest.raises(KeyError):
+        load_gas_costs(str(path))
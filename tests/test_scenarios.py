@@ -0,0 +1,32 @@
+import pytest
+
+from scripts.farm_states import CROP_GROWTH, MARKETING
+
+@pytest.fixture(scope='module')
+def growing_farms(scenarios):
+    yield scenarios.build(farms=3, stage=CROP_GROWTH, seasons=2)
+
+@pytest.fixture(scope='module')
+def booked_market(scenarios):
+    yield scenarios.build(farms=2, stage=MARKETING, bookers=3, supply=10, volume=2)
+
+def test_build_farms_at_stage(growing_farms, accounts):
+
+    # Assertions
+    assert growing_farms.registry.totalSupply() == 3
+    assert [growing_farms.season.getSeason(i) for i in growing_farms.farms] == [CROP_GROWTH] * 3
+    assert [growing_farms.season.currentSeason(i) for i in growing_farms.farms] == [2] * 3
+    assert growing_farms.registry.ownerOf(2) == accounts[1]
+
+def test_build_booked_markets(booked_market):
+    market = booked_market.market.getCurrentFarmMarket(1)
+
+    # Assertions
+    assert len(booked_market.bookers) == 3
+    assert booked_market.market.totalMarketBookers(1) == 3
+    assert market['remainingSupply'] == 4
+
+def test_cached_scenario(scenarios, booked_market):
+
+    # Assertions
+    assert scenarios.build(farms=2, stage=MARKETING, bookers=3, supply=10, volume=2) is booked_market
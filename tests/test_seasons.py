@@ -1,5 +1,12 @@
 import pytest
 import brownie
+from hexbytes import HexBytes
+
+from scripts.farm_listing import list_season_summaries
+from scripts.farm_states import DORMANT, MARKETING, PLANTING, PREPARATION
+from scripts.ipfs import cid_to_bytes32
+from scripts.season_batch import SeasonBatch
+from scripts.trace_proof import build_proof, season_values, trace_root, verify_proof
 
 seasonDict = {
     'tokenId': 0,
@@ -28,20 +35,20 @@ seasonDict = {
     'traceHash': 23
 }
 
+ipfs_hash = cid_to_bytes32('QmUfideC1r5JhMVwgd8vjC7DtVnXw3QGfCSQA7fUVHK789')
+
 token_id = 4863475
 
-@pytest.fixture
-def season_contract(Season, FRMRegistry, accounts):
-    frmregistry_contract = FRMRegistry.deploy({'from': accounts[0]})
-    frmregistry_contract.tokenizeLand('Arunga Vineyard', '294.32ha', 'Lyaduywa, Kenya', 'QmUfideC1r5JhMVwgd8vjC7DtVnXw3QGfCSQA7fUVHK789', 'loam soil', token_id, {'from': accounts[0]})
-    yield Season.deploy(frmregistry_contract.address, {'from': accounts[0]})
+@pytest.fixture(scope='module')
+def season_contract(scenarios, accounts):
+    yield scenarios.build(stage=DORMANT, token_ids=(token_id,), owners=(accounts[0],)).season
 
 def test_initial_state(season_contract):
 
     # Assertions
     assert season_contract.currentSeason(token_id) == 0
     assert season_contract.completeSeasons() == 0
-    assert season_contract.getSeason(token_id) == 'Dormant'
+    assert season_contract.getSeason(token_id) == DORMANT
 
 def test_get_tokenized_farm_current_season(season_contract):
 
@@ -68,14 +75,14 @@ def test_invalid_token_season(season_contract):
 def test_get_token_season(season_contract):
 
     # Assertions
-    assert season_contract.getSeason(token_id) == 'Dormant'
+    assert season_contract.getSeason(token_id) == DORMANT
 
 def test_farm_season_opening(season_contract):
     season_contract.openSeason(token_id)
 
     # Assertions
     assert season_contract.currentSeason(token_id) == 1
-    assert season_contract.getSeason(token_id) == 'Preparation'
+    assert season_contract.getSeason(token_id) == PREPARATION
 
 def test_unrestricted_farm_season_opening(season_contract, accounts):
 
@@ -102,7 +109,7 @@ def test_season_preparation(season_contract):
     # Assertions
     assert season_contract.currentSeason(token_id) == 1
 
-    season_contract.confirmPreparations(token_id, 'Tomatoe', 'Organic Fertilizer', 'Cow Shed Manure', 'QmUfideC1r5JhMVwgd8vjC7DtVnXw3QGfCSQA7fUVHK789')
+    season_contract.confirmPreparations(token_id, 'Tomatoe', 'Organic Fertilizer', 'Cow Shed Manure', ipfs_hash)
 
     total_complete_season = season_contract.currentSeason(token_id)
     season_data = list()
@@ -114,12 +121,12 @@ def test_season_preparation(season_contract):
     assert season_data[0][seasonDict['crop']] == 'Tomatoe'
     assert season_data[0][seasonDict['preparationFertilizer']] == 'Organic Fertilizer'
     assert season_data[0][seasonDict['preparationFertilizerSupplier']] == 'Cow Shed Manure'
-    assert season_data[0][seasonDict['preparationFertilizerProof']] == 'QmUfideC1r5JhMVwgd8vjC7DtVnXw3QGfCSQA7fUVHK789'
+    assert season_data[0][seasonDict['preparationFertilizerProof']] == ipfs_hash
 
 def test_season_planting(season_contract):
     season_contract.openSeason(token_id)
-    season_contract.confirmPreparations(token_id, 'Tomatoe', 'Organic Fertilizer', 'Cow Shed Manure', 'QmUfideC1r5JhMVwgd8vjC7DtVnXw3QGfCSQA7fUVHK789')
-    season_contract.confirmPlanting(token_id, 'F1', 'Kenya Seed Company', 'QmUfideC1r5JhMVwgd8vjC7DtVnXw3QGfCSQA7fUVHK789', '1200kg', 'Jobe 1960 Organic Fertilizer', 'Kenya Seed Supplier', 'QmUfideC1r5JhMVwgd8vjC7DtVnXw3QGfCSQA7fUVHK789')
+    season_contract.confirmPreparations(token_id, 'Tomatoe', 'Organic Fertilizer', 'Cow Shed Manure', ipfs_hash)
+    season_contract.confirmPlanting(token_id, 'F1', 'Kenya Seed Company', ipfs_hash, '1200kg', 'Jobe 1960 Organic Fertilizer', 'Kenya Seed Supplier', ipfs_hash)
 
     total_complete_season = season_contract.currentSeason(token_id)
     season_data = list()
@@ -134,9 +141,9 @@ def test_season_planting(season_contract):
 #
 def test_season_crop_growth(season_contract):
     season_contract.openSeason(token_id)
-    season_contract.confirmPreparations(token_id, 'Tomatoe', 'Organic Fertilizer', 'Cow Shed Manure', 'QmUfideC1r5JhMVwgd8vjC7DtVnXw3QGfCSQA7fUVHK789')
-    season_contract.confirmPlanting(token_id, 'F1', 'Kenya Seed Company', 'QmUfideC1r5JhMVwgd8vjC7DtVnXw3QGfCSQA7fUVHK789', '1200kg', 'Jobe 1960 Organic Fertilizer', 'Kenya Seed Supplier', 'QmUfideC1r5JhMVwgd8vjC7DtVnXw3QGfCSQA7fUVHK789')
-    season_contract.confirmGrowth(token_id, 'Army worm', 'QmUfideC1r5JhMVwgd8vjC7DtVnXw3QGfCSQA7fUVHK789', 'Infestor x32H', 'Aphids Supplier' , 'QmUfideC1r5JhMVwgd8vjC7DtVnXw3QGfCSQA7fUVHK789')
+    season_contract.confirmPreparations(token_id, 'Tomatoe', 'Organic Fertilizer', 'Cow Shed Manure', ipfs_hash)
+    season_contract.confirmPlanting(token_id, 'F1', 'Kenya Seed Company', ipfs_hash, '1200kg', 'Jobe 1960 Organic Fertilizer', 'Kenya Seed Supplier', ipfs_hash)
+    season_contract.confirmGrowth(token_id, 'Army worm', ipfs_hash, 'Infestor x32H', 'Aphids Supplier' , ipfs_hash)
 
     total_complete_season = season_contract.currentSeason(token_id)
     season_data = list()
@@ -151,9 +158,9 @@ def test_season_crop_growth(season_contract):
 #
 def test_season_harvesting(season_contract):
     season_contract.openSeason(token_id)
-    season_contract.confirmPreparations(token_id, 'Tomatoe', 'Organic Fertilizer', 'Cow Shed Manure', 'QmUfideC1r5JhMVwgd8vjC7DtVnXw3QGfCSQA7fUVHK789')
-    season_contract.confirmPlanting(token_id, 'F1', 'Kenya Seed Company', 'QmUfideC1r5JhMVwgd8vjC7DtVnXw3QGfCSQA7fUVHK789', '1200kg', 'Jobe 1960 Organic Fertilizer', 'Kenya Seed Supplier', 'QmUfideC1r5JhMVwgd8vjC7DtVnXw3QGfCSQA7fUVHK789')
-    season_contract.confirmGrowth(token_id, 'Army worm', 'QmUfideC1r5JhMVwgd8vjC7DtVnXw3QGfCSQA7fUVHK789', 'Infestor x32H', 'Aphids Supplier' , 'QmUfideC1r5JhMVwgd8vjC7DtVnXw3QGfCSQA7fUVHK789')
+    season_contract.confirmPreparations(token_id, 'Tomatoe', 'Organic Fertilizer', 'Cow Shed Manure', ipfs_hash)
+    season_contract.confirmPlanting(token_id, 'F1', 'Kenya Seed Company', ipfs_hash, '1200kg', 'Jobe 1960 Organic Fertilizer', 'Kenya Seed Supplier', ipfs_hash)
+    season_contract.confirmGrowth(token_id, 'Army worm', ipfs_hash, 'Infestor x32H', 'Aphids Supplier' , ipfs_hash)
     season_contract.confirmHarvesting(token_id, "120 KG")
 
     total_complete_season = season_contract.currentSeason(token_id)
@@ -167,29 +174,30 @@ def test_season_harvesting(season_contract):
     assert len(season_data) == 1
     assert season_contract.resolvedHash(season_data[0][seasonDict['traceHash']]) == True
     assert season_data[0][seasonDict['harvestSupply']] == '120 KG'
+    assert season_contract.getSeason(token_id) == MARKETING
 
 def test_unrestricted_season_harvesting(season_contract):
     season_contract.openSeason(token_id)
-    season_contract.confirmPreparations(token_id, 'Tomatoe', 'Organic Fertilizer', 'Cow Shed Manure', 'QmUfideC1r5JhMVwgd8vjC7DtVnXw3QGfCSQA7fUVHK789')
+    season_contract.confirmPreparations(token_id, 'Tomatoe', 'Organic Fertilizer', 'Cow Shed Manure', ipfs_hash)
     with brownie.reverts('dev: state is not crop growth'):
-        season_contract.confirmGrowth(token_id, 'Army worm', 'QmUfideC1r5JhMVwgd8vjC7DtVnXw3QGfCSQA7fUVHK789', 'Infestor x32H', 'Aphids Supplier' , 'QmUfideC1r5JhMVwgd8vjC7DtVnXw3QGfCSQA7fUVHK789')
+        season_contract.confirmGrowth(token_id, 'Army worm', ipfs_hash, 'Infestor x32H', 'Aphids Supplier' , ipfs_hash)
 
 def test_season_closure(season_contract, accounts):
     season_contract.openSeason(token_id)
-    season_contract.confirmPreparations(token_id, 'Tomatoe', 'Organic Fertilizer', 'Cow Shed Manure', 'QmUfideC1r5JhMVwgd8vjC7DtVnXw3QGfCSQA7fUVHK789')
-    season_contract.confirmPlanting(token_id, 'F1', 'Kenya Seed Company', 'QmUfideC1r5JhMVwgd8vjC7DtVnXw3QGfCSQA7fUVHK789', '1200kg', 'Jobe 1960 Organic Fertilizer', 'Kenya Seed Supplier', 'QmUfideC1r5JhMVwgd8vjC7DtVnXw3QGfCSQA7fUVHK789')
-    season_contract.confirmGrowth(token_id, 'Army worm', 'QmUfideC1r5JhMVwgd8vjC7DtVnXw3QGfCSQA7fUVHK789', 'Infestor x32H', 'Aphids Supplier' , 'QmUfideC1r5JhMVwgd8vjC7DtVnXw3QGfCSQA7fUVHK789')
+    season_contract.confirmPreparations(token_id, 'Tomatoe', 'Organic Fertilizer', 'Cow Shed Manure', ipfs_hash)
+    season_contract.confirmPlanting(token_id, 'F1', 'Kenya Seed Company', ipfs_hash, '1200kg', 'Jobe 1960 Organic Fertilizer', 'Kenya Seed Supplier', ipfs_hash)
+    season_contract.confirmGrowth(token_id, 'Army worm', ipfs_hash, 'Infestor x32H', 'Aphids Supplier' , ipfs_hash)
     season_contract.confirmHarvesting(token_id, "120 KG")
     season_contract.closeSeason(token_id, {'from': accounts[0]})
 
     # Assertions
-    assert season_contract.getSeason(token_id) == 'Dormant'
+    assert season_contract.getSeason(token_id) == DORMANT
 
 def test_unrestricted_season_closure(season_contract, accounts):
     season_contract.openSeason(token_id)
-    season_contract.confirmPreparations(token_id, 'Tomatoe', 'Organic Fertilizer', 'Cow Shed Manure', 'QmUfideC1r5JhMVwgd8vjC7DtVnXw3QGfCSQA7fUVHK789')
-    season_contract.confirmPlanting(token_id, 'F1', 'Kenya Seed Company', 'QmUfideC1r5JhMVwgd8vjC7DtVnXw3QGfCSQA7fUVHK789', '1200kg', 'Jobe 1960 Organic Fertilizer', 'Kenya Seed Supplier', 'QmUfideC1r5JhMVwgd8vjC7DtVnXw3QGfCSQA7fUVHK789')
-    season_contract.confirmGrowth(token_id, 'Army worm', 'QmUfideC1r5JhMVwgd8vjC7DtVnXw3QGfCSQA7fUVHK789', 'Infestor x32H', 'Aphids Supplier' , 'QmUfideC1r5JhMVwgd8vjC7DtVnXw3QGfCSQA7fUVHK789')
+    season_contract.confirmPreparations(token_id, 'Tomatoe', 'Organic Fertilizer', 'Cow Shed Manure', ipfs_hash)
+    season_contract.confirmPlanting(token_id, 'F1', 'Kenya Seed Company', ipfs_hash, '1200kg', 'Jobe 1960 Organic Fertilizer', 'Kenya Seed Supplier', ipfs_hash)
+    season_contract.confirmGrowth(token_id, 'Army worm', ipfs_hash, 'Infestor x32H', 'Aphids Supplier' , ipfs_hash)
     season_contract.confirmHarvesting(token_id, "120 KG")
 
     # Error assertions
@@ -216,9 +224,9 @@ def test_resolve_unhashed_season(season_contract):
 
 def test_hash_season_data(season_contract):
     season_contract.openSeason(token_id)
-    season_contract.confirmPreparations(token_id, 'Tomatoe', 'Organic Fertilizer', 'Cow Shed Manure', 'QmUfideC1r5JhMVwgd8vjC7DtVnXw3QGfCSQA7fUVHK789')
-    season_contract.confirmPlanting(token_id, 'F1', 'Kenya Seed Company', 'QmUfideC1r5JhMVwgd8vjC7DtVnXw3QGfCSQA7fUVHK789', '1200kg', 'Jobe 1960 Organic Fertilizer', 'Kenya Seed Supplier', 'QmUfideC1r5JhMVwgd8vjC7DtVnXw3QGfCSQA7fUVHK789')
-    season_contract.confirmGrowth(token_id, 'Army worm', 'QmUfideC1r5JhMVwgd8vjC7DtVnXw3QGfCSQA7fUVHK789', 'Infestor x32H', 'Aphids Supplier' , 'QmUfideC1r5JhMVwgd8vjC7DtVnXw3QGfCSQA7fUVHK789')
+    season_contract.confirmPreparations(token_id, 'Tomatoe', 'Organic Fertilizer', 'Cow Shed Manure', ipfs_hash)
+    season_contract.confirmPlanting(token_id, 'F1', 'Kenya Seed Company', ipfs_hash, '1200kg', 'Jobe 1960 Organic Fertilizer', 'Kenya Seed Supplier', ipfs_hash)
+    season_contract.confirmGrowth(token_id, 'Army worm', ipfs_hash, 'Infestor x32H', 'Aphids Supplier' , ipfs_hash)
     season_contract.confirmHarvesting(token_id, "120 KG")
 
     # Assertions
@@ -226,9 +234,9 @@ def test_hash_season_data(season_contract):
 
 def test_invalid_season_to_hash(season_contract):
     season_contract.openSeason(token_id)
-    season_contract.confirmPreparations(token_id, 'Tomatoe', 'Organic Fertilizer', 'Cow Shed Manure', 'QmUfideC1r5JhMVwgd8vjC7DtVnXw3QGfCSQA7fUVHK789')
-    season_contract.confirmPlanting(token_id, 'F1', 'Kenya Seed Company', 'QmUfideC1r5JhMVwgd8vjC7DtVnXw3QGfCSQA7fUVHK789', '1200kg', 'Jobe 1960 Organic Fertilizer', 'Kenya Seed Supplier', 'QmUfideC1r5JhMVwgd8vjC7DtVnXw3QGfCSQA7fUVHK789')
-    season_contract.confirmGrowth(token_id, 'Army worm', 'QmUfideC1r5JhMVwgd8vjC7DtVnXw3QGfCSQA7fUVHK789', 'Infestor x32H', 'Aphids Supplier' , 'QmUfideC1r5JhMVwgd8vjC7DtVnXw3QGfCSQA7fUVHK789')
+    season_contract.confirmPreparations(token_id, 'Tomatoe', 'Organic Fertilizer', 'Cow Shed Manure', ipfs_hash)
+    season_contract.confirmPlanting(token_id, 'F1', 'Kenya Seed Company', ipfs_hash, '1200kg', 'Jobe 1960 Organic Fertilizer', 'Kenya Seed Supplier', ipfs_hash)
+    season_contract.confirmGrowth(token_id, 'Army worm', ipfs_hash, 'Infestor x32H', 'Aphids Supplier' , ipfs_hash)
     season_contract.confirmHarvesting(token_id, "120 KG")
 
     # Error assertions
@@ -237,9 +245,9 @@ def test_invalid_season_to_hash(season_contract):
 
 def test_invalid_token_id_for_season_hash(season_contract):
     season_contract.openSeason(token_id)
-    season_contract.confirmPreparations(token_id, 'Tomatoe', 'Organic Fertilizer', 'Cow Shed Manure', 'QmUfideC1r5JhMVwgd8vjC7DtVnXw3QGfCSQA7fUVHK789')
-    season_contract.confirmPlanting(token_id, 'F1', 'Kenya Seed Company', 'QmUfideC1r5JhMVwgd8vjC7DtVnXw3QGfCSQA7fUVHK789', '1200kg', 'Jobe 1960 Organic Fertilizer', 'Kenya Seed Supplier', 'QmUfideC1r5JhMVwgd8vjC7DtVnXw3QGfCSQA7fUVHK789')
-    season_contract.confirmGrowth(token_id, 'Army worm', 'QmUfideC1r5JhMVwgd8vjC7DtVnXw3QGfCSQA7fUVHK789', 'Infestor x32H', 'Aphids Supplier' , 'QmUfideC1r5JhMVwgd8vjC7DtVnXw3QGfCSQA7fUVHK789')
+    season_contract.confirmPreparations(token_id, 'Tomatoe', 'Organic Fertilizer', 'Cow Shed Manure', ipfs_hash)
+    season_contract.confirmPlanting(token_id, 'F1', 'Kenya Seed Company', ipfs_hash, '1200kg', 'Jobe 1960 Organic Fertilizer', 'Kenya Seed Supplier', ipfs_hash)
+    season_contract.confirmGrowth(token_id, 'Army worm', ipfs_hash, 'Infestor x32H', 'Aphids Supplier' , ipfs_hash)
     season_contract.confirmHarvesting(token_id, "120 KG")
 
     # Error assertions
@@ -248,9 +256,9 @@ def test_invalid_token_id_for_season_hash(season_contract):
 
 def test_trace_season_hash(season_contract):
     season_contract.openSeason(token_id)
-    season_contract.confirmPreparations(token_id, 'Tomatoe', 'Organic Fertilizer', 'Cow Shed Manure', 'QmUfideC1r5JhMVwgd8vjC7DtVnXw3QGfCSQA7fUVHK789')
-    season_contract.confirmPlanting(token_id, 'F1', 'Kenya Seed Company', 'QmUfideC1r5JhMVwgd8vjC7DtVnXw3QGfCSQA7fUVHK789', '1200kg', 'Jobe 1960 Organic Fertilizer', 'Kenya Seed Supplier', 'QmUfideC1r5JhMVwgd8vjC7DtVnXw3QGfCSQA7fUVHK789')
-    season_contract.confirmGrowth(token_id, 'Army worm', 'QmUfideC1r5JhMVwgd8vjC7DtVnXw3QGfCSQA7fUVHK789', 'Infestor x32H', 'Aphids Supplier' , 'QmUfideC1r5JhMVwgd8vjC7DtVnXw3QGfCSQA7fUVHK789')
+    season_contract.confirmPreparations(token_id, 'Tomatoe', 'Organic Fertilizer', 'Cow Shed Manure', ipfs_hash)
+    season_contract.confirmPlanting(token_id, 'F1', 'Kenya Seed Company', ipfs_hash, '1200kg', 'Jobe 1960 Organic Fertilizer', 'Kenya Seed Supplier', ipfs_hash)
+    season_contract.confirmGrowth(token_id, 'Army worm', ipfs_hash, 'Infestor x32H', 'Aphids Supplier' , ipfs_hash)
     season_contract.confirmHarvesting(token_id, "120 KG")
 
     # Trace
@@ -260,3 +268,106 @@ def test_trace_season_hash(season_contract):
     assert season_data['crop'] == 'Tomatoe'
     assert season_data['harvestSupply'] == '120 KG'
 
+def test_trace_season_summary(season_contract):
+    season_contract.openSeason(token_id)
+    season_contract.confirmPreparations(token_id, 'Tomatoe', 'Organic Fertilizer', 'Cow Shed Manure', ipfs_hash)
+    season_contract.confirmPlanting(token_id, 'F1', 'Kenya Seed Company', ipfs_hash, '1200kg', 'Jobe 1960 Organic Fertilizer', 'Kenya Seed Supplier', ipfs_hash)
+    season_contract.confirmGrowth(token_id, 'Army worm', ipfs_hash, 'Infestor x32H', 'Aphids Supplier' , ipfs_hash)
+    season_contract.confirmHarvesting(token_id, "120 KG")
+    trace_hash = season_contract.hashedSeason(token_id, 1)
+
+    # Trace
+    summary = season_contract.resolveSeasonSummary(trace_hash)
+    season_data = season_contract.querySeasonData(token_id, 1)
+
+    # Assertions
+    assert summary == season_contract.querySeasonSummary(token_id, 1)
+    assert summary['season'] == 1
+    assert summary['crop'] == 'Tomatoe'
+    assert summary['traceHash'] == trace_hash
+    assert summary['openingDate'] == season_data['openingDate']
+    assert summary['harvestDate'] == season_data['harvestDate']
+
+def test_list_season_summaries(scenarios, accounts):
+    season_contract = scenarios.build(stage=MARKETING, seasons=3, supply=0, token_ids=(token_id,), owners=(accounts[0],)).season
+    summaries = list_season_summaries(season_contract, token_id, page_size=2)
+
+    # Assertions
+    assert [summary['season'] for summary in summaries] == [1, 2, 3]
+    assert all(summary['traceHash'] == season_contract.hashedSeason(token_id, summary['season']) for summary in summaries)
+    with brownie.reverts('dev: index starts at 1'):
+        season_contract.querySeasonSummaries(token_id, 0, 1)
+
+def test_trace_hash_commits_season_data(season_contract):
+    season_contract.openSeason(token_id)
+    season_contract.confirmPreparations(token_id, 'Tomatoe', 'Organic Fertilizer', 'Cow Shed Manure', ipfs_hash)
+    season_contract.confirmPlanting(token_id, 'F1', 'Kenya Seed Company', ipfs_hash, '1200kg', 'Jobe 1960 Organic Fertilizer', 'Kenya Seed Supplier', ipfs_hash)
+    season_contract.confirmGrowth(token_id, 'Army worm', ipfs_hash, 'Infestor x32H', 'Aphids Supplier' , ipfs_hash)
+    season_contract.confirmHarvesting(token_id, "120 KG")
+    root = season_contract.hashedSeason(token_id, 1)
+    values = season_values(season_contract.querySeasonData(token_id, 1), 1)
+
+    # Offline proof of a single field
+    proof = build_proof(values, 'pesticideSupplier')
+    forged = dict(proof, value='Other Supplier')
+
+    # Assertions
+    assert trace_root(values) == root
+    assert verify_proof(root, proof) == True
+    assert verify_proof(root, forged) == False
+    assert verify_proof(root, dict(proof, field='pesticideUsed')) == False
+    assert len(proof['siblings']) == 6
+
+def test_trace_hashes_differ_across_farms(scenarios, accounts):
+    scenario = scenarios.build(farms=2, stage=MARKETING, supply=0, token_ids=(1, 2), owners=(accounts[0], accounts[0]))
+
+    # Assertions
+    assert scenario.season.hashedSeason(1, 1) != scenario.season.hashedSeason(2, 1)
+
+def test_operator_farm_season_opening(scenarios, accounts):
+    scenario = scenarios.build(stage=DORMANT, token_ids=(token_id,), owners=(accounts[0],))
+    scenario.registry.setApprovalForAll(accounts[2], True, {'from': accounts[0]})
+    scenario.season.openSeason(token_id, {'from': accounts[2]})
+
+    # Assertions
+    assert scenario.season.currentSeason(token_id) == 1
+    assert scenario.season.getSeason(token_id) == PREPARATION
+    scenario.registry.setApprovalForAll(accounts[2], False, {'from': accounts[0]})
+    with brownie.reverts('dev: only owner can confirm preparations'):
+        scenario.season.confirmPreparations(token_id, 'Tomatoe', 'Organic Fertilizer', 'Cow Shed Manure', ipfs_hash, {'from': accounts[2]})
+
+def test_batch_season_steps_by_operator(scenarios, accounts):
+    scenario = scenarios.build(farms=3, stage=DORMANT)
+    for owner in accounts[:2]:
+        scenario.registry.setApprovalForAll(accounts[2], True, {'from': owner})
+    batch = SeasonBatch(scenario.season)
+    for farm in scenario.farms:
+        batch.add('openSeason', farm)
+        batch.add('confirmPreparations', farm, 'Tomatoe', 'Organic Fertilizer', 'Cow Shed Manure', ipfs_hash)
+    txs = batch.execute(accounts[2])
+
+    # Assertions
+    assert len(txs) == 1
+    assert [scenario.season.getSeason(farm) for farm in scenario.farms] == [PLANTING] * 3
+    assert scenario.season.querySeasonData(scenario.farms[2], 1)['crop'] == 'Tomatoe'
+
+def test_batch_season_steps_is_atomic(scenarios, accounts):
+    scenario = scenarios.build(farms=2, stage=DORMANT)
+    batch = SeasonBatch(scenario.season)
+    for farm in scenario.farms:
+        batch.add('openSeason', farm)
+
+    # Error assertions
+    with brownie.reverts():
+        batch.execute(accounts[0])
+    assert [scenario.season.currentSeason(farm) for farm in scenario.farms] == [0, 0]
+
+def test_batch_season_steps_only_run_steps(scenarios, accounts):
+    scenario = scenarios.build(farms=1, stage=DORMANT)
+    farm = scenario.farms[0]
+    steps = [HexBytes(scenario.season.openSeason.encode_input(farm)), HexBytes(scenario.season.getSeason.encode_input(farm))]
+
+    # Error assertions
+    with brownie.reverts('dev: not a season step'):
+        scenario.season.batchSeasonSteps(b''.join(steps), [len(step) for step in steps] + [0] * 18, 2, {'from': accounts[0]})
+    assert scenario.season.currentSeason(farm) == 0
@@ -0,0 +1,102 @@
+import json
+import threading
+from urllib.error import HTTPError
+from urllib.request import urlopen
+
+import pytest
+
+from scripts.farm_states import MARKETING
+from scripts.trace_service import TraceCache, TraceResolver, serve
+
+first_hash = '0x' + '01' * 32
+second_hash = '0x' + '02' * 32
+third_hash = '0x' + '03' * 32
+
+@pytest.fixture(scope='module')
+def scenario(scenarios, accounts):
+    yield scenarios.build(farms=2, stage=MARKETING, seasons=2, supply=0, token_ids=(1, 2), owners=(accounts[0], accounts[1]))
+
+@pytest.fixture
+def db_path(tmp_path):
+    yield str(tmp_path / 'traces.db')
+
+@pytest.fixture
+def resolver(scenario, db_path, web3):
+    yield TraceResolver(web3, scenario.registry, scenario.season, TraceCache(db_path))
+
+@pytest.fixture
+def server(resolver):
+    server = serve(resolver, port=0)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield 'http://%s:%d' % server.server_address
+    server.shutdown()
+    server.server_close()
+
+def get(url):
+    try:
+        with urlopen(url) as response:
+            return response.status, json.loads(response.read())
+    except HTTPError as error:
+        return error.code, json.loads(error.read())
+
+def test_cache_evicts_least_recently_used(db_path):
+    cache = TraceCache(db_path, capacity=2)
+    cache.put(first_hash, {'season': 1})
+    cache.put(second_hash, {'season': 2})
+    cache.get(first_hash)
+    cache.put(third_hash, {'season': 3})
+    memory = list(cache.entries)
+    evicted = cache.get(second_hash)
+    stats = cache.stats()
+
+    # Assertions
+    assert memory == [first_hash, third_hash]
+    assert evicted == {'season': 2}
+    assert list(cache.entries) == [third_hash, second_hash]
+    assert (stats['memory_hits'], stats['disk_hits'], stats['misses']) == (1, 1, 0)
+    assert stats['evictions'] == 2
+    assert stats['disk_entries'] == 3
+
+def test_cache_reloads_recent_seasons(db_path):
+    cache = TraceCache(db_path)
+    cache.put(first_hash, {'season': 1})
+    cache.put(second_hash, {'season': 2})
+    cache.set_checkpoint(7)
+    reloaded = TraceCache(db_path, capacity=1)
+
+    # Assertions
+    assert list(reloaded.entries) == [second_hash]
+    assert reloaded.checkpoint(0) == 7
+    assert reloaded.get(third_hash) is None
+    assert reloaded.stats()['misses'] == 1
+
+def test_warm_harvested_seasons(scenario, resolver):
+    warmed = resolver.warm()
+    rewarmed = resolver.warm()
+    trace_hashes = [scenario.season.hashedSeason(token_id, season_no) for token_id in (1, 2) for season_no in (1, 2)]
+    entries = [resolver.resolve(trace_hash) for trace_hash in trace_hashes]
+    stats = resolver.stats()
+
+    # Assertions
+    assert (warmed, rewarmed) == (4, 0)
+    assert [entry['traceHash'] for entry in entries] == [str(trace_hash).lower() for trace_hash in trace_hashes]
+    assert stats['memory_hits'] == 4
+    assert stats['resolved'] == 4
+    assert stats['warmed'] == 4
+
+def test_http_trace_lookup(scenario, resolver, server):
+    trace_hash = scenario.season.hashedSeason(1, 1)
+    found = get('%s/trace/%s' % (server, trace_hash))
+    unresolved = get('%s/trace/%s' % (server, first_hash))
+    malformed = get('%s/trace/0x1234' % server)
+    unknown = get('%s/seasons' % server)
+    status, metrics = get('%s/metrics' % server)
+
+    # Assertions
+    assert found == (200, resolver.resolve(trace_hash))
+    assert unresolved == (404, {'error': 'unresolved trace hash'})
+    assert malformed == (400, {'error': 'trace hash must be 32 bytes'})
+    assert unknown == (404, {'error': 'not found'})
+    assert status == 200
+    assert (metrics['resolved'], metrics['unresolved']) == (1, 1)